@@ -2,64 +2,36 @@ from __future__ import annotations
 
 import os
 import re
-from collections import OrderedDict
 from glob import iglob
-from logging import getLogger
 from string import Template
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING
 
-from commitizen.defaults import BUMP_MESSAGE, MAJOR, MINOR, PATCH
+from commitizen.classifier import VERSION_TYPES as VERSION_TYPES
+from commitizen.classifier import CommitClassifier
+from commitizen.defaults import BUMP_MESSAGE
 from commitizen.exceptions import CurrentVersionNotFoundError
 from commitizen.git import GitCommit, smart_open
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterable
+    from collections.abc import Generator, Iterable, Mapping
 
+    from commitizen.cache import CommitCache
     from commitizen.version_schemes import Increment, Version
 
-VERSION_TYPES = [None, PATCH, MINOR, MAJOR]
-
-logger = getLogger("commitizen")
-
 
 def find_increment(
-    commits: list[GitCommit], regex: str, increments_map: dict | OrderedDict
+    commits: Iterable[GitCommit],
+    regex: str,
+    increments_map: Mapping[str, str],
+    cache: CommitCache | None = None,
 ) -> Increment | None:
-    if isinstance(increments_map, dict):
-        increments_map = OrderedDict(increments_map)
-
-    # Most important cases are major and minor.
-    # Everything else will be considered patch.
-    select_pattern = re.compile(regex)
-    increment: str | None = None
-
-    for commit in commits:
-        for message in commit.message.split("\n"):
-            result = select_pattern.search(message)
-
-            if result:
-                found_keyword = result.group(1)
-                new_increment = None
-                for match_pattern in increments_map.keys():
-                    if re.match(match_pattern, found_keyword):
-                        new_increment = increments_map[match_pattern]
-                        break
-
-                if new_increment is None:
-                    logger.debug(
-                        f"no increment needed for '{found_keyword}' in '{message}'"
-                    )
-
-                if VERSION_TYPES.index(increment) < VERSION_TYPES.index(new_increment):
-                    logger.debug(
-                        f"increment detected is '{new_increment}' due to '{found_keyword}' in '{message}'"
-                    )
-                    increment = new_increment
-
-                if increment == MAJOR:
-                    break
-
-    return cast("Increment", increment)
+    """Find the highest increment required by the commits.
+
+    With a `cache`, the increment required by each commit is persisted and only the
+    commits it does not know yet are matched against the rules.
+    """
+    classifier = CommitClassifier(bump_pattern=regex, bump_map=increments_map)
+    return classifier.find_increment(commits, cache)
 
 
 def update_version_in_files(
@@ -0,0 +1,592 @@
+"""Persistent caches stored in the repository git directory (`.git/commitizen/`).
+
+Commits are immutable: whatever is derived from a commit with a given set of rules
+(parsed changelog entries, bump increment...) never changes and can be reused by
+later invocations instead of being computed again.
+Those results can also be shared between clones through git notes (`NotesCache`).
+
+Indexes of files (such as the changelog releases) are kept as long as the file they
+were built from keeps its modification time and size (`FileIndexCache`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_right
+from logging import getLogger
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Any, cast
+
+from commitizen import git
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+    from pathlib import Path
+    from typing import BinaryIO
+
+    from commitizen.defaults import Settings
+
+    # Self is Python 3.11+ but backported in typing-extensions
+    if sys.version_info < (3, 11):
+        from typing_extensions import Self
+    else:
+        from typing import Self
+
+logger = getLogger("commitizen")
+
+CACHE_DIR = "commitizen"
+
+# Returned on cache misses, `None` being a legit cached value
+MISSING: Any = object()
+
+_decode = json.JSONDecoder().decode
+
+
+class CommitCache:
+    """Results derived from commits, keyed by commit SHA and the rules they depend on.
+
+    Entries are stored one per line (`<key>\\t<json value>`) in an append-only file.
+    Values are only decoded when looked up, and new entries are written in batches
+    of `BATCH_SIZE`, the last one on `flush`.
+    Any I/O error disables the cache: it is an optimization, never a requirement.
+
+    Without `max_entries`, entries are looked up through an index of the file stored
+    next to it, so that neither the entries nor their keys are held in memory.
+    With `max_entries`, the least recently used entries are evicted beyond that
+    size: the entries kept are indexed in memory, those used are appended again on
+    `flush` to record their recency, and the file is compacted once it holds twice
+    as many lines as entries allowed.
+
+    Example:
+
+    ```python
+    cache = CommitCache.for_repository()
+    rules = CommitCache.rules_key("bump", bump_pattern, bump_map)
+    if (increment := cache.get(rules, commit.rev)) is MISSING:
+        increment = compute_increment(commit)
+        cache.set(rules, commit.rev, increment)
+    cache.flush()
+    ```
+    """
+
+    # Bump it whenever the format or the meaning of the cached values change
+    VERSION = 1
+    FILE_NAME = "commits"
+    # New entries held in memory before being written
+    BATCH_SIZE = 1000
+
+    def __init__(self, path: Path, max_entries: int | None = None) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._file = _IndexedFile(path) if max_entries is None else None
+        # Ordered from the least to the most recently written
+        self._index: dict[str, str] = {}
+        self._pending: dict[str, str] = {}
+        self._used: set[str] = set()
+        self._lines = 0
+        # Scalars repeat a lot (`null`, increments...) and are immutable
+        self._scalars: dict[str, Any] = {}
+        self._loaded = False
+
+    @classmethod
+    def for_repository(
+        cls, name: str = FILE_NAME, max_entries: int | None = None
+    ) -> Self | None:
+        """The `name` cache of the current repository, `None` outside of a git project"""
+        try:
+            common_dir = git._get_common_dir()
+        except OSError:
+            return None
+        path = common_dir / CACHE_DIR / name
+        # Share the loaded index between the commands of a single invocation
+        instance = _instances.setdefault((cls, path), cls(path, max_entries))
+        return cast("Self", instance)
+
+    @classmethod
+    def rules_key(cls, *rules: Any) -> str:
+        """A digest of everything the cached values depend on, besides the commit"""
+        payload = json.dumps([cls.VERSION, *rules], sort_keys=True, default=repr)
+        return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+    def get(self, rules_key: str, rev: str) -> Any:
+        """The value cached for `rev` with those rules, `MISSING` if there is none"""
+        if not self._loaded:
+            self._load()
+        key = f"{rules_key}:{rev}"
+        if (raw := self._pending.get(key) or self._find(key)) is None:
+            return MISSING
+        if self.max_entries is not None:
+            self._used.add(key)
+        if (value := self._scalars.get(raw, MISSING)) is not MISSING:
+            return value
+        try:
+            value = _decode(raw)
+        except ValueError:
+            return MISSING
+        if not isinstance(value, (list, dict)):
+            self._scalars[raw] = value
+        return value
+
+    def set(self, rules_key: str, rev: str, value: Any) -> None:
+        if not self._loaded:
+            self._load()
+        key = f"{rules_key}:{rev}"
+        try:
+            raw = json.dumps(value, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            logger.debug("Unable to cache the value for %s: %s", key, e)
+            return
+        if self._find(key) != raw:
+            self._add_pending(key, raw)
+
+    def flush(self) -> None:
+        """Write the entries set, and with `max_entries` used, since the last flush"""
+        if self._file is not None:
+            self._write_pending(self._file)
+            return
+        if not self._pending and not self._used:
+            return
+        pending, self._pending = self._pending, {}
+        used, self._used = self._used, set()
+        written = {key: self._index[key] for key in used if key in self._index}
+        written.update(pending)
+        for key, raw in written.items():
+            self._index.pop(key, None)
+            self._index[key] = raw
+        self._evict()
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if (
+                self.max_entries is not None
+                and self._lines + len(written) > 2 * self.max_entries
+            ):
+                self._compact()
+            else:
+                with self.path.open("a", encoding="utf-8", newline="\n") as f:
+                    f.writelines(f"{key}\t{raw}\n" for key, raw in written.items())
+                self._lines += len(written)
+        except OSError as e:
+            logger.debug("Unable to write the commit cache %s: %s", self.path, e)
+            for key in pending:
+                self._index.pop(key, None)
+
+    def _find(self, key: str) -> str | None:
+        """The raw value written for `key`"""
+        if self._file is not None:
+            return self._file.get(key)
+        return self._index.get(key)
+
+    def _add_pending(self, key: str, raw: str) -> None:
+        self._pending[key] = raw
+        if len(self._pending) >= self.BATCH_SIZE:
+            self.flush()
+
+    def _write_pending(self, file: _IndexedFile) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            file.append(pending)
+        except OSError as e:
+            logger.debug("Unable to write the commit cache %s: %s", self.path, e)
+
+    def _evict(self) -> None:
+        if self.max_entries is not None:
+            while len(self._index) > self.max_entries:
+                del self._index[next(iter(self._index))]
+
+    def _compact(self) -> None:
+        """Rewrite the file with the entries kept only, atomically"""
+        with NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            newline="\n",
+            dir=self.path.parent,
+            prefix=f".{self.path.name}",
+            delete=False,
+        ) as f:
+            f.writelines(f"{key}\t{raw}\n" for key, raw in self._index.items())
+        try:
+            os.replace(f.name, self.path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+        self._lines = len(self._index)
+
+    def _load(self) -> None:
+        self._loaded = True
+        if self._file is not None:
+            try:
+                self._file.open()
+            except OSError as e:
+                logger.debug("Unable to index the commit cache %s: %s", self.path, e)
+            return
+        try:
+            with self.path.open(encoding="utf-8", newline="\n") as f:
+                for line in f:
+                    self._lines += 1
+                    key, sep, raw = line.rstrip("\n").partition("\t")
+                    # A line may be truncated by an interrupted write
+                    if not sep or not line.endswith("\n"):
+                        continue
+                    # The last occurrence of a key is the most recent one
+                    if key in self._index:
+                        del self._index[key]
+                    self._index[key] = raw
+        except FileNotFoundError:
+            pass
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug("Unable to read the commit cache %s: %s", self.path, e)
+        self._evict()
+
+
+class _IndexedFile:
+    """An append-only file of `<key>\\t<raw value>` lines, looked up by key on disk.
+
+    Its index, stored next to it, holds the (key hash, line offset) pairs of its lines
+    sorted by hash then offset, and is memory-mapped: looking a key up is a binary
+    search then a single line read. Lines appended without being indexed (by an
+    interrupted or an older writer) are indexed when the file is opened.
+    The key of each line is checked when it is read: an index which is stale, or was
+    rewritten by a concurrent writer, may miss entries but never gives wrong ones.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.index_path = path.with_name(f"{path.name}.idx")
+        # The size of the file when it was indexed
+        self._indexed_size = 0
+        self._reader: BinaryIO | None = None
+        self._map: mmap.mmap | None = None
+        self._views: list[memoryview] = []
+        self._hashes: Sequence[int] = ()
+        self._offsets: Sequence[int] = ()
+        # A value is usually looked up then set: the last lookup is kept for the latter
+        self._last: tuple[str, str | None] | None = None
+
+    def open(self) -> None:
+        """Map the index, indexing the lines appended since it was written"""
+        self._map_index()
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if self._indexed_size > size:
+            # The file was replaced
+            self._unmap()
+        if self._indexed_size < size:
+            self._index_lines(self._indexed_size, size)
+        self._reader = self.path.open("rb")
+
+    def get(self, key: str) -> str | None:
+        """The raw value of the last line written for `key`"""
+        if self._last is not None and self._last[0] == key:
+            return self._last[1]
+        self._last = (key, self._lookup(key))
+        return self._last[1]
+
+    def _lookup(self, key: str) -> str | None:
+        if self._reader is None or not self._hashes:
+            return None
+        encoded = key.encode("utf-8")
+        key_hash = _key_hash(encoded)
+        prefix = encoded + b"\t"
+        index = bisect_right(self._hashes, key_hash)
+        # The pairs of a hash are sorted by offset: the most recent lines come last
+        while index and self._hashes[index - 1] == key_hash:
+            index -= 1
+            self._reader.seek(self._offsets[index])
+            line = self._reader.readline()
+            if line.startswith(prefix) and line.endswith(b"\n"):
+                return line[len(prefix) : -1].decode("utf-8", errors="replace")
+        return None
+
+    def append(self, entries: Mapping[str, str]) -> None:
+        """Write the entries at the end of the file, then index them"""
+        self._last = None
+        lines = [f"{key}\t{raw}\n".encode() for key, raw in entries.items()]
+        data = memoryview(b"".join(lines))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Unbuffered, so that the lines are appended in as few writes as possible
+        with self.path.open("ab", buffering=0) as f:
+            while data:
+                data = data[f.write(data) :]
+            end = f.tell()
+        offset = end - sum(map(len, lines))
+        if self._indexed_size < offset:
+            # Appended by another writer in the meantime
+            self._index_lines(self._indexed_size, offset)
+        pairs = []
+        for line in lines:
+            pairs.append((_key_hash(line.partition(b"\t")[0]), offset))
+            offset += len(line)
+        pairs.sort()
+        self._merge(pairs, end)
+        if self._reader is None:
+            self._reader = self.path.open("rb")
+
+    def _index_lines(self, start: int, end: int) -> None:
+        """Index the lines between those offsets, in batches"""
+        pairs: list[tuple[int, int]] = []
+        with self.path.open("rb") as f:
+            f.seek(start)
+            offset = start
+            while offset < end and (line := f.readline()):
+                key, sep, _ = line.partition(b"\t")
+                # A line may be truncated by an interrupted write
+                if sep and line.endswith(b"\n"):
+                    pairs.append((_key_hash(key), offset))
+                offset += len(line)
+                if len(pairs) >= CommitCache.BATCH_SIZE:
+                    pairs.sort()
+                    self._merge(pairs, offset)
+                    pairs = []
+        pairs.sort()
+        self._merge(pairs, offset)
+
+    def _merge(self, pairs: list[tuple[int, int]], indexed_size: int) -> None:
+        """Rewrite the index with the sorted pairs inserted, atomically"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(
+            "wb",
+            dir=self.index_path.parent,
+            prefix=f".{self.index_path.name}",
+            delete=False,
+        ) as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, indexed_size))
+            start = 0
+            for key_hash, offset in pairs:
+                # Newer than the lines of the same hash, the pair comes after them
+                end = bisect_right(self._hashes, key_hash, start)
+                if start < end:
+                    f.write(self._views[0][2 * start : 2 * end])
+                f.write(_INDEX_PAIR.pack(key_hash, offset))
+                start = end
+            if start < len(self._hashes):
+                f.write(self._views[0][2 * start :])
+        self._unmap()
+        try:
+            os.replace(f.name, self.index_path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+        finally:
+            self._map_index()
+
+    def _map_index(self) -> None:
+        self._unmap()
+        try:
+            with self.index_path.open("rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+                if len(header) < _INDEX_HEADER.size:
+                    return
+                magic, indexed_size = _INDEX_HEADER.unpack(header)
+                size = os.fstat(f.fileno()).st_size - _INDEX_HEADER.size
+                if magic != _INDEX_MAGIC or size % _INDEX_PAIR.size:
+                    return
+                if size:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return
+        self._indexed_size = indexed_size
+        if self._map is not None:
+            pairs = memoryview(self._map)[_INDEX_HEADER.size :].cast("Q")
+            self._views = [pairs, pairs[::2], pairs[1::2]]
+            _, self._hashes, self._offsets = self._views
+
+    def _unmap(self) -> None:
+        self._indexed_size = 0
+        self._hashes = self._offsets = ()
+        # The map can only be closed once no view of it is left
+        while self._views:
+            self._views.pop().release()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def _key_hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+# An index holds the size of the file it indexes then (key hash, line offset) pairs,
+# in the byte order of the machine which wrote it
+_INDEX_MAGIC = b"czidx1" + sys.byteorder[0].encode() + b"\n"
+_INDEX_HEADER = struct.Struct("=8sQ")
+_INDEX_PAIR = struct.Struct("=QQ")
+
+
+class NotesCache(CommitCache):
+    """A `CommitCache` shared between clones through the `refs/notes/commitizen` notes.
+
+    Each commit note holds the entries of that commit, in the cache file format
+    (`<rules key>\t<json value>` lines): one line per rules key, so a commit classified
+    for both bump and changelog has a line for its increment and one for its entries.
+    Notes are only read once, in bulk, when the cache is loaded, and complete the local
+    entries: fresh clones (such as CI ones) fetching the notes ref start warm.
+    Entries missing from the notes are only attached to their commits on `publish`,
+    in a single notes commit. Pushing and fetching the notes ref is left to the user.
+    """
+
+    REF = "refs/notes/commitizen"
+
+    def __init__(self, path: Path, max_entries: int | None = None) -> None:
+        super().__init__(path, max_entries)
+        self._notes: dict[str, bytes] = {}
+        self._noted: set[str] = set()
+        self._unpublished: set[str] = set()
+
+    def get(self, rules_key: str, rev: str) -> Any:
+        value = super().get(rules_key, rev)
+        if value is not MISSING and (key := f"{rules_key}:{rev}") not in self._noted:
+            self._unpublished.add(key)
+        return value
+
+    def set(self, rules_key: str, rev: str, value: Any) -> None:
+        super().set(rules_key, rev, value)
+        if (key := f"{rules_key}:{rev}") not in self._noted:
+            self._unpublished.add(key)
+
+    def publish(self, message: str = "Update commitizen notes") -> None:
+        """Attach the entries missing from the notes to their commits"""
+        if not self._unpublished:
+            return
+        unpublished, self._unpublished = self._unpublished, set()
+        lines: dict[str, list[str]] = {}
+        for key in sorted(unpublished):
+            if (raw := self._pending.get(key) or self._find(key)) is None:
+                continue
+            rules_key, _, rev = key.partition(":")
+            lines.setdefault(rev, []).append(f"{rules_key}\t{raw}\n")
+        notes = {
+            rev: self._notes.get(rev, b"") + "".join(rev_lines).encode("utf-8")
+            for rev, rev_lines in lines.items()
+        }
+
+        c = git.add_notes(self.REF, notes, message)
+        if c.return_code != 0:
+            logger.debug("Unable to publish the commit notes %s: %s", self.REF, c.err)
+            return
+        self._notes.update(notes)
+        self._noted.update(unpublished)
+
+    def _load(self) -> None:
+        super()._load()
+        self._notes = git.get_notes(self.REF)
+        for rev, note in self._notes.items():
+            for line in note.decode("utf-8", errors="replace").splitlines():
+                rules_key, sep, raw = line.partition("\t")
+                if not sep:
+                    continue
+                key = f"{rules_key}:{rev}"
+                self._noted.add(key)
+                # Local entries come first: they can only be more recent
+                if key not in self._pending and self._find(key) is None:
+                    self._add_pending(key, raw)
+
+
+def get_commit_cache(settings: Settings) -> CommitCache | None:
+    """The parsed commits cache of the current repository, backed by notes if enabled"""
+    cache_class = NotesCache if settings.get("notes_cache") else CommitCache
+    return cache_class.for_repository()
+
+
+class FileIndexCache:
+    """Indexes built from files, kept while a file keeps its modification time and size.
+
+    Each index is stored as JSON in its own file, named after a digest of the indexed
+    file real path and of the rules the index depends on.
+    Any I/O error disables the cache: it is an optimization, never a requirement.
+
+    Example:
+
+    ```python
+    cache = FileIndexCache.for_repository()
+    rules = FileIndexCache.rules_key("releases", tag_format)
+    releases = cache.get(rules, "CHANGELOG.md", lambda: index_releases("CHANGELOG.md"))
+    ```
+    """
+
+    # Bump it whenever the format or the meaning of the cached indexes change
+    VERSION = 1
+    DIR_NAME = "files"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @classmethod
+    def for_repository(cls, name: str = DIR_NAME) -> Self | None:
+        """The `name` cache of the current repository, `None` outside of a git project"""
+        try:
+            common_dir = git._get_common_dir()
+        except OSError:
+            return None
+        return cls(common_dir / CACHE_DIR / name)
+
+    @classmethod
+    def rules_key(cls, *rules: Any) -> str:
+        """A digest of everything the cached indexes depend on, besides the file"""
+        payload = json.dumps([cls.VERSION, *rules], sort_keys=True, default=repr)
+        return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+    def get(self, rules_key: str, filepath: str, build: Callable[[], Any]) -> Any:
+        """The index of `filepath` with those rules, built and cached if it is stale.
+
+        Cached indexes are decoded from JSON: tuples are given back as lists.
+        """
+        try:
+            validity = self._validity(filepath)
+        except OSError:
+            return build()
+        name = f"{rules_key}:{os.path.realpath(filepath)}"
+        digest = hashlib.blake2b(name.encode(), digest_size=16).hexdigest()
+        path = self.path / f"{digest}.json"
+        try:
+            entry = _decode(path.read_text(encoding="utf-8"))
+            if entry["validity"] == validity:
+                return entry["value"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, LookupError, TypeError) as e:
+            logger.debug("Unable to read the file index %s: %s", path, e)
+
+        value = build()
+        try:
+            # The file may have changed while being indexed
+            if self._validity(filepath) == validity:
+                self._write(path, {"validity": validity, "value": value})
+        except OSError as e:
+            logger.debug("Unable to write the file index %s: %s", path, e)
+        return value
+
+    @staticmethod
+    def _validity(filepath: str) -> list[int]:
+        stat = os.stat(filepath)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @staticmethod
+    def _write(path: Path, entry: dict[str, Any]) -> None:
+        """Write the entry atomically, so that concurrent readers never see it partial"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=path.parent,
+            prefix=f".{path.name}",
+            delete=False,
+        ) as f:
+            json.dump(entry, f, separators=(",", ":"))
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+
+_instances: dict[tuple[type[CommitCache], Path], CommitCache] = {}
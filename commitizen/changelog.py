@@ -27,28 +27,56 @@ Extra:
 
 from __future__ import annotations
 
+import codecs
+import hashlib
+import io
+import json
+import os
+import pickle
 import re
 from collections import OrderedDict, defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date
+from functools import partial
 from itertools import chain
-from typing import TYPE_CHECKING, Any
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, BinaryIO, TextIO
 
 from deprecated import deprecated
 from jinja2 import (
     BaseLoader,
+    BytecodeCache,
     ChoiceLoader,
     Environment,
+    FileSystemBytecodeCache,
     FileSystemLoader,
     Template,
+    TemplateError,
+    meta,
 )
 
+from commitizen import git, out
+from commitizen.__version__ import __version__
+from commitizen.cache import CACHE_DIR, MISSING
+from commitizen.classifier import CommitClassifier
 from commitizen.exceptions import InvalidConfigurationError, NoCommitsFoundError
-from commitizen.tags import TagRules
+from commitizen.tags import TagIndex, TagRules
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterable, Mapping, MutableMapping, Sequence
+    from collections.abc import (
+        Generator,
+        Iterable,
+        Iterator,
+        Mapping,
+        MutableMapping,
+        Sequence,
+    )
+
+    from jinja2.runtime import Context
 
+    from commitizen.cache import CommitCache
+    from commitizen.classifier import CommitRecord
     from commitizen.cz.base import ChangelogReleaseHook, MessageBuilderHook
     from commitizen.git import GitCommit, GitTag
 
@@ -64,6 +92,10 @@ class Metadata:
     latest_version: str | None = None
     latest_version_position: int | None = None
     latest_version_tag: str | None = None
+    # The byte offsets of the lines above in the changelog file, when read from it
+    unreleased_start_offset: int | None = field(default=None, compare=False)
+    unreleased_end_offset: int | None = field(default=None, compare=False)
+    latest_version_offset: int | None = field(default=None, compare=False)
 
     def __post_init__(self) -> None:
         if self.latest_version and not self.latest_version_tag:
@@ -72,13 +104,15 @@ class Metadata:
             self.latest_version_tag = self.latest_version
 
 
-def get_commit_tag(commit: GitCommit, tags: list[GitTag]) -> GitTag | None:
+def get_commit_tag(commit: GitCommit, tags: Iterable[GitTag]) -> GitTag | None:
+    if isinstance(tags, TagIndex):
+        return tags.first_for_rev(commit.rev)
     return next((tag for tag in tags if tag.rev == commit.rev), None)
 
 
 def generate_tree_from_commits(
-    commits: list[GitCommit],
-    tags: list[GitTag],
+    commits: Iterable[GitCommit],
+    tags: Iterable[GitTag],
     commit_parser: str,
     changelog_pattern: str,
     unreleased_version: str | None = None,
@@ -86,15 +120,39 @@ def generate_tree_from_commits(
     changelog_message_builder_hook: MessageBuilderHook | None = None,
     changelog_release_hook: ChangelogReleaseHook | None = None,
     rules: TagRules | None = None,
+    cache: CommitCache | None = None,
+    classifier: CommitClassifier | None = None,
+    jobs: int = 1,
 ) -> Generator[dict[str, Any], None, None]:
-    pat = re.compile(changelog_pattern)
-    map_pat = re.compile(commit_parser, re.MULTILINE)
-    body_map_pat = re.compile(commit_parser, re.MULTILINE | re.DOTALL)
+    """Group the commits changes by release.
+
+    The `commits` are consumed lazily, as the releases are, and can be streamed from
+    `git.iter_commits` without holding the whole history.
+    With a `cache`, the entries parsed from each commit are persisted and only the
+    commits it does not know yet are parsed. The hooks still run on every entry.
+    A `classifier` compiled from the same rules can be given to share its records,
+    such as those of the commits already classified for the bump.
+
+    With more than one of `jobs`, the commits are parsed, and the message builder hook
+    run, by as many worker processes. The hook must then be picklable and must not
+    depend on the entries it was called with before, otherwise they are parsed here.
+    """
+    if classifier is None:
+        classifier = CommitClassifier(
+            commit_parser=commit_parser, changelog_pattern=changelog_pattern
+        )
+    in_workers = jobs > 1 and _can_run_in_workers(
+        classifier, changelog_message_builder_hook, change_type_map
+    )
     rules = rules or TagRules()
+    tags = TagIndex.of(tags, rules)
 
     # Check if the latest commit is not tagged
 
-    current_tag = get_commit_tag(commits[0], tags) if commits else None
+    commits = iter(commits)
+    if (first_commit := next(commits, None)) is not None:
+        commits = chain([first_commit], commits)
+    current_tag = get_commit_tag(first_commit, tags) if first_commit else None
     current_tag_name = unreleased_version or "Unreleased"
     current_tag_date = (
         date.today().isoformat() if unreleased_version is not None else ""
@@ -109,7 +167,19 @@ def generate_tree_from_commits(
 
     commit_tag: GitTag | None = None
     changes: dict = defaultdict(list)
-    for commit in commits:
+    parsed_commits: Iterator[tuple[GitCommit, Any]] = (
+        _iter_parsed_in_workers(
+            commits,
+            classifier,
+            cache,
+            changelog_message_builder_hook,
+            change_type_map,
+            jobs,
+        )
+        if in_workers
+        else classifier.iter_records(commits, cache)
+    )
+    for commit, parsed in parsed_commits:
         if (
             (commit_tag := get_commit_tag(commit, tags))
             and commit_tag not in used_tags
@@ -128,22 +198,21 @@ def generate_tree_from_commits(
             current_tag_date = commit_tag.date
             changes = defaultdict(list)
 
-        if not pat.match(commit.message):
+        if in_workers:
+            for change_type, messages in parsed.items():
+                changes[change_type].extend(messages)
             continue
-
-        # Process subject and body from commit message
-        for message in chain(
-            [map_pat.match(commit.message)],
-            (body_map_pat.match(block) for block in commit.body.split("\n\n")),
-        ):
-            if message:
-                process_commit_message(
-                    changelog_message_builder_hook,
-                    message,
-                    commit,
-                    changes,
-                    change_type_map,
-                )
+        for entry in parsed.entries:
+            process_commit_message(
+                changelog_message_builder_hook,
+                entry,
+                commit,
+                changes,
+                change_type_map,
+            )
+
+    if cache:
+        cache.flush()
 
     release = {
         "version": current_tag_name,
@@ -155,9 +224,107 @@ def generate_tree_from_commits(
     yield release
 
 
+# Below that many commits per chunk, starting the workers costs more than it saves
+_MIN_COMMITS_PER_CHUNK = 1000
+_CHUNKS_PER_JOB = 4
+
+_worker_rules: (
+    tuple[CommitClassifier, MessageBuilderHook | None, Mapping[str, str] | None] | None
+) = None
+
+
+def _can_run_in_workers(
+    classifier: CommitClassifier,
+    hook: MessageBuilderHook | None,
+    change_type_map: Mapping[str, str] | None,
+) -> bool:
+    try:
+        pickle.dumps((classifier, hook, change_type_map))
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        out.warn(
+            "The changelog message builder hook can't be sent to worker processes "
+            f"({e}): the commits are parsed serially, --jobs is ignored."
+        )
+        return False
+    return True
+
+
+def _init_worker(
+    classifier: CommitClassifier,
+    hook: MessageBuilderHook | None,
+    change_type_map: Mapping[str, str] | None,
+) -> None:
+    global _worker_rules
+    _worker_rules = (classifier, hook, change_type_map)
+
+
+def _parse_chunk(
+    chunk: list[tuple[GitCommit, CommitRecord | None]],
+) -> list[tuple[dict[str | None, list], CommitRecord | None]]:
+    if _worker_rules is None:
+        raise RuntimeError("The worker rules are not initialized")
+    return _parse_commits(chunk, *_worker_rules)
+
+
+def _parse_commits(
+    chunk: list[tuple[GitCommit, CommitRecord | None]],
+    classifier: CommitClassifier,
+    hook: MessageBuilderHook | None,
+    change_type_map: Mapping[str, str] | None,
+) -> list[tuple[dict[str | None, list], CommitRecord | None]]:
+    """The changes of each commit, with its record if it had to be classified"""
+    parsed = []
+    for commit, known in chunk:
+        record = known or classifier.classify(commit)
+        changes: dict[str | None, list] = defaultdict(list)
+        for entry in record.entries:
+            process_commit_message(hook, entry, commit, changes, change_type_map)
+        parsed.append((dict(changes), None if known else record))
+    return parsed
+
+
+def _iter_parsed_in_workers(
+    commits: Iterable[GitCommit],
+    classifier: CommitClassifier,
+    cache: CommitCache | None,
+    hook: MessageBuilderHook | None,
+    change_type_map: Mapping[str, str] | None,
+    jobs: int,
+) -> Iterator[tuple[GitCommit, dict[str | None, list]]]:
+    """The changes of each commit, in order, parsed by `jobs` worker processes.
+
+    The commits are split into contiguous chunks whose changes are merged back in the
+    commits order, so the releases are grouped exactly as when parsed serially.
+    The records already known are sent along, the new ones are remembered here.
+    """
+    known = [(commit, classifier.recall(commit, cache)) for commit in commits]
+    size = max(_MIN_COMMITS_PER_CHUNK, -(-len(known) // (jobs * _CHUNKS_PER_JOB)))
+    chunks = [known[i : i + size] for i in range(0, len(known), size)]
+    initargs = (classifier, hook, change_type_map)
+    if len(chunks) < 2:
+        results: Iterator[list] = (_parse_commits(c, *initargs) for c in chunks)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=min(jobs, len(chunks)),
+            initializer=_init_worker,
+            initargs=initargs,
+        )
+        results = executor.map(_parse_chunk, chunks)
+    try:
+        for chunk, parsed in zip(chunks, results):
+            for (commit, _), (changes, record) in zip(chunk, parsed):
+                if record is not None:
+                    classifier.remember(commit, record, cache)
+                yield commit, changes
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
 def process_commit_message(
     hook: MessageBuilderHook | None,
-    parsed: re.Match[str],
+    parsed: re.Match[str] | Mapping[str, Any],
     commit: GitCommit,
     ref_changes: MutableMapping[str | None, list],
     change_type_map: Mapping[str, str] | None = None,
@@ -167,7 +334,7 @@ def process_commit_message(
         "parents": commit.parents,
         "author": commit.author,
         "author_email": commit.author_email,
-        **parsed.groupdict(),
+        **(parsed.groupdict() if isinstance(parsed, re.Match) else parsed),
     }
 
     processed_msg = hook(message, commit) if hook else message
@@ -206,14 +373,48 @@ def _calculate_sorted_changes(
 
 
 def get_changelog_template(loader: BaseLoader, template: str) -> Template:
-    loader = ChoiceLoader(
-        [
-            FileSystemLoader("."),
-            loader,
-        ]
+    # An override appearing (or going) doesn't outdate the template loaded before
+    overridden = os.path.isfile(template)
+    return _get_environment(loader, overridden).get_template(template)
+
+
+def _get_environment(loader: BaseLoader, overridden: bool) -> Environment:
+    """The environment of a loader, shared so that each template is compiled once.
+
+    Templates from the current directory take precedence over the loader ones, so
+    environments are per directory too. Compiled templates are also kept in the
+    repository git directory, so that later invocations don't compile them again.
+    Modified templates are compiled again, the cached ones being checked against
+    their source.
+    """
+    bytecode_cache = _get_bytecode_cache()
+    key = (
+        loader,
+        os.getcwd(),
+        overridden,
+        bytecode_cache.directory
+        if isinstance(bytecode_cache, FileSystemBytecodeCache)
+        else None,
     )
-    env = Environment(loader=loader, trim_blocks=True)
-    return env.get_template(template)
+    if (env := _environments.get(key)) is None:
+        env = _environments[key] = Environment(
+            loader=ChoiceLoader([FileSystemLoader("."), loader]),
+            trim_blocks=True,
+            bytecode_cache=bytecode_cache,
+        )
+    return env
+
+
+def _get_bytecode_cache() -> BytecodeCache | None:
+    try:
+        directory = git._get_common_dir() / CACHE_DIR / "templates"
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(str(directory))
+
+
+_environments: dict[tuple[BaseLoader, str, bool, str | None], Environment] = {}
 
 
 def render_changelog(
@@ -227,6 +428,117 @@ def render_changelog(
     return changelog
 
 
+def stream_changelog(
+    tree: Iterable,
+    loader: BaseLoader,
+    template: str,
+    release_cache: CommitCache | None = None,
+    **kwargs: Any,
+) -> Iterator[str]:
+    """Render the changelog chunk by chunk, consuming the tree as it goes.
+
+    Its leading newlines are stripped.
+    With a `release_cache`, the releases rendered by the `release` block of the
+    template are kept in it, and only rendered again when they change.
+    """
+    jinja_template = get_changelog_template(loader, template)
+    context = jinja_template.new_context({"tree": tree, **kwargs})
+    if release_cache is not None:
+        _cache_releases(jinja_template, context, release_cache, kwargs)
+
+    chunks = _generate(jinja_template, context)
+    for chunk in chunks:
+        if chunk := chunk.lstrip("\n"):
+            yield chunk
+            break
+    yield from chunks
+    if release_cache is not None:
+        release_cache.flush()
+
+
+def _generate(template: Template, context: Context) -> Iterator[str]:
+    """`Template.generate`, from a context prepared beforehand"""
+    try:
+        yield from template.root_render_func(context)
+    except Exception:
+        template.environment.handle_exception()
+
+
+def _cache_releases(
+    template: Template,
+    context: Context,
+    cache: CommitCache,
+    variables: Mapping[str, Any],
+) -> None:
+    """Render the `release` block of the template through the cache.
+
+    The built-in templates render each entry of the tree with a scoped `release` block.
+    As long as it only depends on the `entry` and the template variables, a release
+    is only rendered once for a given template: the sections rendered are cached by
+    the digest of their entry. The first release, which may be the unreleased one, is
+    always rendered, and so are those whose entry isn't plain JSON, as its digest would
+    not be stable across runs. Nothing is cached when the variables aren't plain JSON.
+    """
+    if not (blocks := context.blocks.get("release")):
+        return
+    if (sources_digest := _template_sources_digest(template)) is None:
+        return
+    try:
+        variables_payload = json.dumps(variables, sort_keys=True)
+    except (TypeError, ValueError):
+        return
+    rules_key = cache.rules_key(
+        "release", __version__, sources_digest, variables_payload
+    )
+    render = blocks[0]
+    rendered = 0
+
+    def render_release(block_context: Context) -> Iterator[str]:
+        nonlocal rendered
+        rendered += 1
+        entry = block_context.get("entry")
+        if rendered == 1 or not isinstance(entry, dict):
+            yield from render(block_context)
+            return
+        try:
+            # The order of the changes matters, keys are not sorted
+            payload = json.dumps(entry)
+        except (TypeError, ValueError):
+            yield from render(block_context)
+            return
+        digest = hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+        if (section := cache.get(rules_key, digest)) is MISSING:
+            section = "".join(render(block_context))
+            cache.set(rules_key, digest, section)
+        yield section
+
+    blocks[0] = render_release
+
+
+def _template_sources_digest(template: Template) -> str | None:
+    """A digest of the sources of the template and of the templates it references.
+
+    `None` if any of them can't be found, such as those referenced dynamically.
+    """
+    env = template.environment
+    digest = hashlib.blake2b(digest_size=16)
+    names: list[str | None] = [template.name]
+    seen: set[str] = set()
+    while names:
+        if (name := names.pop()) in seen:
+            continue
+        if name is None or env.loader is None:
+            return None
+        seen.add(name)
+        try:
+            source, _, _ = env.loader.get_source(env, name)
+            names.extend(meta.find_referenced_templates(env.parse(source)))
+        except (TemplateError, OSError):
+            return None
+        digest.update(f"{name}\0{source}\0".encode())
+    return digest.hexdigest()
+
+
 def incremental_build(
     new_content: str, lines: list[str], metadata: Metadata
 ) -> list[str]:
@@ -243,12 +555,19 @@ def incremental_build(
     Returns:
         Updated lines
     """
+    return list(iter_incremental_build([new_content], lines, metadata))
+
+
+def iter_incremental_build(
+    new_content: Iterable[str], lines: Iterable[str], metadata: Metadata
+) -> Iterator[str]:
+    """Same as `incremental_build`, lazily, with the new content given in chunks."""
     unreleased_start = metadata.unreleased_start
     unreleased_end = metadata.unreleased_end
     latest_version_position = metadata.latest_version_position
 
     skip = False
-    output_lines: list[str] = []
+    last_line = ""
     for index, line in enumerate(lines):
         if index == unreleased_start:
             skip = True
@@ -264,24 +583,161 @@ def incremental_build(
             continue
 
         if index == latest_version_position:
-            output_lines.extend([new_content, "\n"])
-        output_lines.append(line)
+            yield from new_content
+            yield "\n"
+        yield line
+        last_line = line
 
     if latest_version_position is not None:
-        return output_lines
+        return
 
-    if output_lines and output_lines[-1].strip():
+    if last_line.strip():
         # Ensure at least one blank line between existing and new content.
-        output_lines.append("\n")
-    output_lines.append(new_content)
-    return output_lines
+        yield "\n"
+    yield from new_content
+
+
+def write_incremental(
+    new_content: Iterable[str],
+    changelog_file: BinaryIO,
+    output: TextIO,
+    metadata: Metadata,
+    encoding: str,
+    eol: str = "\n",
+) -> None:
+    """Write the changelog file updated with the new content, as `incremental_build`.
+
+    Only the head of the file, up to the latest version title and past the unreleased
+    section, is decoded and rebuilt. The rest is copied as is, in chunks, unless its
+    lines don't all end with `eol`, the line ending the output writes: the whole file
+    is rebuilt then, so as not to mix line endings.
+    """
+    head_end = _incremental_head_end(metadata)
+    if head_end is not None and _is_ascii_compatible(encoding):
+        # Only the new releases: kept to rebuild the whole file if need be
+        new_content = list(new_content)
+        start = output.tell()
+        head = _read_head(changelog_file, encoding, *head_end)
+        output.writelines(iter_incremental_build(new_content, head, metadata))
+        output.flush()
+        if _copy_lines_ending_with(changelog_file, output.buffer, eol.encode(encoding)):
+            return
+        output.seek(start)
+        output.truncate()
+        changelog_file.seek(0)
+
+    lines = io.TextIOWrapper(changelog_file, encoding=encoding)
+    output.writelines(iter_incremental_build(new_content, lines, metadata))
+    # Don't let the wrapper close the file it was given
+    lines.detach()
+
+
+_COPY_CHUNK_SIZE = 64 * 1024
+
+
+def _copy_lines_ending_with(source: BinaryIO, target: BinaryIO, eol: bytes) -> bool:
+    """Copy the rest of `source` to `target` as long as its lines all end with `eol`.
+
+    Both are read and written in chunks; `False` as soon as a line ending differs,
+    part of the source being copied already then.
+    """
+    cr = lf = crlf = 0
+    last = b""
+    for chunk in iter(partial(source.read, _COPY_CHUNK_SIZE), b""):
+        cr += chunk.count(b"\r")
+        lf += chunk.count(b"\n")
+        crlf += chunk.count(b"\r\n") + (last == b"\r" and chunk[:1] == b"\n")
+        last = chunk[-1:]
+        if eol == b"\n":
+            mismatch = cr > 0
+        else:
+            # A `\r` ending the chunk may start a `\r\n` ending the next one
+            mismatch = lf != crlf or cr != crlf + (last == b"\r")
+        if mismatch:
+            return False
+        target.write(chunk)
+    return last != b"\r"
+
+
+def iter_lines_with_offsets(
+    file: BinaryIO, encoding: str
+) -> Iterator[tuple[int, int, str]]:
+    """The lines of a binary file decoded as in text mode, with their byte offsets.
+
+    Each line comes with the offsets of its start and of its end, from the current
+    position of the file. The encoding must be ASCII compatible.
+    """
+    decode = codecs.getincrementaldecoder(encoding)().decode
+    offset = file.tell()
+    for raw_line in iter(file.readline, b""):
+        # Like universal newlines, a lone `\r` ends a line too
+        for piece in raw_line.splitlines(keepends=True):
+            end = offset + len(piece)
+            line = decode(piece)
+            if line.endswith("\r\n"):
+                line = line[:-2] + "\n"
+            elif line.endswith("\r"):
+                line = line[:-1] + "\n"
+            yield offset, end, line
+            offset = end
+
+
+def _is_ascii_compatible(encoding: str) -> bool:
+    return "\r\n".encode(encoding) == b"\r\n"
+
+
+def _read_head(
+    file: BinaryIO, encoding: str, last_index: int, last_offset: int | None
+) -> Iterator[str]:
+    """The lines up to the last one of the head, leaving the file right after it.
+
+    The last line is found by its offset when known, by its index otherwise.
+    """
+    lines = iter_lines_with_offsets(file, encoding)
+    for index, (start, end, line) in enumerate(lines):
+        yield line
+        if start == last_offset if last_offset is not None else index == last_index:
+            file.seek(end)
+            return
+
+
+def _incremental_head_end(metadata: Metadata) -> tuple[int, int | None] | None:
+    """The index and offset of the last line `incremental_build` may change.
+
+    `None` if the new content goes at the end or the rest of the file is dropped.
+    """
+    if metadata.latest_version_position is None:
+        return None
+    if metadata.unreleased_start is not None and (
+        metadata.unreleased_end is None
+        or metadata.unreleased_end < metadata.unreleased_start
+    ):
+        return None
+    return max(
+        (
+            (index, offset)
+            for index, offset in (
+                (metadata.unreleased_start, metadata.unreleased_start_offset),
+                (metadata.unreleased_end, metadata.unreleased_end_offset),
+                (metadata.latest_version_position, metadata.latest_version_offset),
+            )
+            if index is not None
+        ),
+        key=itemgetter(0),
+    )
 
 
 def get_next_tag_name_after_version(tags: Iterable[GitTag], version: str) -> str | None:
-    it = iter(tag.name for tag in tags)
-    for name in it:
-        if name == version:
-            return next(it, None)
+    if isinstance(tags, TagIndex):
+        try:
+            return tags.next_name(version)
+        except KeyError:
+            pass
+    else:
+        it = iter(tag.name for tag in tags)
+        for name in it:
+            if name == version:
+                return next(it, None)
 
     raise NoCommitsFoundError(f"Could not find a valid revision range. {version=}")
 
@@ -328,6 +784,7 @@ def get_oldest_and_newest_rev(
     - `0.1.0..0.4.0`: as a range
     - `0.3.0`: as a single version
     """
+    tags = TagIndex.of(tags, rules)
     oldest_version, sep, newest_version = version.partition("..")
     if not sep:
         newest_version = version
@@ -47,6 +47,12 @@ class ChangelogFormat(Protocol):
         """
         raise NotImplementedError
 
+    def get_release_ranges(self, filepath: str) -> dict[str, tuple[int, int]]:
+        """
+        Index the byte range of each release section by its version.
+        """
+        raise NotImplementedError
+
 
 KNOWN_CHANGELOG_FORMATS: dict[str, type[ChangelogFormat]] = {
     ep.name: ep.load()
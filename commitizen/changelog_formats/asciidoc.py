@@ -13,6 +13,7 @@ class AsciiDoc(BaseFormat):
     extension = "adoc"
 
     RE_TITLE = re.compile(r"^(?P<level>=+) (?P<title>.*)$")
+    RE_TITLE_MARKER = re.compile(rb"^[^\S\n]*=+ ", re.MULTILINE)
 
     def parse_version_from_title(self, line: str) -> VersionTag | None:
         m = self.RE_TITLE.match(line)
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import mmap
 import os
+import re
 from abc import ABCMeta
-from typing import IO, TYPE_CHECKING, Any, ClassVar
+from typing import IO, TYPE_CHECKING, Any, BinaryIO, ClassVar, cast
 
-from commitizen.changelog import Metadata
+from commitizen.changelog import (
+    Metadata,
+    _is_ascii_compatible,
+    iter_lines_with_offsets,
+)
 from commitizen.tags import TagRules, VersionTag
 from commitizen.version_schemes import get_version_scheme
 
 from . import ChangelogFormat
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
     from commitizen.config.base_config import BaseConfig
 
 
@@ -22,6 +30,12 @@ class BaseFormat(ChangelogFormat, metaclass=ABCMeta):
     extension: ClassVar[str] = ""
     alternative_extensions: ClassVar[set[str]] = set()
 
+    RE_TITLE_MARKER: ClassVar[re.Pattern[bytes] | None] = None
+    """
+    A multiline byte regex matching the start of every line `parse_title_level`
+    may accept, used to scan a memory-mapped changelog for its metadata
+    """
+
     def __init__(self, config: BaseConfig) -> None:
         # Constructor needs to be redefined because `Protocol` prevent instantiation by default
         # See: https://bugs.python.org/issue44807
@@ -37,15 +51,61 @@ class BaseFormat(ChangelogFormat, metaclass=ABCMeta):
         if not os.path.isfile(filepath):
             return Metadata()
 
-        with open(
-            filepath, encoding=self.config.settings["encoding"]
-        ) as changelog_file:
-            return self.get_metadata_from_file(changelog_file)
+        encoding = self.config.settings["encoding"]
+        if not _is_ascii_compatible(encoding):
+            with open(filepath, encoding=encoding) as changelog_file:
+                return self.get_metadata_from_file(changelog_file)
+
+        with open(filepath, "rb") as changelog_file:
+            if (
+                self.RE_TITLE_MARKER is not None
+                and type(self).get_metadata_from_file
+                is BaseFormat.get_metadata_from_file
+            ):
+                mapped_meta = self._get_mapped_metadata(
+                    changelog_file, encoding, self.RE_TITLE_MARKER
+                )
+                if mapped_meta is not None:
+                    return mapped_meta
+            lines = _OffsetLines(changelog_file, encoding)
+            meta = self.get_metadata_from_file(cast("IO[str]", lines))
+        meta.unreleased_start_offset = lines.offset(meta.unreleased_start)
+        meta.unreleased_end_offset = lines.offset(meta.unreleased_end)
+        meta.latest_version_offset = lines.offset(meta.latest_version_position)
+        return meta
+
+    def _get_mapped_metadata(
+        self, file: BinaryIO, encoding: str, pattern: re.Pattern[bytes]
+    ) -> Metadata | None:
+        """
+        Extract the metadata from the title lines found in the memory-mapped file
+
+        `None` if the file can't be mapped or has lines ended by a lone carriage return.
+        """
+        if os.fstat(file.fileno()).st_size == 0:
+            return Metadata()
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        with buffer:
+            titles = _MappedTitles(buffer, pattern, encoding)
+            meta = self._get_metadata_from_lines(titles)
+        if not titles.complete:
+            return None
+        meta.unreleased_start_offset = titles.offset(meta.unreleased_start)
+        meta.unreleased_end_offset = titles.offset(meta.unreleased_end)
+        meta.latest_version_offset = titles.offset(meta.latest_version_position)
+        return meta
 
     def get_metadata_from_file(self, file: IO[Any]) -> Metadata:
+        return self._get_metadata_from_lines(enumerate(file))
+
+    def _get_metadata_from_lines(self, lines: Iterable[tuple[int, str]]) -> Metadata:
         meta = Metadata()
         unreleased_level: int | None = None
-        for index, line in enumerate(file):
+        for index, line in lines:
             line = line.strip().lower()
 
             unreleased: int | None = None
@@ -71,6 +131,59 @@ class BaseFormat(ChangelogFormat, metaclass=ABCMeta):
 
         return meta
 
+    def get_release_ranges(self, filepath: str) -> dict[str, tuple[int, int]]:
+        """
+        Index the byte range of each release section of the changelog by its version
+
+        The encoding must be ASCII compatible.
+        """
+        if not os.path.isfile(filepath):
+            return {}
+
+        encoding = self.config.settings["encoding"]
+        with open(filepath, "rb") as changelog_file:
+            size = os.fstat(changelog_file.fileno()).st_size
+            if self.RE_TITLE_MARKER is not None and size:
+                ranges = self._get_mapped_release_ranges(
+                    changelog_file, encoding, self.RE_TITLE_MARKER, size
+                )
+                if ranges is not None:
+                    return ranges
+            lines = iter_lines_with_offsets(changelog_file, encoding)
+            return _release_ranges(
+                self.iter_release_titles((start, line) for start, _, line in lines),
+                size,
+            )
+
+    def _get_mapped_release_ranges(
+        self, file: BinaryIO, encoding: str, pattern: re.Pattern[bytes], size: int
+    ) -> dict[str, tuple[int, int]] | None:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        with buffer:
+            titles = _MappedTitles(buffer, pattern, encoding)
+            ranges = _release_ranges(
+                self.iter_release_titles(titles.with_offsets()), size
+            )
+        return ranges if titles.complete else None
+
+    def iter_release_titles(
+        self, lines: Iterable[tuple[int, str]]
+    ) -> Iterator[tuple[int, int, str | None]]:
+        """
+        The offset, level and version (if any) of each title among the lines,
+        given with their offset
+        """
+        for offset, line in lines:
+            line = line.strip().lower()
+            if (level := self.parse_title_level(line)) is None:
+                continue
+            parsed = self.parse_version_from_title(line)
+            yield offset, level, parsed.version if parsed else None
+
     def parse_version_from_title(self, line: str) -> VersionTag | None:
         """
         Extract the version from a title line if any
@@ -86,3 +199,136 @@ class BaseFormat(ChangelogFormat, metaclass=ABCMeta):
         raise NotImplementedError(
             "Default `get_metadata_from_file` requires `parse_title_type_of_line` to be implemented"
         )
+
+
+class _OffsetLines:
+    """A binary file read as a text one, recording the byte offset of each line read.
+
+    Only the lines read are decoded, so that formats stopping at the latest version
+    never read further.
+    """
+
+    def __init__(self, file: BinaryIO, encoding: str) -> None:
+        self._lines = iter_lines_with_offsets(file, encoding)
+        self._offsets: list[int] = []
+        self._end = 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.readline, "")
+
+    def readline(self) -> str:
+        for start, end, line in self._lines:
+            self._offsets.append(start)
+            self._end = end
+            return line
+        return ""
+
+    def readlines(self) -> list[str]:
+        return list(self)
+
+    def read(self) -> str:
+        return "".join(self)
+
+    def offset(self, index: int | None) -> int | None:
+        """The offset of the line at `index`, the end of the file read right after"""
+        if index is None or index > len(self._offsets):
+            return None
+        return self._offsets[index] if index < len(self._offsets) else self._end
+
+
+class _MappedTitles:
+    """The candidate title lines of a memory-mapped file, with their index.
+
+    Lines are found by searching the title marker over the mapped bytes, and only
+    them are decoded, along with the last line of the file. Lines indented with
+    whitespace the byte marker can't skip, like a no-break space, are decoded too
+    so they are stripped as in text mode. Lines ended by a lone carriage return are
+    not counted as text mode does, so the scan stops there as incomplete.
+    """
+
+    def __init__(
+        self, buffer: mmap.mmap, pattern: re.Pattern[bytes], encoding: str
+    ) -> None:
+        self._buffer = buffer
+        self._pattern = pattern
+        self._candidates = re.compile(
+            pattern.pattern + b"|" + _RE_OTHER_INDENT.pattern, pattern.flags
+        )
+        self._encoding = encoding
+        self._offsets: dict[int, int] = {}
+        self.complete = True
+
+    def __iter__(self) -> Iterator[tuple[int, str]]:
+        buffer = self._buffer
+        index = position = 0
+        for match in self._candidates.finditer(buffer):
+            start = match.start()
+            end = buffer.find(b"\n", start) + 1 or len(buffer)
+            if (
+                not self._pattern.match(buffer, start)
+                and not buffer[start:end].decode(self._encoding)[:1].isspace()
+            ):
+                continue
+            if (newlines := self._count_newlines(position, start, end)) is None:
+                return
+            index += newlines
+            yield self._line(index, start, end)
+            position = start
+
+        start = buffer.rfind(b"\n", 0, len(buffer) - 1) + 1
+        if (newlines := self._count_newlines(position, start, len(buffer))) is None:
+            return
+        index += newlines
+        if index not in self._offsets:
+            yield self._line(index, start, len(buffer))
+
+    def _count_newlines(self, position: int, start: int, end: int) -> int | None:
+        """The number of lines from `position` to the line at `start`, ending at `end`"""
+        chunk = self._buffer[position:end]
+        if _RE_LONE_CR.search(chunk):
+            self.complete = False
+            return None
+        return chunk.count(b"\n", 0, start - position)
+
+    def _line(self, index: int, start: int, end: int) -> tuple[int, str]:
+        self._offsets[index] = start
+        return index, self._buffer[start:end].decode(self._encoding)
+
+    def offset(self, index: int | None) -> int | None:
+        return None if index is None else self._offsets.get(index)
+
+    def with_offsets(self) -> Iterator[tuple[int, str]]:
+        """The lines with their offset instead of their index"""
+        for index, line in self:
+            yield self._offsets[index], line
+
+
+def _release_ranges(
+    titles: Iterable[tuple[int, int, str | None]], end: int
+) -> dict[str, tuple[int, int]]:
+    """The range of each release section, up to the next title of its level or above.
+
+    A version appearing more than once is given its first section.
+    """
+    ranges: dict[str, tuple[int, int]] = {}
+    # The sections not ended yet, from the outermost one
+    sections: list[tuple[int, str, int]] = []
+
+    def close(section: tuple[int, str, int], offset: int) -> None:
+        _, version, start = section
+        if version not in ranges or start < ranges[version][0]:
+            ranges[version] = (start, offset)
+
+    for offset, level, version in titles:
+        while sections and sections[-1][0] >= level:
+            close(sections.pop(), offset)
+        if version:
+            sections.append((level, version, offset))
+    while sections:
+        close(sections.pop(), end)
+    return ranges
+
+
+_RE_LONE_CR = re.compile(rb"\r(?!\n)")
+# Lines starting with bytes `str.strip` may count as whitespace but `\s` doesn't
+_RE_OTHER_INDENT = re.compile(rb"^[^\S\n]*[\x1c-\x1f\x80-\xff]", re.MULTILINE)
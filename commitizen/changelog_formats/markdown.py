@@ -15,6 +15,7 @@ class Markdown(BaseFormat):
     alternative_extensions = {"markdown", "mkd"}
 
     RE_TITLE = re.compile(r"^(?P<level>#+) (?P<title>.*)$")
+    RE_TITLE_MARKER = re.compile(rb"^[^\S\n]*#+ ", re.MULTILINE)
 
     def parse_version_from_title(self, line: str) -> VersionTag | None:
         m = self.RE_TITLE.match(line)
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from itertools import zip_longest
-from typing import IO
+from typing import IO, TYPE_CHECKING
 
 from commitizen.changelog import Metadata
 
 from .base import BaseFormat
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from typing import TypeAlias
+
+    # An underline character, or overline and underline ones
+    TitleKind: TypeAlias = str | tuple[str, str]
+
 
 class RestructuredText(BaseFormat):
     extension = "rst"
@@ -20,30 +26,20 @@ class RestructuredText(BaseFormat):
         It requires its own algorithm.
 
         For a more generic approach, you need to rely on `docutils`.
+
+        Lines are read through a window of 3, up to the latest version title only.
         """
         out_metadata = Metadata()
-        unreleased_title_kind: str | tuple[str, str] | None = None
-        is_overlined_title = False
-        lines = [line.strip().lower() for line in file.readlines()]
+        unreleased_title_kind: TitleKind | None = None
+        lines_read = 0
 
-        for index, (first, second, third) in enumerate(
-            zip_longest(lines, lines[1:], lines[2:], fillvalue="")
-        ):
-            title: str | None = None
-            kind: str | tuple[str, str] | None = None
-            if _is_overlined_title(first, second, third):
-                title = second
-                kind = (first[0], third[0])
-                is_overlined_title = True
-            elif not is_overlined_title and _is_underlined_title(first, second):
-                title = first
-                kind = second[0]
-            else:
-                is_overlined_title = False
-
-            if not title:
-                continue
+        def read_lines() -> Iterator[str]:
+            nonlocal lines_read
+            for line in file:
+                lines_read += 1
+                yield line.strip().lower()
 
+        for index, title, kind in _iter_titles(enumerate(read_lines())):
             if "unreleased" in title:
                 unreleased_title_kind = kind
                 out_metadata.unreleased_start = index
@@ -65,11 +61,51 @@ class RestructuredText(BaseFormat):
             out_metadata.unreleased_end = (
                 out_metadata.latest_version_position
                 if out_metadata.latest_version
-                else len(lines)
+                else lines_read
             )
 
         return out_metadata
 
+    def iter_release_titles(
+        self, lines: Iterable[tuple[int, str]]
+    ) -> Iterator[tuple[int, int, str | None]]:
+        """
+        Title levels are given by the order in which their kinds first occur.
+        """
+        levels: dict[TitleKind, int] = {}
+        stripped = ((offset, line.strip().lower()) for offset, line in lines)
+        for offset, title, kind in _iter_titles(stripped):
+            level = levels.setdefault(kind, len(levels))
+            version = self.tag_rules.search_version(title)
+            yield offset, level, version.version if version else None
+
+
+def _iter_titles(
+    lines: Iterable[tuple[int, str]],
+) -> Iterator[tuple[int, str, TitleKind]]:
+    """Each title among the stripped lines, with the position of its first line"""
+    is_overlined_title = False
+    for (position, first), (_, second), (_, third) in _windows(lines):
+        if _is_overlined_title(first, second, third):
+            is_overlined_title = True
+            yield position, second, (first[0], third[0])
+        elif not is_overlined_title and _is_underlined_title(first, second):
+            yield position, first, second[0]
+        else:
+            is_overlined_title = False
+
+
+def _windows(
+    lines: Iterable[tuple[int, str]],
+) -> Iterator[tuple[tuple[int, str], tuple[int, str], tuple[int, str]]]:
+    """Each line along with the next two ones, empty past the end"""
+    lines = iter(lines)
+    empty = (-1, "")
+    window = [next(lines, None), next(lines, None), next(lines, None)]
+    while (first := window[0]) is not None:
+        yield first, window[1] or empty, window[2] or empty
+        window = [window[1], window[2], next(lines, None)]
+
 
 def _is_overlined_title(first: str, second: str, third: str) -> bool:
     return (
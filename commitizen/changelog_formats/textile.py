@@ -13,6 +13,7 @@ class Textile(BaseFormat):
     extension = "textile"
 
     RE_TITLE = re.compile(r"^h(?P<level>\d)\. (?P<title>.*)$")
+    RE_TITLE_MARKER = re.compile(rb"^[^\S\n]*[hH]\d\. ", re.MULTILINE)
 
     def parse_version_from_title(self, line: str) -> VersionTag | None:
         if not self.RE_TITLE.match(line):
@@ -0,0 +1,279 @@
+"""Apply the bump and changelog rules of a commit convention in a single pass."""
+
+from __future__ import annotations
+
+import re
+from logging import DEBUG, getLogger
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
+
+from commitizen.cache import MISSING, CommitCache
+from commitizen.defaults import MAJOR, MINOR, PATCH
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    from commitizen.cz.base import BaseCommitizen
+    from commitizen.git import GitCommit
+    from commitizen.version_schemes import Increment
+
+logger = getLogger("commitizen")
+
+VERSION_TYPES = [None, PATCH, MINOR, MAJOR]
+
+_RANKS = {increment: rank for rank, increment in enumerate(VERSION_TYPES)}
+
+
+class CommitRecord(NamedTuple):
+    """What a commit brings to a release according to the commit rules"""
+
+    increment: Increment | None
+    """The version increment it requires"""
+    change_type: str | None
+    """The change type of its subject, `None` if it has none"""
+    entries: list[dict[str, Any]]
+    """The groups parsed from its subject and body paragraphs, one per changelog entry"""
+
+
+# Keys referring to their own groups or setting inline flags can't be joined safely
+_UNJOINABLE_KEY = re.compile(r"\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)")
+
+
+class _IncrementResolver:
+    """The increment mapped to a keyword by the first `bump_map` key matching it.
+
+    The keys are compiled once into a single alternation, in the map order, each
+    alternative ending with an empty group naming its key. Keywords repeat a lot
+    (`feat`, `fix`...) so their increment is memoized.
+    """
+
+    def __init__(self, bump_map: Mapping[str, str]) -> None:
+        self._increments = cast("list[Increment]", list(bump_map.values()))
+        self._keys: re.Pattern[str] | None = None
+        self._patterns: list[re.Pattern[str]] = []
+        if bump_map and not any(_UNJOINABLE_KEY.search(key) for key in bump_map):
+            try:
+                self._keys = re.compile(
+                    "|".join(f"(?:{key})(?P<_{i}>)" for i, key in enumerate(bump_map))
+                )
+            except re.error:
+                # Such as keys defining the same group name
+                pass
+        if self._keys is None:
+            self._patterns = [re.compile(key) for key in bump_map]
+        self._memo: dict[str, Increment | None] = {}
+
+    def __call__(self, keyword: str) -> Increment | None:
+        try:
+            return self._memo[keyword]
+        except KeyError:
+            pass
+        increment = None
+        if self._keys is not None:
+            if (match := self._keys.match(keyword)) and match.lastgroup:
+                increment = self._increments[int(match.lastgroup[1:])]
+        else:
+            for i, pattern in enumerate(self._patterns):
+                if pattern.match(keyword):
+                    increment = self._increments[i]
+                    break
+        self._memo[keyword] = increment
+        return increment
+
+
+class CommitClassifier:
+    """The bump and changelog rules of a commit convention, compiled once.
+
+    Each commit is walked once to produce a `CommitRecord` holding both the increment
+    it requires and its changelog entries, so that bump and changelog consume the same
+    records. Rules which are not given are simply not applied, and the increments and
+    the changelog entries are cached apart: a classifier applying only one kind of
+    rules shares its cache entries with those applying both.
+
+    With `memoize`, the records of the commit objects already classified are kept, so
+    that classifying the same commits again (bump then changelog) is free.
+
+    Example:
+
+    ```python
+    classifier = CommitClassifier.from_cz(cz)
+    for commit, record in classifier.iter_records(commits):
+        print(commit.rev, record.increment, record.change_type)
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        bump_pattern: str | None = None,
+        bump_map: Mapping[str, str] | None = None,
+        commit_parser: str | None = None,
+        changelog_pattern: str | None = None,
+        memoize: bool = False,
+    ) -> None:
+        bump_map = dict(bump_map or {})
+        self._select = re.compile(bump_pattern) if bump_pattern and bump_map else None
+        self._increment_for = _IncrementResolver(bump_map)
+        self._bump_key = (
+            CommitCache.rules_key("bump", bump_pattern, list(bump_map.items()))
+            if self._select is not None
+            else None
+        )
+        self._changelog = (
+            re.compile(changelog_pattern)
+            if changelog_pattern and commit_parser
+            else None
+        )
+        self._changelog_key = (
+            CommitCache.rules_key("changelog", commit_parser, changelog_pattern)
+            if self._changelog is not None
+            else None
+        )
+        self._subject = re.compile(commit_parser or "", re.MULTILINE)
+        self._paragraph = re.compile(commit_parser or "", re.MULTILINE | re.DOTALL)
+        self._records: dict[int, tuple[GitCommit, CommitRecord]] | None = (
+            {} if memoize else None
+        )
+
+    @classmethod
+    def from_cz(
+        cls,
+        cz: BaseCommitizen,
+        *,
+        bump: bool = True,
+        changelog: bool = True,
+        major_version_zero: bool = False,
+        memoize: bool = False,
+    ) -> CommitClassifier:
+        """The rules of `cz`, only those for the `bump` and/or the `changelog`"""
+        return cls(
+            bump_pattern=cz.bump_pattern if bump else None,
+            bump_map=cz.bump_map_major_version_zero
+            if major_version_zero
+            else cz.bump_map,
+            commit_parser=cz.commit_parser if changelog else None,
+            changelog_pattern=cz.changelog_pattern,
+            memoize=memoize,
+        )
+
+    @property
+    def finds_increments(self) -> bool:
+        """Whether it has the bump rules to find the increment of commits"""
+        return self._select is not None
+
+    def classify(self, commit: GitCommit) -> CommitRecord:
+        message = commit.message
+        change_type = None
+        entries = []
+        if self._changelog is not None and self._changelog.match(message):
+            if subject := self._subject.match(message):
+                entries.append(subject.groupdict())
+                change_type = entries[0].get("change_type")
+            for paragraph in commit.body.split("\n\n"):
+                if parsed := self._paragraph.match(paragraph):
+                    entries.append(parsed.groupdict())
+        return CommitRecord(self._find_increment(message), change_type, entries)
+
+    def iter_records(
+        self, commits: Iterable[GitCommit], cache: CommitCache | None = None
+    ) -> Iterator[tuple[GitCommit, CommitRecord]]:
+        """Classify the commits, lazily.
+
+        With a `cache`, the record of each commit is persisted and only the commits
+        it does not know yet are classified. Flushing it is up to the caller.
+        """
+        for commit in commits:
+            if (record := self.recall(commit, cache)) is None:
+                record = self.classify(commit)
+                self.remember(commit, record, cache)
+            yield commit, record
+
+    def recall(
+        self, commit: GitCommit, cache: CommitCache | None = None
+    ) -> CommitRecord | None:
+        """The record of a commit already classified, `None` if it is unknown"""
+        records = self._records
+        if records is not None and (known := records.get(id(commit))):
+            if known[0] is commit:
+                return known[1]
+        if cache is None:
+            return None
+        increment = change_type = None
+        entries: list[dict[str, Any]] = []
+        if self._bump_key is not None:
+            if (increment := cache.get(self._bump_key, commit.rev)) is MISSING:
+                return None
+        if self._changelog_key is not None:
+            if (cached := cache.get(self._changelog_key, commit.rev)) is MISSING:
+                return None
+            change_type, entries = cached
+        record = CommitRecord(increment, change_type, entries)
+        if records is not None:
+            records[id(commit)] = (commit, record)
+        return record
+
+    def remember(
+        self, commit: GitCommit, record: CommitRecord, cache: CommitCache | None = None
+    ) -> None:
+        """Keep the record of a commit classified, by another process for instance"""
+        if cache is not None:
+            if self._bump_key is not None:
+                cache.set(self._bump_key, commit.rev, record.increment)
+            if self._changelog_key is not None:
+                cache.set(
+                    self._changelog_key,
+                    commit.rev,
+                    [record.change_type, record.entries],
+                )
+        if self._records is not None:
+            self._records[id(commit)] = (commit, record)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The memoized records are bound to the commit objects of this process
+        state = self.__dict__.copy()
+        if state["_records"] is not None:
+            state["_records"] = {}
+        return state
+
+    def find_increment(
+        self, commits: Iterable[GitCommit], cache: CommitCache | None = None
+    ) -> Increment | None:
+        """The highest increment required by the commits.
+
+        The commits are not consumed any further once one requires a major increment.
+        """
+        increment: Increment | None = None
+        for _, record in self.iter_records(commits, cache):
+            if _RANKS[increment] < _RANKS[record.increment]:
+                increment = record.increment
+                if increment == MAJOR:
+                    break
+        if cache:
+            cache.flush()
+        return increment
+
+    def _find_increment(self, message: str) -> Increment | None:
+        if self._select is None:
+            return None
+        increment: Increment | None = None
+        debug = logger.isEnabledFor(DEBUG)
+        for line in message.split("\n"):
+            if not (result := self._select.search(line)):
+                continue
+            keyword = result.group(1)
+            new_increment = self._increment_for(keyword)
+            if debug and new_increment is None:
+                logger.debug("no increment needed for '%s' in '%s'", keyword, line)
+
+            if _RANKS[increment] < _RANKS[new_increment]:
+                if debug:
+                    logger.debug(
+                        "increment detected is '%s' due to '%s' in '%s'",
+                        new_increment,
+                        keyword,
+                        line,
+                    )
+                increment = new_increment
+
+            if increment == MAJOR:
+                break
+        return increment
@@ -12,7 +12,7 @@ from typing import TYPE_CHECKING, cast
 import argcomplete
 from decli import cli
 
-from commitizen import commands, config, out, version_schemes
+from commitizen import commands, config, git, out, version_schemes
 from commitizen.exceptions import (
     CommitizenException,
     ExitCode,
@@ -443,6 +443,24 @@ data = {
                         "default": None,
                         "help": "Export the changelog template into this file instead of rendering it",
                     },
+                    {
+                        "name": "--jobs",
+                        "type": int,
+                        "default": 1,
+                        "help": (
+                            "number of processes parsing the commits (default: 1). "
+                            "Speeds up the generation of changelogs with many commits"
+                        ),
+                    },
+                    {
+                        "name": "--from-file",
+                        "metavar": "VERSION",
+                        "default": None,
+                        "help": (
+                            "print the notes of this version from the changelog file, "
+                            "instead of generating them from the commits"
+                        ),
+                    },
                     *deepcopy(tpl_arguments),
                     {
                         "name": "--tag-format",
@@ -666,21 +684,26 @@ def main() -> None:
         extra_args = " ".join(unknown_args[1:])
         arguments["extra_cli_args"] = extra_args
 
-    conf = config.read_cfg(args.config)
-    args = cast("Args", args)
-    if args.name:
-        conf.update({"name": args.name})
-    elif not conf.path:
-        conf.update({"name": "cz_conventional_commits"})
-
-    sys.excepthook = commitizen_excepthook
-    if args.debug:
-        logging.getLogger("commitizen").setLevel(logging.DEBUG)
-        sys.excepthook = partial(sys.excepthook, debug=True)
-    if args.no_raise:
-        sys.excepthook = partial(sys.excepthook, no_raise=parse_no_raise(args.no_raise))
-
-    args.func(conf, arguments)()  # type: ignore[arg-type]
+    # Repository facts are queried once for the whole invocation, all at once
+    with git.RepoContext() as context:
+        context.prefetch()
+        conf = config.read_cfg(args.config)
+        args = cast("Args", args)
+        if args.name:
+            conf.update({"name": args.name})
+        elif not conf.path:
+            conf.update({"name": "cz_conventional_commits"})
+
+        sys.excepthook = commitizen_excepthook
+        if args.debug:
+            logging.getLogger("commitizen").setLevel(logging.DEBUG)
+            sys.excepthook = partial(sys.excepthook, debug=True)
+        if args.no_raise:
+            sys.excepthook = partial(
+                sys.excepthook, no_raise=parse_no_raise(args.no_raise)
+            )
+
+        args.func(conf, arguments)()  # type: ignore[arg-type]
 
 
 if __name__ == "__main__":
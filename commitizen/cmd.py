@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import subprocess
-from typing import TYPE_CHECKING, NamedTuple
+import tempfile
+from typing import TYPE_CHECKING, NamedTuple, cast
 
 from charset_normalizer import from_bytes
 
 from commitizen.exceptions import CharacterSetDecodeError
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Generator, Mapping, Sequence
+    from io import BufferedReader, BufferedWriter
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class Command(NamedTuple):
@@ -20,19 +25,49 @@ class Command(NamedTuple):
     return_code: int
 
 
+class Decoder:
+    """Decode command outputs, unit by unit, falling back to charset detection.
+
+    Decoding one unit at a time (an output line, a `git log` record...) keeps the
+    (slow) charset detection to the few units which are not valid UTF-8 instead of
+    sending a whole output through it. Each unit is detected on its own, as legacy
+    commits may come in different encodings; the units seen already (the same
+    trailer repeated on many lines...) are only detected once.
+    """
+
+    def __init__(self) -> None:
+        self._detected: dict[bytes, str] = {}
+
+    def __call__(self, bytes_: bytes) -> str:
+        try:
+            return bytes_.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+
+        if (decoded := self._detected.get(bytes_)) is not None:
+            return decoded
+        charset_match = from_bytes(bytes_).best()
+        if charset_match is None:
+            raise CharacterSetDecodeError()
+        try:
+            decoded = bytes_.decode(charset_match.encoding)
+        except UnicodeDecodeError as e:
+            raise CharacterSetDecodeError() from e
+        self._detected[bytes_] = decoded
+        return decoded
+
+
 def _try_decode(bytes_: bytes) -> str:
     try:
         return bytes_.decode("utf-8")
     except UnicodeDecodeError:
         pass
 
-    charset_match = from_bytes(bytes_).best()
-    if charset_match is None:
-        raise CharacterSetDecodeError()
-    try:
-        return bytes_.decode(charset_match.encoding)
-    except UnicodeDecodeError as e:
-        raise CharacterSetDecodeError() from e
+    decoder = Decoder()
+    lines = bytes_.splitlines(keepends=True)
+    if len(lines) < 2:
+        return decoder(bytes_)
+    return "".join(decoder(line) for line in lines)
 
 
 def run(cmd: str, env: Mapping[str, str] | None = None) -> Command:
@@ -55,3 +90,140 @@ def run(cmd: str, env: Mapping[str, str] | None = None) -> Command:
         stderr,
         return_code,
     )
+
+
+async def _run_async(cmd: str, env: Mapping[str, str] | None) -> Command:
+    process = await asyncio.create_subprocess_shell(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.PIPE,
+        env=env,
+    )
+    stdout, stderr = await process.communicate()
+    return_code = await process.wait()
+    return Command(
+        _try_decode(stdout),
+        _try_decode(stderr),
+        stdout,
+        stderr,
+        return_code,
+    )
+
+
+async def _gather(cmds: Sequence[str], env: Mapping[str, str] | None) -> list[Command]:
+    return list(await asyncio.gather(*(_run_async(cmd, env) for cmd in cmds)))
+
+
+def run_concurrently(
+    cmds: Sequence[str], env: Mapping[str, str] | None = None
+) -> list[Command]:
+    """Run independent commands all at once and return their results in order.
+
+    The wall-clock time is the one of the slowest command instead of their sum.
+    Within an already running event loop (e.g. commitizen used as a library from
+    async code), the commands are run one by one with `run`.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        return [run(cmd, env) for cmd in cmds]
+
+    if env is not None:
+        env = {**os.environ, **env}
+    return asyncio.run(_gather(cmds, env))
+
+
+def stream(
+    cmd: str,
+    env: Mapping[str, str] | None = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Generator[bytes, None, None]:
+    """Run `cmd` and yield its stdout chunk by chunk as soon as it is available.
+
+    Unlike `run`, the output is never held in memory as a whole.
+    stderr is spooled to a temporary file so a chatty command cannot block
+    on a full pipe while stdout is being consumed.
+
+    Raises `subprocess.CalledProcessError` (with `stderr` set) when the command
+    exits with a non-zero status.
+    """
+    if env is not None:
+        env = {**os.environ, **env}
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            cmd,
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            stdin=subprocess.DEVNULL,
+            env=env,
+        )
+        stdout = cast("BufferedReader", process.stdout)
+        try:
+            while chunk := stdout.read1(chunk_size):
+                yield chunk
+        finally:
+            # The consumer may stop early: don't leave the process behind
+            if process.poll() is None:
+                process.kill()
+            stdout.close()
+            return_code = process.wait()
+
+        if return_code != 0:
+            stderr_file.seek(0)
+            raise subprocess.CalledProcessError(
+                return_code, cmd, stderr=stderr_file.read()
+            )
+
+
+class Coprocess:
+    """A long-lived command answering requests written to its stdin.
+
+    Many small requests are sent through the same pipes instead of forking one
+    process per request. Failures surface as `OSError`.
+    """
+
+    def __init__(self, args: Sequence[str]) -> None:
+        self.process = subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._stdin = cast("BufferedWriter", self.process.stdin)
+        self._stdout = cast("BufferedReader", self.process.stdout)
+
+    @property
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def write(self, data: bytes) -> None:
+        self._stdin.write(data)
+        self._stdin.flush()
+
+    def readline(self) -> bytes:
+        line = self._stdout.readline()
+        if not line.endswith(b"\n"):
+            raise OSError(f"{self.process.args!r} exited unexpectedly")
+        return line
+
+    def read(self, size: int) -> bytes:
+        data = self._stdout.read(size)
+        if len(data) != size:
+            raise OSError(f"{self.process.args!r} exited unexpectedly")
+        return data
+
+    def close(self) -> None:
+        for pipe in (self._stdin, self._stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
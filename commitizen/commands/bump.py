@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import warnings
+from functools import partial
+from itertools import chain
 from logging import getLogger
 from typing import TYPE_CHECKING, cast
 
 import questionary
 
 from commitizen import bump, factory, git, hooks, out
+from commitizen.cache import NotesCache, get_commit_cache
 from commitizen.changelog_formats import get_changelog_format
+from commitizen.classifier import CommitClassifier
 from commitizen.commands.changelog import Changelog
 from commitizen.defaults import Settings
 from commitizen.exceptions import (
@@ -23,7 +27,7 @@ from commitizen.exceptions import (
     NotAllowed,
 )
 from commitizen.providers import get_provider
-from commitizen.tags import TagRules
+from commitizen.tags import TagIndex, TagRules
 from commitizen.version_schemes import (
     Increment,
     InvalidVersion,
@@ -33,6 +37,8 @@ from commitizen.version_schemes import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
     from commitizen.config import BaseConfig
 
 logger = getLogger("commitizen")
@@ -101,6 +107,8 @@ class Bump:
         self.no_verify = arguments["no_verify"]
         self.check_consistency = arguments["check_consistency"]
         self.retry = arguments["retry"]
+        # Commits fetched by the revision they start from, shared with the changelog
+        self.commits: dict[str | None, list[git.GitCommit]] = {}
         self.pre_bump_hooks = self.config.settings["pre_bump_hooks"]
         self.post_bump_hooks = self.config.settings["post_bump_hooks"]
         deprecated_version_type = arguments.get("version_type")
@@ -143,21 +151,14 @@ class Bump:
         )
         return bool(questionary.confirm("Is this the first tag created?").ask())
 
-    def _find_increment(self, commits: list[git.GitCommit]) -> Increment | None:
-        # Update the bump map to ensure major version doesn't increment.
-        # self.cz.bump_map = defaults.bump_map_major_version_zero
-        bump_map = (
-            self.cz.bump_map_major_version_zero
-            if self.bump_settings["major_version_zero"]
-            else self.cz.bump_map
-        )
-        bump_pattern = self.cz.bump_pattern
-
-        if not bump_map or not bump_pattern:
+    def _find_increment(self, commits: Iterable[git.GitCommit]) -> Increment | None:
+        if not self.classifier.finds_increments:
             raise NoPatternMapError(
                 f"'{self.config.settings['name']}' rule does not support bump"
             )
-        return bump.find_increment(commits, regex=bump_pattern, increments_map=bump_map)
+        return self.classifier.find_increment(
+            commits, cache=get_commit_cache(self.config.settings)
+        )
 
     def _validate_arguments(self, current_version: VersionProtocol) -> None:
         errors: list[str] = []
@@ -197,18 +198,28 @@ class Bump:
                 ) from exc
 
         if increment is None:
-            commits = git.get_commits(current_tag.name if current_tag else None)
+            start = current_tag.name if current_tag else None
+            commits: Iterator[git.GitCommit]
+            if self.changelog_flag:
+                # Fetched once, in the order the changelog expects them
+                self.commits[start] = git.get_commits(start, args="--topo-order")
+                commits = iter(self.commits[start])
+            else:
+                commits = git.iter_commits(start)
+            first_commit = next(commits, None)
 
             # No commits, there is no need to create an empty tag.
             # Unless we previously had a prerelease.
             if (
-                not commits
+                first_commit is None
                 and not current_version.is_prerelease
                 and not self.arguments["allow_no_commit"]
             ):
                 raise NoCommitsFoundError("[NO_COMMITS_FOUND]\nNo new commits found.")
 
-            increment = self._find_increment(commits)
+            increment = self._find_increment(
+                chain([first_commit], commits) if first_commit else []
+            )
 
         # It may happen that there are commits, but they are not eligible
         # for an increment, this generates a problem when using prerelease (#281)
@@ -262,8 +273,24 @@ class Bump:
             )
         )
 
+        # Commits are classified once, for both the increment and the changelog
+        self.classifier = CommitClassifier.from_cz(
+            self.cz,
+            changelog=self.changelog_flag,
+            major_version_zero=self.bump_settings["major_version_zero"],
+            memoize=self.changelog_flag,
+        )
+
         rules = TagRules.from_settings(cast("Settings", self.bump_settings))
-        current_tag = rules.find_tag_for(git.get_tags(), current_version)
+        if self.changelog_flag and not next_version_to_stdout:
+            # Shared with the changelog, which reports the invalid tags
+            found_tags = git.get_tags(select=partial(rules.is_version_tag, warn=True))
+        else:
+            found_tags = git.get_tags(
+                select=rules.is_version_tag, patterns=rules.tag_patterns
+            )
+        tags = TagIndex(found_tags, rules)
+        current_tag = rules.find_tag_for(tags, current_version)
         current_tag_version = (
             current_tag.name if current_tag else rules.normalize_tag(current_version)
         )
@@ -319,6 +346,9 @@ class Bump:
                 changelog_cmd = Changelog(
                     self.config,
                     {**changelog_args, "dry_run": True},  # type: ignore[typeddict-item]
+                    tags=tags,
+                    commits=self.commits,
+                    classifier=self.classifier,
                 )
                 try:
                     changelog_cmd()
@@ -328,6 +358,9 @@ class Bump:
             changelog_cmd = Changelog(
                 self.config,
                 {**changelog_args, "file_name": self.file_name},  # type: ignore[typeddict-item]
+                tags=tags,
+                commits=self.commits,
+                classifier=self.classifier,
             )
             changelog_cmd()
             updated_files.append(changelog_cmd.file_name)
@@ -406,6 +439,16 @@ class Bump:
         if c.return_code != 0:
             raise BumpTagFailedError(c.err)
 
+        # The repository changed: drop the facts memoized so far
+        if context := git.RepoContext.current():
+            context.invalidate()
+
+        # Share what was parsed from the released commits with the other clones
+        if self.config.settings["notes_cache"] and (
+            cache := NotesCache.for_repository()
+        ):
+            cache.publish(f"Commitizen notes for {new_tag_version}")
+
         if self.post_bump_hooks:
             hooks.run(
                 self.post_bump_hooks,
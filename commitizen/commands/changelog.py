@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+import io
 import os
 import os.path
+from contextlib import ExitStack
 from difflib import SequenceMatcher
+from functools import partial
+from itertools import chain
 from operator import itemgetter
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, TypedDict, cast
 
 from commitizen import changelog, defaults, factory, git, out
+from commitizen.cache import CommitCache, FileIndexCache, get_commit_cache
 from commitizen.changelog_formats import get_changelog_format
+from commitizen.classifier import CommitClassifier
 from commitizen.cz.utils import strip_local_version
 from commitizen.exceptions import (
     DryRunExit,
@@ -18,15 +24,19 @@ from commitizen.exceptions import (
     NotAGitProjectError,
     NotAllowed,
 )
-from commitizen.git import GitTag, smart_open
-from commitizen.tags import TagRules
+from commitizen.git import GitCommit, GitTag, smart_replace
+from commitizen.tags import TagIndex, TagRules
 from commitizen.version_schemes import get_version_scheme
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterable
+    from collections.abc import Generator, Iterable, Iterator, Mapping, Sequence
 
     from commitizen.config import BaseConfig
 
+# Sections rendered for the most recently rendered releases, by template
+RELEASE_CACHE_NAME = "releases"
+RELEASE_CACHE_MAX_ENTRIES = 10_000
+
 
 class ChangelogArgs(TypedDict, total=False):
     change_type_map: dict[str, str]
@@ -44,12 +54,28 @@ class ChangelogArgs(TypedDict, total=False):
     template: str
     extras: dict[str, Any]
     export_template: str
+    jobs: int
+    from_file: str
 
 
 class Changelog:
     """Generate a changelog based on the commit history."""
 
-    def __init__(self, config: BaseConfig, arguments: ChangelogArgs) -> None:
+    def __init__(
+        self,
+        config: BaseConfig,
+        arguments: ChangelogArgs,
+        *,
+        tags: Sequence[GitTag] | None = None,
+        commits: dict[str | None, list[GitCommit]] | None = None,
+        classifier: CommitClassifier | None = None,
+    ) -> None:
+        """`tags`, `commits` and `classifier` let a caller which has them share them.
+
+        `commits` holds the commits already fetched (in topological order, up to `HEAD`)
+        by the revision they start from. The commits fetched are added to it.
+        Without it, the commits are streamed from `git log` into the changelog.
+        """
         if not git.is_git_project():
             raise NotAGitProjectError()
 
@@ -123,6 +149,11 @@ class Changelog:
         )
         self.extras = arguments.get("extras") or {}
         self.export_template_to = arguments.get("export_template")
+        self.jobs = arguments.get("jobs") or 1
+        self.from_file = arguments.get("from_file")
+        self.tags = tags
+        self.commits = commits
+        self.classifier = classifier or CommitClassifier.from_cz(self.cz, bump=False)
 
     def _find_incremental_rev(self, latest_version: str, tags: Iterable[GitTag]) -> str:
         """Try to find the 'start_rev'.
@@ -157,23 +188,50 @@ class Changelog:
         return start_rev
 
     def _write_changelog(
-        self, changelog_out: str, lines: list[str], changelog_meta: changelog.Metadata
+        self, changelog_out: Iterable[str], changelog_meta: changelog.Metadata
     ) -> None:
-        with smart_open(
-            self.file_name, "w", encoding=self.config.settings["encoding"]
-        ) as changelog_file:
-            partial_changelog: str | None = None
-            if self.incremental:
-                new_lines = changelog.incremental_build(
-                    changelog_out, lines, changelog_meta
-                )
-                changelog_out = "".join(new_lines)
-                partial_changelog = changelog_out
-
-            if self.cz.changelog_hook:
-                changelog_out = self.cz.changelog_hook(changelog_out, partial_changelog)
+        """Write the changelog as it is rendered, unless a `changelog_hook` needs it all.
 
-            changelog_file.write(changelog_out)
+        Incrementally, only the head of the existing changelog is rebuilt, the rest of
+        it is copied as is.
+        """
+        encoding = self.config.settings["encoding"]
+        with ExitStack() as stack:
+            changelog_file = stack.enter_context(
+                smart_replace(self.file_name, encoding=encoding)
+            )
+            # Closed before being replaced
+            existing = (
+                stack.enter_context(open(self.file_name, "rb"))
+                if self.incremental and os.path.isfile(self.file_name)
+                else None
+            )
+            if self.incremental and (existing is None or self.cz.changelog_hook):
+                changelog_out = changelog.iter_incremental_build(
+                    changelog_out,
+                    io.TextIOWrapper(existing, encoding=encoding) if existing else [],
+                    changelog_meta,
+                )
+            elif existing is not None:
+                changelog.write_incremental(
+                    changelog_out,
+                    existing,
+                    changelog_file,
+                    changelog_meta,
+                    encoding,
+                    git.EOLType.for_open(),
+                )
+                return
+
+            if not self.cz.changelog_hook:
+                changelog_file.writelines(changelog_out)
+                return
+            full_changelog = "".join(changelog_out)
+            changelog_file.write(
+                self.cz.changelog_hook(
+                    full_changelog, full_changelog if self.incremental else None
+                )
+            )
 
     def _export_template(self, dist: str) -> None:
         filename = changelog.get_changelog_template(
@@ -185,6 +243,52 @@ class Changelog:
         text = Path(filename).read_text()
         Path(dist).write_text(text)
 
+    def _get_release_ranges(self) -> Mapping[str, Sequence[int]]:
+        """The byte range of each release of the changelog file, cached between calls"""
+        build = partial(self.changelog_format.get_release_ranges, self.file_name)
+        if (cache := FileIndexCache.for_repository()) is None:
+            return build()
+
+        format_class = type(self.changelog_format)
+        settings = self.config.settings
+        rules_key = FileIndexCache.rules_key(
+            "releases",
+            f"{format_class.__module__}.{format_class.__qualname__}",
+            [
+                settings.get(name)
+                for name in (
+                    "encoding",
+                    "tag_format",
+                    "legacy_tag_formats",
+                    "ignored_tag_formats",
+                    "version_scheme",
+                    "version_type",
+                )
+            ],
+        )
+        return cast(
+            "Mapping[str, Sequence[int]]", cache.get(rules_key, self.file_name, build)
+        )
+
+    def _print_release_from_file(self, version: str) -> None:
+        encoding = self.config.settings["encoding"]
+        if not changelog._is_ascii_compatible(encoding):
+            raise NotAllowed(
+                f"--from-file doesn't support the '{encoding}' encoding of the changelog"
+            )
+
+        ranges = self._get_release_ranges()
+        parsed = self.tag_rules.search_version(version.lower())
+        release = ranges.get(version) or (parsed and ranges.get(parsed.version))
+        if not release:
+            raise NoRevisionError(f"No release {version} found in {self.file_name}")
+
+        start, end = release
+        with open(self.file_name, "rb") as changelog_file:
+            changelog_file.seek(start)
+            section = changelog_file.read(end - start).decode(encoding)
+        out.write(section.replace("\r\n", "\n").rstrip())
+
     def __call__(self) -> None:
         commit_parser = self.cz.commit_parser
         changelog_pattern = self.cz.changelog_pattern
@@ -193,6 +297,11 @@ class Changelog:
         if self.export_template_to:
             return self._export_template(self.export_template_to)
 
+        if self.from_file:
+            if self.rev_range:
+                raise NotAllowed("--from-file cannot be combined with a rev_range")
+            return self._print_release_from_file(self.from_file)
+
         if not changelog_pattern or not commit_parser:
             raise NoPatternMapError(
                 f"'{self.config.settings['name']}' rule does not support changelog"
@@ -205,7 +314,12 @@ class Changelog:
         if not self.file_name:
             raise NotAllowed("filename is required.")
 
-        tags = self.tag_rules.get_version_tags(git.get_tags(), warn=True)
+        tags = TagIndex.of(
+            self.tags
+            if self.tags is not None
+            else git.get_tags(select=partial(self.tag_rules.is_version_tag, warn=True)),
+            self.tag_rules,
+        )
         changelog_meta = changelog.Metadata()
         if self.incremental:
             changelog_meta = self.changelog_format.get_metadata(self.file_name)
@@ -222,10 +336,20 @@ class Changelog:
                 self.tag_rules,
             )
 
-        commits = git.get_commits(start=start_rev, end=end_rev, args="--topo-order")
-        if not commits and (
-            self.current_version is None or not self.current_version.is_prerelease
-        ):
+        commits: Iterator[GitCommit]
+        if end_rev:
+            commits = git.iter_commits(start_rev, end_rev, args="--topo-order")
+        elif self.commits is None:
+            commits = git.iter_commits(start_rev, args="--topo-order")
+        else:
+            if start_rev not in self.commits:
+                self.commits[start_rev] = git.get_commits(
+                    start=start_rev, args="--topo-order"
+                )
+            commits = iter(self.commits[start_rev])
+        if (first_commit := next(commits, None)) is not None:
+            commits = chain([first_commit], commits)
+        elif self.current_version is None or not self.current_version.is_prerelease:
             raise NoCommitsFoundError("No commits found")
 
         tree = changelog.generate_tree_from_commits(
@@ -238,35 +362,33 @@ class Changelog:
             changelog_message_builder_hook=self.cz.changelog_message_builder_hook,
             changelog_release_hook=self.cz.changelog_release_hook,
             rules=self.tag_rules,
+            cache=get_commit_cache(self.config.settings),
+            classifier=self.classifier,
+            jobs=self.jobs,
         )
         if self.change_type_order:
             tree = changelog.generate_ordered_changelog_tree(
                 tree, self.change_type_order
             )
 
-        changelog_out = changelog.render_changelog(
+        changelog_out = changelog.stream_changelog(
             tree,
             self.cz.template_loader,
             self.template,
+            CommitCache.for_repository(RELEASE_CACHE_NAME, RELEASE_CACHE_MAX_ENTRIES),
             **{
                 **self.cz.template_extras,
                 **self.config.settings["extras"],
                 **self.extras,
             },
-        ).lstrip("\n")
+        )
 
         # Dry_run is executed here to avoid checking and reading the files
         if self.dry_run:
             if self.cz.changelog_hook:
-                changelog_out = self.cz.changelog_hook(changelog_out, "")
-            out.write(changelog_out)
+                out.write(self.cz.changelog_hook("".join(changelog_out), ""))
+            else:
+                out.stream(changelog_out)
             raise DryRunExit()
 
-        lines = []
-        if self.incremental and os.path.isfile(self.file_name):
-            with open(
-                self.file_name, encoding=self.config.settings["encoding"]
-            ) as changelog_file:
-                lines = changelog_file.readlines()
-
-        self._write_changelog(changelog_out, lines, changelog_meta)
+        self._write_changelog(changelog_out, changelog_meta)
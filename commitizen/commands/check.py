@@ -2,9 +2,14 @@ from __future__ import annotations
 
 import re
 import sys
+from functools import lru_cache
+from importlib import metadata
+from itertools import chain
 from typing import TYPE_CHECKING, TypedDict
 
 from commitizen import factory, git, out
+from commitizen.__version__ import __version__
+from commitizen.cache import CommitCache
 from commitizen.exceptions import (
     InvalidCommandArgumentError,
     InvalidCommitMessageError,
@@ -12,7 +17,27 @@ from commitizen.exceptions import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from commitizen.config import BaseConfig
+    from commitizen.cz.base import ValidationResult
+
+# Verdicts kept for the most recently checked commits
+VERDICT_CACHE_NAME = "verdicts"
+VERDICT_CACHE_MAX_ENTRIES = 100_000
+
+
+@lru_cache
+def _distributions_version(module: str) -> list[str]:
+    """The distributions providing the top-level package of `module`, with versions"""
+    top_level = module.partition(".")[0]
+    versions = []
+    for name in metadata.packages_distributions().get(top_level, []):
+        try:
+            versions.append(f"{name}=={metadata.version(name)}")
+        except metadata.PackageNotFoundError:
+            continue
+    return sorted(versions)
 
 
 class CheckArgs(TypedDict, total=False):
@@ -85,25 +110,48 @@ class Check:
             InvalidCommitMessageError: if the commit provided does not follow the conventional pattern
             NoCommitsFoundError: if no commit is found with the given range
         """
-        commits = self._get_commits()
-        if not commits:
+        commits = iter(self._get_commits())
+        if (first_commit := next(commits, None)) is None:
             raise NoCommitsFoundError(f"No commit found with range: '{self.rev_range}'")
 
         pattern = re.compile(self.cz.schema_pattern())
-        invalid_commits = [
-            (commit, check.errors)
-            for commit in commits
-            if not (
-                check := self.cz.validate_commit_message(
-                    commit_msg=commit.message,
-                    pattern=pattern,
-                    allow_abort=self.allow_abort,
-                    allowed_prefixes=self.allowed_prefixes,
-                    max_msg_length=self.max_msg_length,
-                    commit_hash=commit.rev,
-                )
-            ).is_valid
-        ]
+        # Only commits from history have a SHA, hence an immutable message
+        cache = (
+            CommitCache.for_repository(VERDICT_CACHE_NAME, VERDICT_CACHE_MAX_ENTRIES)
+            if first_commit.rev
+            else None
+        )
+        rules_key = (
+            cache.rules_key(
+                "check-valid",
+                __version__,
+                f"{type(self.cz).__module__}.{type(self.cz).__qualname__}",
+                # Upgrading the plugin may change how it validates commits
+                _distributions_version(type(self.cz).__module__),
+                pattern.pattern,
+                self.allow_abort,
+                self.allowed_prefixes,
+                self.max_msg_length,
+            )
+            if cache
+            else ""
+        )
+
+        invalid_commits = []
+        try:
+            for commit in chain([first_commit], commits):
+                # Only valid commits are known from the cache: the errors of the
+                # others, which may be any object, are always those of a validation
+                if cache is not None and cache.get(rules_key, commit.rev) is True:
+                    continue
+                check = self._validate(commit, pattern)
+                if cache is not None:
+                    cache.set(rules_key, commit.rev, check.is_valid)
+                if not check.is_valid:
+                    invalid_commits.append((commit, check.errors))
+        finally:
+            if cache:
+                cache.flush()
 
         if invalid_commits:
             raise InvalidCommitMessageError(
@@ -111,6 +159,18 @@ class Check:
             )
         out.success("Commit validation: successful!")
 
+    def _validate(
+        self, commit: git.GitCommit, pattern: re.Pattern[str]
+    ) -> ValidationResult:
+        return self.cz.validate_commit_message(
+            commit_msg=commit.message,
+            pattern=pattern,
+            allow_abort=self.allow_abort,
+            allowed_prefixes=self.allowed_prefixes,
+            max_msg_length=self.max_msg_length,
+            commit_hash=commit.rev,
+        )
+
     def _get_commit_message(self) -> str | None:
         if self.commit_msg_file is None:
             # Get commit message from command line (--message)
@@ -122,12 +182,12 @@ class Check:
             # Get commit message from file (--commit-msg-file)
             return commit_file.read()
 
-    def _get_commits(self) -> list[git.GitCommit]:
+    def _get_commits(self) -> Iterable[git.GitCommit]:
         if (msg := self._get_commit_message()) is not None:
             return [git.GitCommit(rev="", title="", body=self._filter_comments(msg))]
 
-        # Get commit messages from git log (--rev-range)
-        return git.get_commits(
+        # Stream commit messages from git log (--rev-range)
+        return git.iter_commits(
             git.get_default_branch() if self.use_default_range else None,
             self.rev_range,
         )
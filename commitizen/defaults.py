@@ -50,6 +50,7 @@ class Settings(TypedDict, total=False):
     major_version_zero: bool
     message_length_limit: int | None
     name: str
+    notes_cache: bool
     post_bump_hooks: list[str] | None
     pre_bump_hooks: list[str] | None
     prerelease_offset: int
@@ -104,6 +105,7 @@ DEFAULT_SETTINGS: Settings = {
     "changelog_start_rev": None,
     "changelog_merge_prerelease": False,
     "update_changelog_on_bump": False,
+    "notes_cache": False,
     "use_shortcuts": False,
     "major_version_zero": False,
     "pre_bump_hooks": [],
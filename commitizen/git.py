@@ -1,14 +1,39 @@
 from __future__ import annotations
 
+import atexit
 import os
+import re
+import stat
+import subprocess
+import sys
+from contextlib import contextmanager, suppress
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from functools import lru_cache
+from fnmatch import fnmatchcase
+from functools import cached_property, lru_cache
 from pathlib import Path
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, mkstemp
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, TextIO
 
 from commitizen import cmd, out
 from commitizen.exceptions import GitCommandError
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable, Sequence
+
+
+# `git log` fields are separated by the ASCII record separator (`%x1e`)
+# and each record is NUL-terminated by `-z`
+_LOG_FIELD_SEPARATOR = "\x1e"
+_LOG_FORMAT = "%H%x1e%P%x1e%s%x1e%an%x1e%ae%x1e%b"
+
+# The probes answering the `RepoContext` facts
+_REV_PARSE_CMD = (
+    "git rev-parse --is-inside-work-tree --show-toplevel --absolute-git-dir"
+    " --git-common-dir"
+)
+_EOL_CONFIG_CMD = "git config core.eol"
+
 
 class EOLType(Enum):
     """The EOL type from `git config core.eol`."""
@@ -19,7 +44,16 @@ class EOLType(Enum):
 
     @classmethod
     def for_open(cls) -> str:
-        c = cmd.run("git config core.eol")
+        if context := RepoContext.current():
+            return context.eol
+        return cls._from_config()
+
+    @classmethod
+    def _from_config(cls) -> str:
+        return cls._from_config_output(cmd.run(_EOL_CONFIG_CMD))
+
+    @classmethod
+    def _from_config_output(cls, c: cmd.Command) -> str:
         eol = c.out.strip().upper()
         return cls._char_for_open()[cls._safe_cast(eol)]
 
@@ -41,7 +75,91 @@ class EOLType(Enum):
         }
 
 
+class RepoContext:
+    """Repository facts asked repeatedly during a single invocation.
+
+    The facts are queried lazily, at most once, then memoized:
+    `git rev-parse` answers whether we are in a work tree, its root and git directory,
+    `git config core.eol` the EOL used by `smart_open`.
+    `prefetch` queries them all upfront, concurrently.
+
+    While a context is active (`with RepoContext():`, as done by `cli.main`),
+    `is_git_project`, `find_git_project_root` and `EOLType.for_open` answer from it.
+    Commands mutating the repository should call `invalidate` afterwards.
+    """
+
+    _active: ClassVar[list[RepoContext]] = []
+
+    @classmethod
+    def current(cls) -> RepoContext | None:
+        """The innermost active context, if any"""
+        return cls._active[-1] if cls._active else None
+
+    def __enter__(self) -> RepoContext:
+        RepoContext._active.append(self)
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        RepoContext._active.remove(self)
+
+    def prefetch(self) -> None:
+        """Query all the facts not known yet at once, running their probes concurrently"""
+        probes = {
+            "_rev_parse": (_REV_PARSE_CMD, self._parse_rev_parse),
+            "eol": (_EOL_CONFIG_CMD, EOLType._from_config_output),
+        }
+        missing = [name for name in probes if name not in self.__dict__]
+        if not missing:
+            return
+        results = cmd.run_concurrently([probes[name][0] for name in missing])
+        for name, c in zip(missing, results):
+            self.__dict__[name] = probes[name][1](c)
+
+    @cached_property
+    def _rev_parse(self) -> tuple[Path, Path, Path] | None:
+        return self._parse_rev_parse(cmd.run(_REV_PARSE_CMD))
+
+    @staticmethod
+    def _parse_rev_parse(c: cmd.Command) -> tuple[Path, Path, Path] | None:
+        if c.return_code != 0 or c.err:
+            return None
+        is_inside_work_tree, toplevel, git_dir, common_dir = c.out.splitlines()
+        if is_inside_work_tree != "true":
+            return None
+        # The common dir may be relative to the working directory
+        return Path(toplevel), Path(git_dir), Path.cwd() / common_dir
+
+    @property
+    def is_git_project(self) -> bool:
+        return self._rev_parse is not None
+
+    @property
+    def project_root(self) -> Path | None:
+        return self._rev_parse[0] if self._rev_parse else None
+
+    @property
+    def git_dir(self) -> Path | None:
+        return self._rev_parse[1] if self._rev_parse else None
+
+    @property
+    def common_dir(self) -> Path | None:
+        """The directory shared by all worktrees, holding the refs"""
+        return self._rev_parse[2] if self._rev_parse else None
+
+    @cached_property
+    def eol(self) -> str:
+        """The EOL character for `open()`"""
+        return EOLType._from_config()
+
+    def invalidate(self) -> None:
+        """Forget every memoized fact, they will be queried again on next access"""
+        for name in ("_rev_parse", "eol"):
+            self.__dict__.pop(name, None)
+
+
 class GitObject:
+    __slots__ = ()
+
     rev: str
     name: str
     date: str
@@ -54,6 +172,24 @@ class GitObject:
 
 
 class GitCommit(GitObject):
+    """A commit as read from `git log`.
+
+    Histories may hold millions of commits, so instances are kept compact: they
+    have no `__dict__`, authors and emails are interned as they repeat across
+    commits, parents are kept as a single space-separated string and the body is
+    only stripped and joined into `message` the first time it is needed.
+    """
+
+    __slots__ = (
+        "_body",
+        "_message",
+        "_parents",
+        "_title",
+        "author",
+        "author_email",
+        "rev",
+    )
+
     def __init__(
         self,
         rev: str,
@@ -64,15 +200,46 @@ class GitCommit(GitObject):
         parents: list[str] | None = None,
     ) -> None:
         self.rev = rev.strip()
-        self.title = title.strip()
-        self.body = body.strip()
-        self.author = author.strip()
-        self.author_email = author_email.strip()
-        self.parents = parents or []
+        self._title = title.strip()
+        self._body = body
+        self.author = sys.intern(author.strip())
+        self.author_email = sys.intern(author_email.strip())
+        self._parents = " ".join(parents) if parents else ""
+        self._message: str | None = None
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, value: str) -> None:
+        self._title = value.strip()
+        self._message = None
+
+    @property
+    def body(self) -> str:
+        # Stripping an already stripped string returns it as is
+        self._body = body = self._body.strip()
+        return body
+
+    @body.setter
+    def body(self, value: str) -> None:
+        self._body = value
+        self._message = None
+
+    @property
+    def parents(self) -> list[str]:
+        return self._parents.split()
+
+    @parents.setter
+    def parents(self, value: list[str]) -> None:
+        self._parents = " ".join(value)
 
     @property
     def message(self) -> str:
-        return f"{self.title}\n\n{self.body}".strip()
+        if self._message is None:
+            self._message = f"{self._title}\n\n{self.body}".strip()
+        return self._message
 
     @classmethod
     def from_rev_and_commit(cls, rev_and_commit: str) -> GitCommit:
@@ -130,11 +297,56 @@ class GitCommit(GitObject):
             parents=[p for p in parents.strip().split(" ") if p],
         )
 
+    @classmethod
+    def from_record(
+        cls, record: bytes, decode: Callable[[bytes], str] = cmd._try_decode
+    ) -> GitCommit:
+        """Create a GitCommit instance from a raw `git log` record.
+
+        The record is produced by the `_LOG_FORMAT` format, i.e. the fields are
+        separated by the ASCII record separator (`0x1e`):
+        ```
+        <rev>\x1e<parents>\x1e<title>\x1e<author>\x1e<author_email>\x1e<body>
+        ```
+
+        The body comes last so that it may contain anything but a NUL byte, which git
+        does not allow in commit messages and uses as record terminator with `-z`.
+
+        The record is decoded with `decode`, a shared `cmd.Decoder` when reading a
+        whole history so that the legacy encodings are detected only once.
+
+        Example:
+            >>> commit = GitCommit.from_record(
+            ...     b"abc123\x1edef456 ghi789\x1efeat: add new feature\x1e"
+            ...     b"John Doe\x1ejohn@example.com\x1eThis is a detailed description\n"
+            ... )
+            >>> commit.rev
+            'abc123'
+            >>> commit.parents
+            ['def456', 'ghi789']
+        """
+        try:
+            fields = record.decode("utf-8").split(_LOG_FIELD_SEPARATOR, 5)
+        except UnicodeDecodeError:
+            # Charset detection chokes on the separators: hand it the record as lines,
+            # only the body may span several of them
+            text = decode(record.replace(_LOG_FIELD_SEPARATOR.encode(), b"\n"))
+            fields = text.split("\n", 5)
+        rev, parents, title, author, author_email, body = fields
+        commit = cls(
+            rev=rev, title=title, body=body, author=author, author_email=author_email
+        )
+        # Already space-separated by git
+        commit._parents = parents.strip()
+        return commit
+
     def __repr__(self) -> str:
         return f"{self.title} ({self.rev})"
 
 
 class GitTag(GitObject):
+    __slots__ = ("_date", "name", "rev")
+
     def __init__(self, name: str, rev: str, date: str) -> None:
         self.rev = rev.strip()
         self.name = name.strip()
@@ -160,6 +372,174 @@ class GitTag(GitObject):
         return cls(name=name, rev=obj, date=date)
 
 
+class _ObjectInfo(NamedTuple):
+    sha: str
+    type: str
+    size: int
+
+
+class _CatFile:
+    """A `git cat-file` coprocess kept alive for the whole session.
+
+    Object and ref lookups go through its pipes instead of forking `git` once per query.
+    It is (re)started lazily, including when the working directory changes.
+    Raises `OSError` when it can't be used so that callers can fall back to `cmd.run`.
+    """
+
+    # Small enough for a batch of requests and of responses to fit in the pipe buffers
+    BATCH_SIZE = 256
+
+    def __init__(self, mode: str) -> None:
+        self.mode = mode
+        self._coprocess: cmd.Coprocess | None = None
+        self._cwd: str | None = None
+
+    def _get(self) -> cmd.Coprocess:
+        cwd = os.getcwd()
+        if self._coprocess is None or self._cwd != cwd or not self._coprocess.is_alive:
+            self.close()
+            self._coprocess = cmd.Coprocess(["git", "cat-file", self.mode])
+            self._cwd = cwd
+        return self._coprocess
+
+    def close(self) -> None:
+        if self._coprocess is not None:
+            self._coprocess.close()
+            self._coprocess = None
+
+    @staticmethod
+    def _query(name: str) -> bytes:
+        # A name spanning several lines would desynchronize requests and responses,
+        # an empty one is always reported as missing
+        return b"\n" if "\n" in name else f"{name}\n".encode()
+
+    @staticmethod
+    def _parse_info(line: bytes) -> _ObjectInfo | None:
+        if line.endswith((b" missing\n", b" ambiguous\n")):
+            return None
+        sha, type_, size = line.decode().split()
+        return _ObjectInfo(sha, type_, int(size))
+
+    def info(self, names: Sequence[str]) -> list[_ObjectInfo | None]:
+        """Look up many objects at once, `None` standing for the missing ones"""
+        infos: list[_ObjectInfo | None] = []
+        try:
+            coprocess = self._get()
+            for start in range(0, len(names), self.BATCH_SIZE):
+                batch = names[start : start + self.BATCH_SIZE]
+                coprocess.write(b"".join(self._query(name) for name in batch))
+                infos.extend(self._parse_info(coprocess.readline()) for _ in batch)
+        except (OSError, ValueError) as e:
+            self.close()
+            raise OSError(f"git cat-file {self.mode} failed") from e
+        return infos
+
+    def contents(self, name: str) -> tuple[str, bytes] | None:
+        """The type and raw contents of an object, `None` if it is missing"""
+        return self.contents_many([name])[0]
+
+    def contents_many(self, names: Sequence[str]) -> list[tuple[str, bytes] | None]:
+        """The type and raw contents of many objects at once, `None` for the missing ones"""
+        found: list[tuple[str, bytes] | None] = []
+        try:
+            coprocess = self._get()
+            for start in range(0, len(names), self.BATCH_SIZE):
+                batch = names[start : start + self.BATCH_SIZE]
+                coprocess.write(b"".join(self._query(name) for name in batch))
+                for _ in batch:
+                    if (info := self._parse_info(coprocess.readline())) is None:
+                        found.append(None)
+                        continue
+                    # Contents are followed by a newline
+                    found.append((info.type, coprocess.read(info.size + 1)[:-1]))
+        except (OSError, ValueError) as e:
+            self.close()
+            raise OSError(f"git cat-file {self.mode} failed") from e
+        return found
+
+
+_SIGNATURE_START = re.compile(rb"^-----BEGIN [A-Z ]+-----$", re.MULTILINE)
+
+_cat_file_check = _CatFile("--batch-check")
+_cat_file_batch = _CatFile("--batch")
+atexit.register(_cat_file_check.close)
+atexit.register(_cat_file_batch.close)
+
+
+def resolve_revs(revs: Iterable[str]) -> dict[str, str | None]:
+    """Resolve many revisions at once to their object SHA, `None` if they are unknown.
+
+    Any revision understood by `git cat-file` is supported (`HEAD~2`, `refs/tags/v1^{commit}`...).
+    """
+    revs = list(revs)
+    try:
+        infos = _cat_file_check.info(revs)
+    except OSError:
+        return {rev: _resolve_rev(rev) for rev in revs}
+    return {rev: info.sha if info else None for rev, info in zip(revs, infos)}
+
+
+def _resolve_rev(rev: str) -> str | None:
+    c = cmd.run(f"git rev-parse --verify --quiet {rev}")
+    if c.return_code != 0:
+        return None
+    return c.out.strip()
+
+
+def get_notes(ref: str) -> dict[str, bytes]:
+    """The notes of the `ref` notes ref, keyed by the SHA of the object they annotate.
+
+    They are read in bulk: one `git notes list` then a batched read of the note blobs.
+    """
+    c = cmd.run(f"git notes --ref={ref} list")
+    if c.return_code != 0:
+        return {}
+    blobs: dict[str, str] = {}
+    for line in c.out.splitlines():
+        blob, _, annotated = line.partition(" ")
+        if annotated:
+            blobs[annotated] = blob
+    try:
+        contents = _cat_file_batch.contents_many(list(blobs.values()))
+    except OSError:
+        return {}
+    return {
+        annotated: found[1]
+        for annotated, found in zip(blobs, contents)
+        if found is not None and found[0] == "blob"
+    }
+
+
+def add_notes(ref: str, notes: dict[str, bytes], message: str) -> cmd.Command:
+    """Attach, or replace, the notes of many objects at once in a single `ref` commit.
+
+    The commit is created by `git fast-import`, which refuses to rewind the notes ref
+    if it moved in the meantime.
+    """
+    ident = cmd.run("git var GIT_COMMITTER_IDENT")
+    if ident.return_code != 0:
+        return ident
+    parent = resolve_revs([ref])[ref]
+    encoded_message = message.encode("utf-8")
+    stream = [
+        f"commit {ref}\ncommitter {ident.out.strip()}\n".encode(),
+        b"data %d\n%s\n" % (len(encoded_message), encoded_message),
+    ]
+    if parent:
+        stream.append(f"from {parent}\n".encode())
+    for annotated, note in notes.items():
+        stream.append(
+            b"N inline %s\ndata %d\n%s\n" % (annotated.encode(), len(note), note)
+        )
+
+    f = NamedTemporaryFile("wb", delete=False)
+    f.writelines(stream)
+    f.close()
+    c = cmd.run(f'git fast-import --quiet --date-format=raw < "{f.name}"')
+    os.unlink(f.name)
+    return c
+
+
 def tag(
     tag: str, annotated: bool = False, signed: bool = False, msg: str | None = None
 ) -> cmd.Command:
@@ -202,6 +582,25 @@ def _create_commit_cmd_string(args: str, committer_date: str | None, name: str)
     return f'cmd /v /c "set GIT_COMMITTER_DATE={committer_date}&& {command}"'
 
 
+def iter_commits(
+    start: str | None = None,
+    end: str | None = None,
+    *,
+    args: str = "",
+) -> Generator[GitCommit, None, None]:
+    """Lazily yield the commits between start and end.
+
+    Each commit is parsed as soon as its record has been read from the `git log`
+    pipe, so the history is never held in memory as a whole.
+    """
+    if end is None:
+        end = "HEAD"
+    # Shared by all the records so that legacy encodings are only detected once
+    decode = cmd.Decoder()
+    for record in _iter_log_records(start, end, args):
+        yield GitCommit.from_record(record, decode)
+
+
 def get_commits(
     start: str | None = None,
     end: str | None = None,
@@ -209,14 +608,7 @@ def get_commits(
     args: str = "",
 ) -> list[GitCommit]:
     """Get the commits between start and end."""
-    if end is None:
-        end = "HEAD"
-    git_log_entries = _get_log_as_str_list(start, end, args)
-    return [
-        GitCommit.from_rev_and_commit(rev_and_commit)
-        for rev_and_commit in git_log_entries
-        if rev_and_commit
-    ]
+    return list(iter_commits(start, end, args=args))
 
 
 def get_filenames_in_commit(git_reference: str = "") -> list[str]:
@@ -233,8 +625,27 @@ def get_filenames_in_commit(git_reference: str = "") -> list[str]:
 
 
 def get_tags(
-    dateformat: str = "%Y-%m-%d", reachable_only: bool = False
+    dateformat: str = "%Y-%m-%d",
+    reachable_only: bool = False,
+    *,
+    select: Callable[[str], bool] | None = None,
+    patterns: Sequence[str] = (),
 ) -> list[GitTag]:
+    """Get the tags sorted from the most recently created one.
+
+    If `patterns` are given, only the tags matching one of those globs are listed,
+    the filtering being done by git (or while reading the refs).
+
+    If `select` is given, only the tags whose name it accepts are returned.
+    Their names are then read in-process from the refs whenever possible,
+    and only the selected tags get their object and creator date looked up.
+    """
+    if select is not None and not reachable_only:
+        try:
+            return _get_tags_from_refs(select, dateformat, patterns)
+        except (OSError, ValueError):
+            pass
+
     inner_delimiter = "---inner_delimiter---"
     formatter = (
         f'"%(refname:strip=2){inner_delimiter}'
@@ -242,10 +653,13 @@ def get_tags(
         f"%(creatordate:format:{dateformat}){inner_delimiter}"
         f'%(object)"'
     )
-    extra = "--merged" if reachable_only else ""
+    extra = "--merged HEAD" if reachable_only else ""
     # Force the default language for parsing
     env = {"LC_ALL": "C", "LANG": "C", "LANGUAGE": "C"}
-    c = cmd.run(f"git tag --format={formatter} --sort=-creatordate {extra}", env=env)
+    extra += "".join(f' "{pattern}"' for pattern in patterns)
+    c = cmd.run(
+        f"git tag --list --format={formatter} --sort=-creatordate {extra}", env=env
+    )
     if c.return_code != 0:
         if reachable_only and c.err == "fatal: malformed object name HEAD\n":
             # this can happen if there are no commits in the repo yet
@@ -255,15 +669,110 @@ def get_tags(
     if c.err:
         out.warn(f"Attempting to proceed after: {c.err}")
 
-    return [
+    tags = (
         GitTag.from_line(line=line, inner_delimiter=inner_delimiter)
         for line in c.out.split("\n")[:-1]
-    ]
+    )
+    return [tag for tag in tags if select is None or select(tag.name)]
+
+
+def _get_tags_from_refs(
+    select: Callable[[str], bool], dateformat: str, patterns: Sequence[str]
+) -> list[GitTag]:
+    """The in-process counterpart of `git tag --sort=-creatordate [<pattern>...]`.
+
+    Raises `OSError` when the refs or objects can't be read this way.
+    """
+    dated_tags: list[tuple[int, GitTag]] = []
+    # Sorting by name first mimics git which breaks creator date ties by refname
+    for name, sha in sorted(_read_tag_refs(_get_common_dir()).items()):
+        if patterns and not any(fnmatchcase(name, p) for p in patterns):
+            continue
+        if not select(name):
+            continue
+        if (found := _cat_file_batch.contents(sha)) is None:
+            continue
+        object_type, contents = found
+        # A tag points to its object and is dated by its tagger,
+        # a lightweight tag is the commit itself, dated by its committer
+        rev, date_header = (
+            (None, b"tagger ") if object_type == "tag" else (sha, b"committer ")
+        )
+        timestamp, date = 0, ""
+        for header in contents.partition(b"\n\n")[0].split(b"\n"):
+            if rev is None and header.startswith(b"object "):
+                rev = header[7:].decode()
+            elif header.startswith(date_header):
+                timestamp, date = _parse_signature_date(header, dateformat)
+        dated_tags.append((timestamp, GitTag(name=name, rev=rev or sha, date=date)))
+
+    dated_tags.sort(key=lambda dated_tag: dated_tag[0], reverse=True)
+    return [tag for _, tag in dated_tags]
+
+
+def _parse_signature_date(signature: bytes, dateformat: str) -> tuple[int, str]:
+    """Extract the timestamp and formatted date from a `tagger`/`committer` header.
+
+    Those look like `tagger Jane Doe <jane@example.com> 1577836800 +0100`.
+    The date is formatted in its own timezone, like `creatordate:format:` does.
+    """
+    timestamp, offset = signature.rpartition(b"> ")[2].split()
+    hours, minutes = int(offset[1:3]), int(offset[3:5])
+    sign = -1 if offset.startswith(b"-") else 1
+    tz = timezone(sign * timedelta(hours=hours, minutes=minutes))
+    return int(timestamp), datetime.fromtimestamp(int(timestamp), tz).strftime(
+        dateformat
+    )
+
+
+def _get_common_dir() -> Path:
+    if (context := RepoContext.current()) and context.common_dir:
+        return context.common_dir
+    c = cmd.run("git rev-parse --git-common-dir")
+    if c.return_code != 0:
+        raise OSError(c.err)
+    return Path.cwd() / c.out.strip()
+
+
+def _read_tag_refs(common_dir: Path) -> dict[str, str]:
+    """Map every tag name to the object it points to, reading refs without git.
+
+    Loose refs (`refs/tags/**`) take precedence over `packed-refs`.
+    Peeled lines (`^<sha>`) are skipped: the tagged object is read from the tag itself.
+    Raises `OSError` for ref storages it doesn't understand (e.g. reftable).
+    """
+    if (common_dir / "reftable").exists():
+        raise OSError("reftable ref storage is not supported")
+
+    tag_refs: dict[str, str] = {}
+    try:
+        with open(common_dir / "packed-refs", "rb") as packed_refs:
+            for line in packed_refs:
+                if line.startswith((b"#", b"^")):
+                    continue
+                sha, _, ref = line.rstrip(b"\n").partition(b" ")
+                if ref.startswith(b"refs/tags/"):
+                    tag_refs[ref[10:].decode()] = sha.decode()
+    except FileNotFoundError:
+        pass
+
+    tags_dir = common_dir / "refs" / "tags"
+    for dirpath, _, filenames in os.walk(tags_dir):
+        for filename in filenames:
+            path = Path(dirpath, filename)
+            content = path.read_bytes().strip()
+            # Symbolic refs are left aside, like a half written ref
+            if len(content) in (40, 64) and not content.startswith(b"ref:"):
+                tag_refs[path.relative_to(tags_dir).as_posix()] = content.decode()
+    return tag_refs
 
 
 def tag_exist(tag: str) -> bool:
-    c = cmd.run(f"git tag --list {tag}")
-    return tag in c.out
+    try:
+        return _cat_file_check.info([f"refs/tags/{tag}"])[0] is not None
+    except OSError:
+        c = cmd.run(f"git tag --list {tag}")
+        return tag in c.out
 
 
 def is_signed_tag(tag: str) -> bool:
@@ -278,10 +787,23 @@ def get_latest_tag_name() -> str | None:
 
 
 def get_tag_message(tag: str) -> str | None:
-    c = cmd.run(f"git tag -l --format='%(contents:subject)' {tag}")
-    if c.err:
-        return None
-    return c.out.strip()
+    try:
+        found = _cat_file_batch.contents(f"refs/tags/{tag}")
+    except OSError:
+        c = cmd.run(f"git tag -l --format='%(contents:subject)' {tag}")
+        if c.err:
+            return None
+        return c.out.strip()
+
+    if found is None:
+        return ""
+    # Both tag and commit objects (lightweight tags) carry headers, a blank line,
+    # then the message and optionally its signature
+    _, message = found
+    _, _, message = message.partition(b"\n\n")
+    message = _SIGNATURE_START.split(message, maxsplit=1)[0]
+    subject = message.split(b"\n\n", 1)[0]
+    return " ".join(cmd._try_decode(subject).split("\n")).strip()
 
 
 def get_tag_names() -> list[str]:
@@ -292,6 +814,8 @@ def get_tag_names() -> list[str]:
 
 
 def find_git_project_root() -> Path | None:
+    if context := RepoContext.current():
+        return context.project_root
     c = cmd.run("git rev-parse --show-toplevel")
     if c.err:
         return None
@@ -305,6 +829,8 @@ def is_staging_clean() -> bool:
 
 
 def is_git_project() -> bool:
+    if context := RepoContext.current():
+        return context.is_git_project
     c = cmd.run("git rev-parse --is-inside-work-tree")
     return c.out.strip() == "true"
 
@@ -321,17 +847,61 @@ def smart_open(*args, **kwargs):  # type: ignore[no-untyped-def,unused-ignore] #
     return open(*args, newline=EOLType.for_open(), **kwargs)
 
 
-def _get_log_as_str_list(start: str | None, end: str, args: str) -> list[str]:
-    """Get string representation of each log entry"""
-    delimiter = "----------commit-delimiter----------"
-    log_format: str = "%H%n%P%n%s%n%an%n%ae%n%b"
-    command_range = f"{start}..{end}" if start else end
-    command = f"git -c log.showSignature=False log --pretty={log_format}{delimiter} {args} {command_range}"
+@contextmanager
+def smart_replace(
+    path: str | os.PathLike[str], **kwargs: Any
+) -> Generator[TextIO, None, None]:
+    """Write a file with `smart_open`, replacing it only once completely written.
 
-    c = cmd.run(command)
-    if c.return_code != 0:
-        raise GitCommandError(c.err)
-    return c.out.split(f"{delimiter}\n")
+    The content goes to a temporary file next to it first, so that the file is left
+    untouched if writing fails halfway. Its permissions are kept.
+    """
+    target = os.path.realpath(path)
+    fd, temp_path = mkstemp(
+        dir=os.path.dirname(target), prefix=f".{os.path.basename(target)}."
+    )
+    try:
+        with smart_open(fd, "w", **kwargs) as f:
+            yield f
+        try:
+            mode = stat.S_IMODE(os.stat(target).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, target)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+
+def _iter_log_records(
+    start: str | None, end: str, args: str
+) -> Generator[bytes, None, None]:
+    """Yield the raw bytes of each log record as soon as it is complete.
+
+    Records are NUL-terminated (`-z`) and never decoded as a whole: decoding is left to
+    `GitCommit.from_record`, one record at a time.
+    """
+    command_range = f"{start}..{end}" if start else end
+    command = f"git -c log.showSignature=False log -z --format={_LOG_FORMAT} {args} {command_range}"
+
+    try:
+        yield from _split_log_records(cmd.stream(command))
+    except subprocess.CalledProcessError as e:
+        raise GitCommandError(cmd._try_decode(e.stderr)) from e
+
+
+def _split_log_records(chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+    """Reassemble NUL-terminated records from arbitrarily cut chunks"""
+    pending = b""
+    for chunk in chunks:
+        *records, pending = (pending + chunk).split(b"\0")
+        yield from records
+    if pending:
+        yield pending
 
 
 def get_default_branch() -> str:
@@ -1,5 +1,6 @@
 import io
 import sys
+from collections.abc import Iterable
 from typing import Any
 
 from termcolor import colored
@@ -14,6 +15,13 @@ def write(value: str, *args: object) -> None:
     print(value, *args)
 
 
+def stream(chunks: Iterable[str]) -> None:
+    """Same as `write`, for long outputs written as they are generated."""
+    for chunk in chunks:
+        sys.stdout.write(chunk)
+    sys.stdout.write("\n")
+
+
 def line(value: str, *args: object, **kwargs: Any) -> None:
     """Wrapper in case I want to do something different later."""
     print(value, *args, **kwargs)
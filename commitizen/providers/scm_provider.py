@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from commitizen.git import get_tags
 from commitizen.providers.base_provider import VersionProvider
-from commitizen.tags import TagRules
+from commitizen.tags import TagIndex, TagRules
 
 
 class ScmProvider(VersionProvider):
@@ -16,10 +16,15 @@ class ScmProvider(VersionProvider):
 
     def get_version(self) -> str:
         rules = TagRules.from_settings(self.config.settings)
-        tags = get_tags(reachable_only=True)
-        version_tags = rules.get_version_tags(tags)
-        version = max((rules.extract_version(t) for t in version_tags), default=None)
-        return str(version) if version is not None else "0.0.0"
+        version_tags = TagIndex(
+            get_tags(
+                reachable_only=True,
+                select=rules.is_version_tag,
+                patterns=rules.tag_patterns,
+            ),
+            rules,
+        )
+        return str(version_tags.versions[-1]) if version_tags.versions else "0.0.0"
 
     def set_version(self, version: str) -> None:
         # Not necessary
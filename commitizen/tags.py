@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import re
 import warnings
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from functools import cached_property
 from itertools import chain
 from string import Template
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING, NamedTuple, overload
 
 from commitizen import out
 from commitizen.defaults import DEFAULT_SETTINGS, Settings, get_tag_regexes
@@ -21,7 +22,7 @@ from commitizen.version_schemes import (
 
 if TYPE_CHECKING:
     import sys
-    from collections.abc import Iterable, Sequence
+    from collections.abc import Iterable, Iterator
 
     from commitizen.version_schemes import VersionScheme
 
@@ -32,6 +33,23 @@ if TYPE_CHECKING:
         from typing import Self
 
 
+# Tag formats are regexes: their literal part stops at the first placeholder
+# or regex special character
+_SPECIAL_CHARS = re.compile(r"[$.^*+?{}()\[\]\\|]")
+# Quantifiers which may leave out the character before them
+_OPTIONAL_QUANTIFIERS = frozenset("?*{")
+
+
+def _literal_prefix(tag_format: str) -> str:
+    """The leading characters every tag of that format starts with"""
+    if (special := _SPECIAL_CHARS.search(tag_format)) is None:
+        return tag_format
+    prefix = tag_format[: special.start()]
+    if special.group() in _OPTIONAL_QUANTIFIERS:
+        return prefix[:-1]
+    return prefix
+
+
 class VersionTag(NamedTuple):
     """Represent a version and its matching tag form."""
 
@@ -106,6 +124,24 @@ class TagRules:
             for f in self.ignored_tag_formats
         ]
 
+    @cached_property
+    def tag_patterns(self) -> list[str]:
+        """
+        Glob patterns matching every tag which may be a version tag, current or legacy.
+
+        They are built from the literal prefix of each tag format so that git can
+        leave foreign tags out when listing them; the exact check stays `is_version_tag`.
+        Empty when a format starts with a placeholder, as any tag may match it then.
+        """
+        prefixes: list[str] = []
+        for prefix in sorted(map(_literal_prefix, self.tag_formats)):
+            if not prefix:
+                return []
+            # `v*` already covers `ver*`
+            if not any(prefix.startswith(p) for p in prefixes):
+                prefixes.append(prefix)
+        return [f"{prefix}*" for prefix in prefixes]
+
     def _format_regex(self, tag_pattern: str, star: bool = False) -> str:
         """
         Format a tag pattern into a regex pattern.
@@ -246,7 +282,10 @@ class TagRules:
         """Find the first matching tag for a given version."""
         version = self.scheme(version) if isinstance(version, str) else version
         possible_tags = set(self.normalize_tag(version, f) for f in self.tag_formats)
-        candidates = [t for t in tags if t.name in possible_tags]
+        if isinstance(tags, TagIndex):
+            candidates = tags.find_by_names(possible_tags)
+        else:
+            candidates = [t for t in tags if t.name in possible_tags]
         if len(candidates) > 1:
             warnings.warn(
                 UserWarning(
@@ -265,3 +304,115 @@ class TagRules:
             ignored_tag_formats=settings["ignored_tag_formats"],
             merge_prereleases=settings["changelog_merge_prerelease"],
         )
+
+
+class TagIndex(Sequence[GitTag]):
+    """
+    An immutable sequence of tags, indexed for constant time lookups.
+
+    It keeps the order of the tags it is built from (newest first when built from
+    `git.get_tags()`) and can be used anywhere a list of tags is expected, so it
+    is meant to be built once per command and shared by all the tag lookups.
+
+    Example:
+
+    ```python
+    index = TagIndex(git.get_tags(), rules)
+
+    index.get("v1.0.0")  # The `v1.0.0` tag, if any
+    index.for_rev(commit.rev)  # The tags pointing to `commit`
+    index.next_name("v1.0.0")  # The name of the tag preceding `v1.0.0`
+    index.for_version("1.0.0")  # The tags matching version `1.0.0`
+    ```
+    """
+
+    def __init__(self, tags: Iterable[GitTag], rules: TagRules | None = None) -> None:
+        self._tags = list(tags)
+        self.rules = rules or TagRules()
+        self._by_name: dict[str, int] = {}
+        self._by_rev: dict[str, list[GitTag]] = {}
+        for position, tag in enumerate(self._tags):
+            self._by_name.setdefault(tag.name, position)
+            self._by_rev.setdefault(tag.rev, []).append(tag)
+
+    @classmethod
+    def of(cls, tags: Iterable[GitTag], rules: TagRules | None = None) -> TagIndex:
+        """Index `tags` unless they already are"""
+        if isinstance(tags, TagIndex) and (rules is None or rules is tags.rules):
+            return tags
+        return cls(tags, rules)
+
+    @overload
+    def __getitem__(self, index: int) -> GitTag: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[GitTag]: ...
+
+    def __getitem__(self, index: int | slice) -> GitTag | list[GitTag]:
+        return self._tags[index]
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def __iter__(self) -> Iterator[GitTag]:
+        return iter(self._tags)
+
+    def __contains__(self, tag: object) -> bool:
+        if not isinstance(tag, GitTag):
+            return False
+        position = self._by_name.get(tag.name)
+        return position is not None and self._tags[position] == tag
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._tags!r})"
+
+    def get(self, name: str) -> GitTag | None:
+        """The tag named `name`, if any"""
+        position = self._by_name.get(name)
+        return self._tags[position] if position is not None else None
+
+    def for_rev(self, rev: str) -> list[GitTag]:
+        """All the tags pointing to the commit `rev`, in index order"""
+        return self._by_rev.get(rev, [])
+
+    def first_for_rev(self, rev: str) -> GitTag | None:
+        """The first tag pointing to the commit `rev`, if any"""
+        tags = self._by_rev.get(rev)
+        return tags[0] if tags else None
+
+    def next_name(self, name: str) -> str | None:
+        """
+        The name of the tag following `name` in the index, if any.
+
+        Raises `KeyError` if there is no tag named `name`.
+        """
+        position = self._by_name[name] + 1
+        return self._tags[position].name if position < len(self._tags) else None
+
+    def find_by_names(self, names: Iterable[str]) -> list[GitTag]:
+        """The tags named after any of `names`, in index order"""
+        positions = sorted(p for n in names if (p := self._by_name.get(n)) is not None)
+        return [self._tags[p] for p in positions]
+
+    @cached_property
+    def by_version(self) -> dict[Version, list[GitTag]]:
+        """Version tags grouped by the version they hold, in index order"""
+        by_version: dict[Version, list[GitTag]] = {}
+        for tag in self._tags:
+            try:
+                version = self.rules.extract_version(tag)
+            except InvalidVersion:
+                continue
+            by_version.setdefault(version, []).append(tag)
+        return by_version
+
+    @cached_property
+    def versions(self) -> list[Version]:
+        """All the versions held by version tags, lowest first"""
+        return sorted(self.by_version)
+
+    def for_version(self, version: Version | str) -> list[GitTag]:
+        """The version tags holding `version`, whatever their format"""
+        if isinstance(version, str):
+            version = self.rules.scheme(version)
+        return self.by_version.get(version, [])
@@ -0,0 +1,122 @@
+"""Compare the peak memory of generating a changelog from a list of commits with
+streaming them into it.
+
+A synthetic history, tagged every 100 commits, is either built as a list beforehand
+(as `git.get_commits` returns it) or generated lazily (as `git.iter_commits` reads
+it from the `git log` pipe). The changelog is generated and rendered from both.
+
+The `changelog` command is then run on a repository holding that history, with the
+commit caches enabled: cold, then warm.
+
+Usage: python scripts/bench_changelog_memory.py [NUMBER_OF_COMMITS]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from bench_history import COMMITS_PER_RELEASE, fake_commits, fake_tags
+
+from commitizen import cache, changelog
+from commitizen.commands.changelog import Changelog
+from commitizen.config import read_cfg
+from commitizen.cz.conventional_commits import ConventionalCommitsCz
+from commitizen.git import GitCommit, GitTag
+
+
+def _render(commits: Iterable[GitCommit], tags: list[GitTag]) -> str:
+    cz = ConventionalCommitsCz
+    tree = changelog.generate_tree_from_commits(
+        commits, tags, cz.commit_parser, cz.changelog_pattern
+    )
+    return changelog.render_changelog(tree, cz.template_loader, "CHANGELOG.md.j2")
+
+
+def _create_repository(path: Path, count: int) -> None:
+    """A repository holding the synthetic history, its releases tagged"""
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    (path / "pyproject.toml").write_text(
+        '[tool.commitizen]\nname = "cz_conventional_commits"\ntag_format = "v$version"\n'
+    )
+    commits = list(fake_commits(count))
+    stream = []
+    # Oldest first, each commit having the previous one as parent
+    for mark, index in enumerate(reversed(range(count)), start=1):
+        commit = commits[index]
+        message = f"{commit.title}\n\n{commit.body}".encode()
+        stream.append(
+            b"commit refs/heads/master\n"
+            b"mark :%d\n"
+            b"committer John Doe <john@example.com> %d +0000\n"
+            b"data %d\n%s\n" % (mark, 1_700_000_000 + mark, len(message), message)
+        )
+        if index % COMMITS_PER_RELEASE == 0:
+            version = (count - index) // COMMITS_PER_RELEASE
+            stream.append(b"reset refs/tags/v%d.0.0\nfrom :%d\n\n" % (version, mark))
+    subprocess.run(
+        ["git", "fast-import", "--quiet"],
+        input=b"".join(stream),
+        cwd=path,
+        check=True,
+    )
+    subprocess.run(["git", "reset", "-q", "--hard"], cwd=path, check=True)
+
+
+def _run_command(path: Path) -> str:
+    Changelog(read_cfg(), {"incremental": False, "unreleased_version": None})()
+    return (path / "CHANGELOG.md").read_text()
+
+
+def _measure(run: Callable[[], str]) -> tuple[float, int, str]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    output = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, output
+
+
+def main(count: int) -> None:
+    tags = fake_tags(count)
+    listed_time, listed_peak, listed = _measure(
+        lambda: _render(list(fake_commits(count)), tags)
+    )
+    streamed_time, streamed_peak, streamed = _measure(
+        lambda: _render(fake_commits(count), tags)
+    )
+    if listed != streamed:
+        raise AssertionError("Both approaches must render the same changelog")
+
+    print(f"{count} commits, {len(tags)} releases")
+    print(
+        f"listed commits:   {listed_peak / 2**20:8.1f} MiB peak ({listed_time:.1f} s)"
+    )
+    print(
+        f"streamed commits: {streamed_peak / 2**20:8.1f} MiB peak ({streamed_time:.1f} s)"
+        f" ({listed_peak / streamed_peak:.2f}x less)"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory)
+        _create_repository(path, count)
+        os.chdir(path)
+        cold_time, cold_peak, cold = _measure(lambda: _run_command(path))
+        # A new invocation, reading the caches written by the first one
+        cache._instances.clear()
+        warm_time, warm_peak, warm = _measure(lambda: _run_command(path))
+        if cold != warm:
+            raise AssertionError("The caches must not change the changelog")
+        os.chdir(Path(__file__).parent)
+
+    print(f"command, cold cache: {cold_peak / 2**20:6.1f} MiB peak ({cold_time:.1f} s)")
+    print(f"command, warm cache: {warm_peak / 2**20:6.1f} MiB peak ({warm_time:.1f} s)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
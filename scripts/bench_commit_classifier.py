@@ -0,0 +1,132 @@
+"""Compare the single-pass commit classifier with the legacy two-pass approach.
+
+The legacy approach walks the commits once to find the bump increment, matching each
+keyword against the increment map keys recompiled on the fly, then once again to parse
+the changelog entries. The classifier compiles the rules once and produces both from a
+single walk. A synthetic history, already in memory, is processed both ways.
+Finding the increment alone (as `cz bump --get-next` does) is measured as well.
+
+Usage: python scripts/bench_commit_classifier.py [NUMBER_OF_COMMITS]
+"""
+
+import re
+import sys
+import timeit
+from collections import OrderedDict
+from logging import getLogger
+from typing import Any
+
+from bench_history import fake_commits
+
+from commitizen import bump
+from commitizen.classifier import VERSION_TYPES, CommitClassifier
+from commitizen.config import BaseConfig
+from commitizen.cz.conventional_commits import ConventionalCommitsCz
+from commitizen.defaults import MAJOR
+from commitizen.git import GitCommit
+
+logger = getLogger("commitizen")
+
+
+def legacy_find_increment(
+    commits: list[GitCommit], regex: str, increments_map: dict
+) -> str | None:
+    increments_map = OrderedDict(increments_map)
+    select_pattern = re.compile(regex)
+    increment: str | None = None
+    for commit in commits:
+        for message in commit.message.split("\n"):
+            if result := select_pattern.search(message):
+                found_keyword = result.group(1)
+                new_increment = None
+                for match_pattern in increments_map.keys():
+                    if re.match(match_pattern, found_keyword):
+                        new_increment = increments_map[match_pattern]
+                        break
+                if new_increment is None:
+                    logger.debug(
+                        f"no increment needed for '{found_keyword}' in '{message}'"
+                    )
+                if VERSION_TYPES.index(increment) < VERSION_TYPES.index(new_increment):
+                    logger.debug(
+                        f"increment detected is '{new_increment}' due to '{found_keyword}' in '{message}'"
+                    )
+                    increment = new_increment
+                if increment == MAJOR:
+                    break
+    return increment
+
+
+def legacy_parse(
+    commits: list[GitCommit], commit_parser: str, changelog_pattern: str
+) -> list[list[dict[str, Any]]]:
+    pat = re.compile(changelog_pattern)
+    map_pat = re.compile(commit_parser, re.MULTILINE)
+    body_map_pat = re.compile(commit_parser, re.MULTILINE | re.DOTALL)
+    parsed = []
+    for commit in commits:
+        entries = []
+        if pat.match(commit.message):
+            if match := map_pat.match(commit.message):
+                entries.append(match.groupdict())
+            for block in commit.body.split("\n\n"):
+                if match := body_map_pat.match(block):
+                    entries.append(match.groupdict())
+        parsed.append(entries)
+    return parsed
+
+
+def main(count: int) -> None:
+    commits = list(fake_commits(count))
+    cz = ConventionalCommitsCz(BaseConfig())
+    if not cz.commit_parser or not cz.changelog_pattern:
+        raise RuntimeError("The changelog rules are required")
+
+    def two_passes() -> tuple[str | None, list[list[dict[str, Any]]]]:
+        return (
+            legacy_find_increment(commits, cz.bump_pattern, cz.bump_map),
+            legacy_parse(commits, cz.commit_parser, cz.changelog_pattern),
+        )
+
+    def single_pass() -> tuple[str | None, list[list[dict[str, Any]]]]:
+        classifier = CommitClassifier.from_cz(cz)
+        records = [record for _, record in classifier.iter_records(commits)]
+        increment = max(
+            (record.increment for record in records), key=VERSION_TYPES.index
+        )
+        return increment, [record.entries for record in records]
+
+    if two_passes() != single_pass():
+        raise AssertionError("Both approaches must produce the same results")
+
+    legacy = min(timeit.repeat(two_passes, number=1, repeat=5))
+    classified = min(timeit.repeat(single_pass, number=1, repeat=5))
+    legacy_increment = min(
+        timeit.repeat(
+            lambda: legacy_find_increment(commits, cz.bump_pattern, cz.bump_map),
+            number=1,
+            repeat=5,
+        )
+    )
+    increment = min(
+        timeit.repeat(
+            lambda: bump.find_increment(commits, cz.bump_pattern, cz.bump_map),
+            number=1,
+            repeat=5,
+        )
+    )
+
+    print(f"{count} commits")
+    print(f"two passes:          {legacy * 1000:8.1f} ms")
+    print(
+        f"single pass:         {classified * 1000:8.1f} ms ({legacy / classified:.2f}x)"
+    )
+    print(f"legacy increment:    {legacy_increment * 1000:8.1f} ms")
+    print(
+        f"increment:           {increment * 1000:8.1f} ms"
+        f" ({legacy_increment / increment:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,88 @@
+"""Compare the NUL-delimited `git log` parser with the legacy text-delimited one.
+
+Both parsers are fed the same synthetic history, already in memory, so only the
+parsing cost is measured (not git itself), along with the memory held by the
+parsed commits.
+
+Usage: python scripts/bench_git_log_parser.py [NUMBER_OF_COMMITS]
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+from bench_history import fake_commits
+
+from commitizen import cmd, git
+
+LEGACY_DELIMITER = "----------commit-delimiter----------"
+CHUNK_SIZE = cmd.STREAM_CHUNK_SIZE
+
+
+def _fake_records(count: int) -> list[tuple[str, ...]]:
+    return [
+        (
+            commit.rev,
+            " ".join(commit.parents),
+            commit.title,
+            commit.author,
+            commit.author_email,
+            f"{commit.body}\n",
+        )
+        for commit in fake_commits(count)
+    ]
+
+
+def _legacy_output(commits: list[tuple[str, ...]]) -> bytes:
+    return "".join(
+        "\n".join(commit) + f"{LEGACY_DELIMITER}\n" for commit in commits
+    ).encode()
+
+
+def _nul_output(commits: list[tuple[str, ...]]) -> bytes:
+    return b"".join("\x1e".join(commit).encode() + b"\0" for commit in commits)
+
+
+def _chunked(data: bytes) -> list[bytes]:
+    return [data[i : i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+
+
+def parse_legacy(output: bytes) -> list[git.GitCommit]:
+    entries = cmd._try_decode(output).split(f"{LEGACY_DELIMITER}\n")
+    return [git.GitCommit.from_rev_and_commit(entry) for entry in entries if entry]
+
+
+def parse_nul(chunks: list[bytes]) -> list[git.GitCommit]:
+    return [
+        git.GitCommit.from_record(record) for record in git._split_log_records(chunks)
+    ]
+
+
+def _memory_per_commit(chunks: list[bytes]) -> float:
+    tracemalloc.start()
+    commits = parse_nul(chunks)
+    for commit in commits:
+        # What `bump` and `changelog` touch on every commit
+        commit.message
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(commits)
+
+
+def main(count: int) -> None:
+    commits = _fake_records(count)
+    legacy_output = _legacy_output(commits)
+    nul_chunks = _chunked(_nul_output(commits))
+    if not len(parse_legacy(legacy_output)) == len(parse_nul(nul_chunks)) == count:
+        raise RuntimeError("Both parsers should find every commit")
+
+    legacy = min(timeit.repeat(lambda: parse_legacy(legacy_output), number=1, repeat=5))
+    nul = min(timeit.repeat(lambda: parse_nul(nul_chunks), number=1, repeat=5))
+    print(f"{count} commits")
+    print(f"legacy text-delimited parser: {legacy * 1000:8.1f} ms")
+    print(f"NUL-delimited record parser:  {nul * 1000:8.1f} ms ({legacy / nul:.2f}x)")
+    print(f"memory per parsed commit:     {_memory_per_commit(nul_chunks):8.0f} B")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,32 @@
+"""The synthetic history shared by the benchmarks.
+
+Commits cycle through the conventional commit types and scopes, each with a short
+body, and are tagged every `COMMITS_PER_RELEASE` commits, newest first as `git log`
+lists them.
+"""
+
+from collections.abc import Iterator
+
+from commitizen.git import GitCommit, GitTag
+
+TYPES = ("feat", "fix", "docs", "refactor", "perf", "chore")
+COMMITS_PER_RELEASE = 100
+
+
+def fake_commits(count: int) -> Iterator[GitCommit]:
+    for i in range(count):
+        yield GitCommit(
+            f"{i:040x}",
+            f"{TYPES[i % len(TYPES)]}(scope-{i % 50}): change number {i}",
+            f"Some body explaining change {i}\n\nCloses #{i}",
+            "John Doe",
+            "john@example.com",
+            [f"{i + 1:040x}"],
+        )
+
+
+def fake_tags(count: int) -> list[GitTag]:
+    return [
+        GitTag(f"v{i // COMMITS_PER_RELEASE}.0.0", f"{i:040x}", "2024-01-01")
+        for i in range(0, count, COMMITS_PER_RELEASE)
+    ]
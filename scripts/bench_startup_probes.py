@@ -0,0 +1,69 @@
+"""Compare running the startup git probes one by one with running them concurrently.
+
+A throwaway repository with many tags is created so that listing them is not free,
+then the probes a `cz bump --changelog` needs before doing any real work are run
+both ways.
+
+Usage: python scripts/bench_startup_probes.py [NUMBER_OF_TAGS]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+from commitizen import cmd, git
+
+PROBES = [
+    git._REV_PARSE_CMD,
+    git._EOL_CONFIG_CMD,
+    "git tag --list --merged HEAD --sort=-creatordate"
+    ' --format="%(refname:strip=2) %(objectname) %(creatordate:short) %(object)"',
+    "git describe --tags --abbrev=0",
+]
+
+
+def _create_repository(path: str, tags: int) -> None:
+    for command in (
+        "git init -q",
+        "git -c user.name=bench -c user.email=bench@example.com"
+        " commit -q --allow-empty -m 'feat: initial commit'",
+    ):
+        if (c := cmd.run(command)).return_code != 0:
+            raise RuntimeError(c.err)
+    refs = "".join(
+        f"create refs/tags/v{i // 100}.{i % 100}.0 HEAD\n" for i in range(tags)
+    )
+    with tempfile.NamedTemporaryFile("w", delete=False) as f:
+        f.write(refs)
+    try:
+        if (c := cmd.run(f"git update-ref --stdin < {f.name}")).return_code != 0:
+            raise RuntimeError(c.err)
+    finally:
+        os.unlink(f.name)
+
+
+def main(tags: int) -> None:
+    with tempfile.TemporaryDirectory() as path:
+        os.chdir(path)
+        _create_repository(path, tags)
+
+        serial = min(
+            timeit.repeat(lambda: [cmd.run(p) for p in PROBES], number=1, repeat=5)
+        )
+        concurrent = min(
+            timeit.repeat(lambda: cmd.run_concurrently(PROBES), number=1, repeat=5)
+        )
+        slowest = max(
+            min(timeit.repeat(lambda p=p: cmd.run(p), number=1, repeat=5))
+            for p in PROBES
+        )
+
+    print(f"{len(PROBES)} probes, {tags} tags")
+    print(f"one by one:       {serial * 1000:8.1f} ms")
+    print(f"concurrently:     {concurrent * 1000:8.1f} ms ({serial / concurrent:.2f}x)")
+    print(f"slowest probe:    {slowest * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
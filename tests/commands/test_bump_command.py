@@ -12,6 +12,7 @@ import pytest
 
 import commitizen.commands.bump as bump
 from commitizen import cli, cmd, defaults, git, hooks
+from commitizen.classifier import CommitClassifier
 from commitizen.config.base_config import BaseConfig
 from commitizen.exceptions import (
     BumpTagFailedError,
@@ -675,6 +676,40 @@ def test_bump_with_changelog_arg(mocker: MockFixture, changelog_path):
     assert "0.2.0" in out
 
 
+@pytest.mark.usefixtures("tmp_commitizen_project", "commit_cache")
+def test_bump_publishes_notes_cache(mocker: MockFixture, config_path):
+    create_file_and_commit("feat(user): new file")
+    create_file_and_commit("fix: some fix")
+    with open(config_path, "a", encoding="utf-8") as fp:
+        fp.write("notes_cache = true\n")
+
+    testargs = ["cz", "bump", "--yes", "--changelog"]
+    mocker.patch.object(sys, "argv", testargs)
+    cli.main()
+
+    notes = cmd.run("git notes --ref=refs/notes/commitizen list").out.splitlines()
+    # The bump commit itself is not parsed
+    assert len(notes) == 2
+    log = cmd.run("git log --format=%s refs/notes/commitizen").out
+    assert log == "Commitizen notes for 0.2.0\n"
+    note = cmd.run("git notes --ref=refs/notes/commitizen show HEAD~1").out
+    # The increment and the changelog entries of the commit, each under its rules
+    assert len(note.splitlines()) == 2
+    assert '"PATCH"' in note
+    assert '"change_type":"fix"' in note
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project", "commit_cache")
+def test_bump_without_notes_cache(mocker: MockFixture):
+    create_file_and_commit("feat(user): new file")
+
+    testargs = ["cz", "bump", "--yes"]
+    mocker.patch.object(sys, "argv", testargs)
+    cli.main()
+
+    assert cmd.run("git notes --ref=refs/notes/commitizen list").out == ""
+
+
 @pytest.mark.usefixtures("tmp_commitizen_project")
 def test_bump_with_changelog_config(mocker: MockFixture, changelog_path, config_path):
     create_file_and_commit("feat(user): new file")
@@ -736,6 +771,36 @@ def test_bump_with_changelog_to_stdout_arg(mocker: MockFixture, capsys, changelo
     assert "0.2.0" in out
 
 
+@pytest.mark.parametrize("increment", ([], ["--increment", "MINOR"]))
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_bump_with_changelog_reads_commits_and_tags_once(
+    mocker: MockFixture, capsys, changelog_path, increment
+):
+    create_file_and_commit("feat(user): first release")
+    mocker.patch.object(sys, "argv", ["cz", "bump", "--yes", "--changelog"])
+    cli.main()
+    create_file_and_commit("fix(user): this should appear in stdout")
+    capsys.readouterr()
+
+    iter_commits = mocker.spy(git, "iter_commits")
+    get_tags = mocker.spy(git, "get_tags")
+    classify = mocker.spy(CommitClassifier, "classify")
+    testargs = ["cz", "bump", "--yes", "--changelog-to-stdout", *increment]
+    mocker.patch.object(sys, "argv", testargs)
+    cli.main()
+    out, _ = capsys.readouterr()
+
+    assert "this should appear in stdout" in out
+    assert iter_commits.call_count == 1
+    assert iter_commits.call_args.kwargs == {"args": "--topo-order"}
+    assert get_tags.call_count == 1
+    assert classify.call_count == 1
+    with open(changelog_path, encoding="utf-8") as f:
+        changelog = f.read()
+    assert "## 0.2.0" in changelog
+    assert "this should appear in stdout" in changelog
+
+
 @pytest.mark.usefixtures("tmp_commitizen_project")
 def test_bump_with_changelog_to_stdout_dry_run_arg(
     mocker: MockFixture, capsys, changelog_path
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import itertools
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from textwrap import dedent
 from typing import TYPE_CHECKING
@@ -10,6 +11,7 @@ import pytest
 from jinja2 import FileSystemLoader
 
 from commitizen import cli, git
+from commitizen.changelog_formats.markdown import Markdown
 from commitizen.commands.changelog import Changelog
 from commitizen.exceptions import (
     DryRunExit,
@@ -88,6 +90,121 @@ def test_changelog_from_start(
     file_regression.check(out, extension=changelog_format.ext)
 
 
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_changelog_with_jobs_is_identical(
+    capsys: pytest.CaptureFixture, mocker: MockFixture, util: UtilFixture
+):
+    mocker.patch("commitizen.changelog._MIN_COMMITS_PER_CHUNK", 2)
+    pool = mocker.patch(
+        "commitizen.changelog.ProcessPoolExecutor", wraps=ProcessPoolExecutor
+    )
+    for i in range(3):
+        util.create_file_and_commit(f"feat: feature {i}")
+        util.create_file_and_commit(f"fix: fix {i}\n\nfeat(body): body feature {i}")
+        util.create_tag(f"0.{i}.0")
+    util.create_file_and_commit("refactor: unreleased")
+
+    outputs = []
+    for jobs in ("1", "2"):
+        with pytest.raises(DryRunExit):
+            util.run_cli("changelog", "--dry-run", "--jobs", jobs)
+        outputs.append(capsys.readouterr().out)
+
+    assert outputs[0] == outputs[1]
+    assert "## 0.2.0" in outputs[0]
+    assert pool.call_count == 1
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project", "commit_cache")
+def test_changelog_reuses_the_released_sections(
+    capsys: pytest.CaptureFixture, util: UtilFixture
+):
+    for i in range(3):
+        util.create_file_and_commit(f"feat: feature {i}")
+        util.create_tag(f"0.{i}.0")
+    util.create_file_and_commit("fix: unreleased")
+
+    outputs = []
+    for _ in range(2):
+        with pytest.raises(DryRunExit):
+            util.run_cli("changelog", "--dry-run")
+        outputs.append(capsys.readouterr().out)
+
+    assert outputs[0] == outputs[1]
+    lines = Path(".git", "commitizen", "releases").read_text().splitlines()
+    # The unreleased section is the first one, always rendered; the entries used are
+    # appended again to keep track of the most recently used ones
+    assert len({line.partition("\t")[0] for line in lines}) == 3
+
+
+FROM_FILE_CHANGELOG = """\
+# Changelog
+
+## Unreleased
+
+- not released
+
+## v1.1.0 (2024-01-01)
+
+### Feat
+
+- edited by hand
+
+## v1.0.0 (2023-01-01)
+
+- initial
+"""
+
+
+@pytest.mark.parametrize("version", ("1.1.0", "v1.1.0"))
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_changelog_from_file(
+    capsys: pytest.CaptureFixture, mocker: MockFixture, util: UtilFixture, version: str
+):
+    Path("CHANGELOG.md").write_text(FROM_FILE_CHANGELOG)
+    iter_commits = mocker.patch("commitizen.git.iter_commits")
+
+    util.run_cli("changelog", "--from-file", version)
+
+    assert capsys.readouterr().out == (
+        "## v1.1.0 (2024-01-01)\n\n### Feat\n\n- edited by hand\n"
+    )
+    iter_commits.assert_not_called()
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_changelog_from_file_unknown_version(util: UtilFixture):
+    Path("CHANGELOG.md").write_text(FROM_FILE_CHANGELOG)
+
+    with pytest.raises(NoRevisionError, match="No release 2.0.0 found"):
+        util.run_cli("changelog", "--from-file", "2.0.0")
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_changelog_from_file_with_rev_range(util: UtilFixture):
+    with pytest.raises(NotAllowed):
+        util.run_cli("changelog", "--from-file", "1.0.0", "1.0.0..1.1.0")
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project", "commit_cache")
+def test_changelog_from_file_reuses_its_index(
+    capsys: pytest.CaptureFixture, mocker: MockFixture, util: UtilFixture
+):
+    changelog_file = Path("CHANGELOG.md")
+    changelog_file.write_text(FROM_FILE_CHANGELOG)
+    get_release_ranges = mocker.spy(Markdown, "get_release_ranges")
+
+    util.run_cli("changelog", "--from-file", "1.0.0")
+    util.run_cli("changelog", "--from-file", "1.0.0")
+    assert get_release_ranges.call_count == 1
+
+    changelog_file.write_text(FROM_FILE_CHANGELOG.replace("initial", "first"))
+    util.run_cli("changelog", "--from-file", "1.0.0")
+
+    assert get_release_ranges.call_count == 2
+    assert capsys.readouterr().out.splitlines()[-1] == "- first"
+
+
 @pytest.mark.usefixtures("tmp_commitizen_project")
 @pytest.mark.freeze_time("2022-08-14")
 def test_changelog_replacing_unreleased_using_incremental(
@@ -292,6 +409,30 @@ def test_changelog_hook_customize(
     changelog_hook_mock.assert_called_with(full_changelog, full_changelog)
 
 
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_changelog_is_kept_when_rendering_fails(
+    mocker: MockFixture, config: BaseConfig, util: UtilFixture
+):
+    def changelog_release_hook(release: dict, tag: git.GitTag | None) -> dict:
+        # The newest release is already rendered by then
+        if release["version"] == "0.1.0":
+            raise RuntimeError("release hook failed")
+        return release
+
+    for i in range(2):
+        util.create_file_and_commit(f"feat: feature {i}")
+        util.create_tag(f"0.{i + 1}.0")
+    changelog_path = Path("CHANGELOG.md")
+    changelog_path.write_text("# Existing changelog\n")
+
+    changelog = Changelog(config, {"unreleased_version": None})
+    mocker.patch.object(changelog.cz, "changelog_release_hook", changelog_release_hook)
+    with pytest.raises(RuntimeError):
+        changelog()
+
+    assert changelog_path.read_text() == "# Existing changelog\n"
+
+
 @pytest.mark.usefixtures("tmp_commitizen_project")
 def test_changelog_release_hook(
     mocker: MockFixture, config: BaseConfig, util: UtilFixture
@@ -435,6 +576,25 @@ def test_changelog_incremental_newline_separates_new_content_from_old(
     )
 
 
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_changelog_incremental_keeps_line_endings_consistent(
+    changelog_path: str, util: UtilFixture
+):
+    with open(changelog_path, "wb") as f:
+        f.write(b"## 0.1.0 (2022-01-01)\r\n\r\n### Feat\r\n\r\n- initial\r\n")
+    util.create_file_and_commit("feat: initial")
+    util.create_tag("0.1.0")
+    util.create_file_and_commit("feat: add more cat videos")
+
+    util.run_cli("changelog", "--incremental")
+
+    with open(changelog_path, "rb") as f:
+        out = f.read()
+    eol = git.EOLType.for_open().encode()
+    assert out.count(eol) == out.count(b"\n")
+    assert out.endswith(b"- initial" + eol)
+
+
 def test_changelog_without_revision(tmp_commitizen_project, util: UtilFixture):
     changelog_file = tmp_commitizen_project.join("CHANGELOG.md")
     changelog_file.write(
@@ -1163,7 +1323,7 @@ def test_empty_commit_list(mocker: MockFixture, util: UtilFixture):
     util.create_file_and_commit("feat: a new world")
 
     # test changelog properly handles when no commits are found for the revision
-    mocker.patch("commitizen.git.get_commits", return_value=[])
+    mocker.patch("commitizen.git.iter_commits", return_value=iter([]))
     with pytest.raises(NoCommitsFoundError):
         util.run_cli("changelog")
 
@@ -1217,7 +1377,7 @@ def test_changelog_prerelease_rev_with_use_scheme_semver(
 
 @pytest.mark.usefixtures("tmp_commitizen_project")
 def test_changelog_uses_version_tags_for_header(
-    mocker: MockFixture, config: BaseConfig, util: UtilFixture
+    capsys: pytest.CaptureFixture, config: BaseConfig, util: UtilFixture
 ):
     """Tests that changelog headers always use version tags even if there are non-version tags
 
@@ -1229,8 +1389,6 @@ def test_changelog_uses_version_tags_for_header(
     util.create_tag("1.0.0")
     util.create_tag("also-not-a-version")
 
-    write_patch = mocker.patch("commitizen.commands.changelog.out.write")
-
     changelog = Changelog(
         config, {"dry_run": True, "incremental": True, "unreleased_version": None}
     )
@@ -1238,7 +1396,7 @@ def test_changelog_uses_version_tags_for_header(
     with pytest.raises(DryRunExit):
         changelog()
 
-    changelog_output = write_patch.call_args[0][0]
+    changelog_output = capsys.readouterr().out
 
     assert changelog_output.startswith("## 1.0.0")
     assert "0-no-a-version" not in changelog_output
@@ -1248,7 +1406,7 @@ def test_changelog_uses_version_tags_for_header(
 @pytest.mark.usefixtures("tmp_commitizen_project")
 @pytest.mark.freeze_time("2022-02-13")
 def test_changelog_from_current_version_tag_with_nonversion_tag(
-    mocker: MockFixture, config: BaseConfig, util: UtilFixture
+    capsys: pytest.CaptureFixture, config: BaseConfig, util: UtilFixture
 ):
     """Tests that changelog generation for a single version works even if
     there is a non-version tag in the list of tags
@@ -1268,8 +1426,6 @@ def test_changelog_from_current_version_tag_with_nonversion_tag(
     util.create_file_and_commit("bump: version 1.0.0 → 2.0.0")
     util.create_tag("2.0.0")
 
-    write_patch = mocker.patch("commitizen.commands.changelog.out.write")
-
     changelog = Changelog(
         config,
         {
@@ -1289,7 +1445,7 @@ def test_changelog_from_current_version_tag_with_nonversion_tag(
 - commit 2\n\
 - commit 1\n"
 
-    write_patch.assert_called_with(full_changelog)
+    assert capsys.readouterr().out == f"{full_changelog}\n"
 
 
 @pytest.mark.parametrize(
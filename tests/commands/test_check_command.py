@@ -23,6 +23,7 @@ if TYPE_CHECKING:
 
     from pytest_mock import MockFixture
 
+    from commitizen.commands.check import CheckArgs
     from commitizen.question import CzQuestion
 
 COMMIT_LOG = [
@@ -195,7 +196,7 @@ def test_check_command_when_commit_file_not_found(config):
 def test_check_a_range_of_git_commits(config, mocker: MockFixture):
     success_mock = mocker.patch("commitizen.out.success")
     mocker.patch(
-        "commitizen.git.get_commits", return_value=_build_fake_git_commits(COMMIT_LOG)
+        "commitizen.git.iter_commits", return_value=_build_fake_git_commits(COMMIT_LOG)
     )
 
     check_cmd = commands.Check(
@@ -209,7 +210,7 @@ def test_check_a_range_of_git_commits(config, mocker: MockFixture):
 def test_check_a_range_of_git_commits_and_failed(config, mocker: MockFixture):
     error_mock = mocker.patch("commitizen.out.error")
     mocker.patch(
-        "commitizen.git.get_commits",
+        "commitizen.git.iter_commits",
         return_value=_build_fake_git_commits(["This commit does not follow rule"]),
     )
     check_cmd = commands.Check(
@@ -252,7 +253,7 @@ def test_check_a_range_of_failed_git_commits(config, mocker: MockFixture):
         ("Third commit does not follow rule\nIll-formatted commit with body"),
     ]
     mocker.patch(
-        "commitizen.git.get_commits",
+        "commitizen.git.iter_commits",
         return_value=_build_fake_git_commits(ill_formated_commits_msgs),
     )
     check_cmd = commands.Check(
@@ -642,3 +643,79 @@ def test_check_command_with_custom_validator_failed(mocker: MockFixture):
         "Pattern validation unexpectedly passed"
     )
     assert "pattern: " in str(excinfo.value), "Pattern not found in error message"
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project", "commit_cache")
+def test_check_command_caches_verdicts(config, mocker: MockFixture):
+    create_file_and_commit("feat: initial")
+    create_file_and_commit("fix: some fix")
+    create_file_and_commit("this is not a conventional commit")
+    validate = mocker.spy(BaseCommitizen, "validate_commit_message")
+
+    def check(allowed_prefixes: list[str] | None = None) -> None:
+        arguments: CheckArgs = {"rev_range": "HEAD"}
+        if allowed_prefixes is not None:
+            arguments["allowed_prefixes"] = allowed_prefixes
+        with pytest.raises(InvalidCommitMessageError) as excinfo:
+            commands.Check(config=config, arguments=arguments)()
+        assert "this is not a conventional commit" in str(excinfo.value)
+
+    check()
+    assert validate.call_count == 3
+
+    # Known valid commits are not validated again, invalid ones are for their errors
+    create_file_and_commit("docs: some docs")
+    check()
+    assert validate.call_count == 5
+
+    # Unless the rules changed
+    check(allowed_prefixes=["Merge"])
+    assert validate.call_count == 9
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project", "commit_cache")
+def test_check_command_caches_verdicts_with_any_errors(config, mocker: MockFixture):
+    class Error:
+        def __str__(self) -> str:
+            return "not a JSON value"
+
+    create_file_and_commit("feat: initial")
+    mocker.patch.object(
+        BaseCommitizen,
+        "validate_commit_message",
+        return_value=ValidationResult(False, [Error()]),
+    )
+    mocker.patch.object(
+        BaseCommitizen,
+        "format_exception_message",
+        lambda self, invalid_commits: "; ".join(
+            str(error) for _, errors in invalid_commits for error in errors
+        ),
+    )
+    arguments: CheckArgs = {"rev_range": "HEAD"}
+
+    for _ in range(2):
+        with pytest.raises(InvalidCommitMessageError, match="not a JSON value"):
+            commands.Check(config=config, arguments=arguments)()
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project", "commit_cache")
+def test_check_command_validates_again_after_an_upgrade(config, mocker: MockFixture):
+    create_file_and_commit("feat: initial")
+    validate = mocker.spy(BaseCommitizen, "validate_commit_message")
+    arguments: CheckArgs = {"rev_range": "HEAD"}
+
+    commands.Check(config=config, arguments=arguments)()
+    commands.Check(config=config, arguments=arguments)()
+    assert validate.call_count == 1
+
+    mocker.patch("commitizen.commands.check.__version__", "999.0.0")
+    commands.Check(config=config, arguments=arguments)()
+    assert validate.call_count == 2
+
+    mocker.patch(
+        "commitizen.commands.check._distributions_version",
+        return_value=["cz-plugin==2.0.0"],
+    )
+    commands.Check(config=config, arguments=arguments)()
+    assert validate.call_count == 3
@@ -9,7 +9,8 @@ from typing import TYPE_CHECKING, cast
 
 import pytest
 
-from commitizen import cmd, defaults
+from commitizen import changelog, cmd, defaults
+from commitizen.cache import CommitCache, FileIndexCache
 from commitizen.changelog_formats import (
     ChangelogFormat,
     get_changelog_format,
@@ -54,6 +55,26 @@ def data_dir(repo_root: Path) -> Path:
     return repo_root / "tests" / "data"
 
 
+@pytest.fixture
+def commit_cache() -> None:
+    """Opt in to the persistent caches (commits, templates, file indexes), disabled by default in tests"""
+
+
+@pytest.fixture(autouse=True)
+def _disable_commit_cache(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Fake commits often share their SHA, results would leak from one to another
+    if "commit_cache" not in request.fixturenames:
+        monkeypatch.setattr(
+            CommitCache, "for_repository", classmethod(lambda cls, *args: None)
+        )
+        monkeypatch.setattr(changelog, "_get_bytecode_cache", lambda: None)
+        monkeypatch.setattr(
+            FileIndexCache, "for_repository", classmethod(lambda cls, *args: None)
+        )
+
+
 @pytest.fixture(scope="session")
 def set_default_gitconfig() -> dict[str, str]:
     return {
@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from commitizen import bump, changelog, cmd, git
+from commitizen.cache import (
+    MISSING,
+    CommitCache,
+    FileIndexCache,
+    NotesCache,
+    get_commit_cache,
+)
+from commitizen.classifier import CommitClassifier
+from commitizen.cz.conventional_commits import ConventionalCommitsCz
+from commitizen.git import GitCommit, GitTag
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pytest_mock import MockFixture
+
+    from tests.utils import UtilFixture
+
+REV = "141ee441c9c9da0809c554103a558eb17c30ed17"
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> CommitCache:
+    return CommitCache(tmp_path / "commitizen" / "commits")
+
+
+def test_commit_cache_roundtrip(cache: CommitCache):
+    rules = cache.rules_key("test", "pattern")
+
+    assert cache.get(rules, REV) is MISSING
+    cache.set(rules, REV, [{"change_type": "feat", "message": None}])
+    cache.set(rules, "0" * 40, None)
+    assert cache.get(rules, REV) == [{"change_type": "feat", "message": None}]
+    assert not cache.path.exists()
+
+    cache.flush()
+
+    reloaded = CommitCache(cache.path)
+    assert reloaded.get(rules, REV) == [{"change_type": "feat", "message": None}]
+    assert reloaded.get(rules, "0" * 40) is None
+    assert reloaded.get(cache.rules_key("test", "other pattern"), REV) is MISSING
+
+
+def test_commit_cache_skips_values_not_json_serializable(cache: CommitCache):
+    rules = cache.rules_key("test")
+
+    cache.set(rules, REV, [object()])
+    cache.flush()
+
+    assert cache.get(rules, REV) is MISSING
+    assert not cache.path.exists()
+
+
+def test_commit_cache_is_append_only(cache: CommitCache):
+    rules = cache.rules_key("test")
+    cache.set(rules, REV, "MINOR")
+    cache.flush()
+    cache.set(rules, REV, "MINOR")
+    cache.flush()
+    cache.set(rules, "0" * 40, "PATCH")
+    cache.flush()
+
+    assert len(cache.path.read_text().splitlines()) == 2
+
+
+def test_commit_cache_evicts_least_recently_used_entries(tmp_path: Path):
+    path = tmp_path / "verdicts"
+    cache = CommitCache(path, max_entries=2)
+    rules = cache.rules_key("test")
+    for rev in "abc":
+        cache.set(rules, rev, rev)
+    cache.flush()
+
+    assert [cache.get(rules, rev) for rev in "abc"] == [MISSING, "b", "c"]
+
+    cache = CommitCache(path, max_entries=2)
+    assert cache.get(rules, "b") == "b"
+    cache.flush()
+    cache = CommitCache(path, max_entries=2)
+    cache.set(rules, "d", "d")
+    cache.flush()
+
+    assert [cache.get(rules, rev) for rev in "abcd"] == [MISSING, "b", MISSING, "d"]
+    reloaded = CommitCache(path, max_entries=2)
+    assert [reloaded.get(rules, rev) for rev in "abcd"] == [MISSING, "b", MISSING, "d"]
+
+
+def test_commit_cache_compacts_its_file(tmp_path: Path):
+    path = tmp_path / "verdicts"
+    rules = CommitCache.rules_key("test")
+    for _ in range(10):
+        cache = CommitCache(path, max_entries=3)
+        for rev in "abcde":
+            if cache.get(rules, rev) is MISSING:
+                cache.set(rules, rev, rev)
+        cache.flush()
+
+        assert len(path.read_text().splitlines()) <= 6
+    assert sum(cache.get(rules, rev) is not MISSING for rev in "abcde") == 3
+
+
+def test_commit_cache_ignores_damaged_entries(cache: CommitCache):
+    rules = cache.rules_key("test")
+    cache.path.parent.mkdir()
+    cache.path.write_text(
+        f'{rules}:{REV}\tnot json\n{rules}:{"0" * 40}\t"MINOR"\n{rules}:{"1" * 40}\t"MA'
+    )
+
+    assert cache.get(rules, REV) is MISSING
+    assert cache.get(rules, "0" * 40) == "MINOR"
+    assert cache.get(rules, "1" * 40) is MISSING
+
+
+def test_commit_cache_writes_entries_in_batches(
+    cache: CommitCache, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(CommitCache, "BATCH_SIZE", 2)
+    rules = cache.rules_key("test")
+    for rev in "abc":
+        cache.set(rules, rev, rev)
+
+    assert len(cache.path.read_text().splitlines()) == 2
+    assert cache._pending == {f"{rules}:c": '"c"'}
+    assert [cache.get(rules, rev) for rev in "abc"] == ["a", "b", "c"]
+
+
+def test_commit_cache_looks_entries_up_on_disk(cache: CommitCache):
+    rules = cache.rules_key("test")
+    for rev in range(100):
+        cache.set(rules, str(rev), rev)
+    cache.flush()
+    cache.set(rules, "7", "changed")
+    cache.flush()
+
+    reloaded = CommitCache(cache.path)
+    assert [reloaded.get(rules, str(rev)) for rev in (0, 7, 99)] == [0, "changed", 99]
+    assert reloaded.get(rules, "100") is MISSING
+    assert reloaded._index == {}
+    assert cache.path.with_name("commits.idx").exists()
+
+
+def test_commit_cache_indexes_entries_appended_by_others(cache: CommitCache):
+    rules = cache.rules_key("test")
+    cache.set(rules, "a", "a")
+    cache.flush()
+    other = CommitCache(cache.path)
+    other.set(rules, "b", "b")
+    other.flush()
+    with cache.path.open("a") as f:
+        f.write(f'{rules}:c\t"c"\n')
+
+    cache.set(rules, "d", "d")
+    cache.flush()
+
+    reloaded = CommitCache(cache.path)
+    assert [reloaded.get(rules, rev) for rev in "abcd"] == ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize(
+    "change_index",
+    (
+        pytest.param(Path.unlink, id="missing"),
+        pytest.param(lambda path: path.write_bytes(b"damaged"), id="damaged"),
+    ),
+)
+def test_commit_cache_rebuilds_its_index(
+    cache: CommitCache, change_index: Callable[[Path], None]
+):
+    rules = cache.rules_key("test")
+    cache.set(rules, REV, "MINOR")
+    cache.flush()
+
+    change_index(cache.path.with_name("commits.idx"))
+
+    assert CommitCache(cache.path).get(rules, REV) == "MINOR"
+
+
+def test_commit_cache_ignores_replaced_files(cache: CommitCache):
+    rules = cache.rules_key("test")
+    cache.set(rules, REV, "MINOR")
+    cache.set(rules, "0" * 40, "PATCH")
+    cache.flush()
+
+    cache.path.write_text(f'{rules}:{"1" * 40}\t"MAJOR"\n')
+
+    reloaded = CommitCache(cache.path)
+    assert reloaded.get(rules, REV) is MISSING
+    assert reloaded.get(rules, "1" * 40) == "MAJOR"
+
+
+def test_commit_cache_write_errors_are_ignored(tmp_path: Path):
+    (tmp_path / "commitizen").write_text("not a directory")
+    cache = CommitCache(tmp_path / "commitizen" / "commits")
+    rules = cache.rules_key("test")
+
+    cache.set(rules, REV, "MINOR")
+    cache.flush()
+
+    assert cache.get(rules, REV) is MISSING
+
+
+@pytest.mark.usefixtures("commit_cache")
+def test_commit_cache_for_repository(tmp_commitizen_project):
+    cache = CommitCache.for_repository()
+
+    assert cache is not None
+    assert cache.path == Path(tmp_commitizen_project, ".git", "commitizen", "commits")
+    assert CommitCache.for_repository() is cache
+    assert CommitCache.for_repository("other") is not cache
+
+
+def test_commit_cache_is_disabled_in_tests(tmp_commitizen_project):
+    assert CommitCache.for_repository() is None
+
+
+@pytest.mark.usefixtures("commit_cache")
+def test_get_commit_cache(tmp_commitizen_project):
+    local = get_commit_cache({"notes_cache": False})
+    shared = get_commit_cache({"notes_cache": True})
+
+    assert type(local) is CommitCache
+    assert type(shared) is NotesCache
+    assert shared.path == local.path
+    assert NotesCache.for_repository() is shared
+
+
+def test_commit_cache_for_repository_outside_git_project(tmpdir):
+    with tmpdir.as_cwd():
+        assert CommitCache.for_repository() is None
+
+
+def test_find_increment_uses_cache(cache: CommitCache, mocker: MockFixture):
+    commits = [GitCommit(REV, "feat: new feature"), GitCommit("0" * 40, "fix: a fix")]
+    args = (ConventionalCommitsCz.bump_pattern, ConventionalCommitsCz.bump_map)
+
+    assert bump.find_increment(commits, *args, cache=cache) == "MINOR"
+    search = mocker.spy(CommitClassifier, "classify")
+    # Commits are immutable: a known SHA is never matched again
+    commits[0].title = "refactor!: breaking change"
+
+    assert bump.find_increment(commits, *args, cache=cache) == "MINOR"
+    assert search.call_count == 0
+    assert bump.find_increment(commits, *args) == "MAJOR"
+
+
+def test_generate_tree_from_commits_uses_cache(cache: CommitCache, mocker: MockFixture):
+    commits = [
+        GitCommit(REV, "feat(cli): new command", "Closes #1\n\nfix: some fix"),
+        GitCommit("0" * 40, "docs: some docs"),
+    ]
+    args: tuple[list[GitTag], str, str] = (
+        [],
+        ConventionalCommitsCz.commit_parser,
+        ConventionalCommitsCz.changelog_pattern,
+    )
+    expected = list(changelog.generate_tree_from_commits(commits, *args))
+    parse = mocker.spy(CommitClassifier, "classify")
+
+    cold = list(changelog.generate_tree_from_commits(commits, *args, cache=cache))
+    warm = list(
+        changelog.generate_tree_from_commits(
+            commits, *args, cache=CommitCache(cache.path)
+        )
+    )
+
+    assert cold == warm == expected
+    assert parse.call_count == len(commits)
+
+
+def _run(command: str) -> str:
+    c = cmd.run(command)
+    assert c.return_code == 0, c.err
+    return c.out
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_notes_cache_publishes_entries_as_notes(tmp_path: Path, util: UtilFixture):
+    util.create_file_and_commit("feat: new feature")
+    util.create_file_and_commit("fix: a fix")
+    first, second = _run("git rev-list --reverse HEAD").split()
+    cache = NotesCache(tmp_path / "commits")
+    rules = cache.rules_key("test")
+
+    cache.set(rules, first, "MINOR")
+    cache.set(rules, second, "PATCH")
+    cache.flush()
+    assert _run(f"git notes --ref={NotesCache.REF} list") == ""
+
+    cache.publish()
+    cache.publish()
+
+    assert _run(f"git notes --ref={NotesCache.REF} show {first}") == (
+        f'{rules}\t"MINOR"\n'
+    )
+    assert _run(f"git log --format=%s {NotesCache.REF}") == (
+        "Update commitizen notes\n"
+    )
+
+    # Entries are added to the existing notes, in a new notes commit
+    other_rules = cache.rules_key("other")
+    cache.set(other_rules, first, None)
+    cache.publish("More notes")
+
+    assert _run(f"git notes --ref={NotesCache.REF} show {first}") == (
+        f'{rules}\t"MINOR"\n{other_rules}\tnull\n'
+    )
+    assert _run(f"git log --format=%s {NotesCache.REF}").splitlines() == [
+        "More notes",
+        "Update commitizen notes",
+    ]
+    without_local_file = NotesCache(tmp_path / "missing")
+    assert without_local_file.get(rules, first) == "MINOR"
+    assert without_local_file.get(other_rules, first) is None
+    assert without_local_file.get(rules, second) == "PATCH"
+    assert CommitCache(tmp_path / "missing").get(rules, first) is MISSING
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_notes_cache_publishes_local_entries(tmp_path: Path, util: UtilFixture):
+    util.create_file_and_commit("feat: new feature")
+    rev = _run("git rev-parse HEAD").strip()
+    local = CommitCache(tmp_path / "commits")
+    rules = local.rules_key("test")
+    local.set(rules, rev, "MINOR")
+    local.flush()
+
+    cache = NotesCache(tmp_path / "commits")
+    assert cache.get(rules, rev) == "MINOR"
+    cache.publish()
+
+    assert _run(f"git notes --ref={NotesCache.REF} show {rev}") == (
+        f'{rules}\t"MINOR"\n'
+    )
+
+
+def test_notes_cache_travels_with_the_notes_ref(
+    tmp_path: Path, util: UtilFixture, mocker: MockFixture
+):
+    commits_args = (ConventionalCommitsCz.bump_pattern, ConventionalCommitsCz.bump_map)
+    remote = tmp_path / "remote.git"
+    _run(f'git init --bare "{remote}"')
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path)
+        _run(f'git clone -q "{remote}" origin')
+        mp.chdir(tmp_path / "origin")
+        util.create_file_and_commit("feat: new feature")
+        util.create_file_and_commit("fix: a fix")
+        commits = git.get_commits()
+        cache = NotesCache(tmp_path / "origin-cache")
+        assert bump.find_increment(commits, *commits_args, cache=cache) == "MINOR"
+        cache.publish()
+        _run(f"git push -q origin HEAD {NotesCache.REF}")
+
+        # A fresh clone, without any local cache, only has to fetch the notes
+        mp.chdir(tmp_path)
+        _run(f'git clone -q "{remote}" clone')
+        mp.chdir(tmp_path / "clone")
+        _run(f"git fetch -q origin {NotesCache.REF}:{NotesCache.REF}")
+        search = mocker.spy(CommitClassifier, "classify")
+        cache = NotesCache(tmp_path / "clone-cache")
+
+        assert bump.find_increment(git.get_commits(), *commits_args, cache=cache) == (
+            "MINOR"
+        )
+        assert search.call_count == 0
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_notes_cache_publish_errors_are_ignored(tmp_path: Path, util: UtilFixture):
+    util.create_file_and_commit("feat: new feature")
+    rev = _run("git rev-parse HEAD").strip()
+    cache = NotesCache(tmp_path / "commits")
+    rules = cache.rules_key("test")
+    cache.set(rules, "0" * 40, "MINOR")
+    cache.set(rules, rev, "MINOR")
+
+    # A note can't be attached to an unknown object
+    cache.publish()
+
+    assert _run(f"git notes --ref={NotesCache.REF} list") == ""
+    assert cache.get(rules, rev) == "MINOR"
+
+
+def test_file_index_cache_is_kept_while_the_file_is_unchanged(tmp_path: Path):
+    indexed = tmp_path / "CHANGELOG.md"
+    indexed.write_text("# Changelog\n")
+    cache = FileIndexCache(tmp_path / "commitizen" / "files")
+    rules = cache.rules_key("test")
+    builds = []
+
+    def build():
+        builds.append(indexed.read_text())
+        return {"1.0.0": (0, 12)}
+
+    assert cache.get(rules, str(indexed), build) == {"1.0.0": (0, 12)}
+    assert cache.get(rules, str(indexed), build) == {"1.0.0": [0, 12]}
+    assert FileIndexCache(cache.path).get(rules, str(indexed), build) == {
+        "1.0.0": [0, 12]
+    }
+    assert len(builds) == 1
+    assert cache.get(cache.rules_key("other"), str(indexed), build)
+    assert len(builds) == 2
+
+
+def _change_mtime(path: Path) -> None:
+    path.write_text("# Changed\n")
+
+
+def _change_size_only(path: Path) -> None:
+    path.write_text("# Changelog\n\n")
+    os.utime(path, ns=(0, 0))
+
+
+@pytest.mark.parametrize(
+    "change",
+    (
+        pytest.param(_change_mtime, id="mtime"),
+        pytest.param(_change_size_only, id="size"),
+    ),
+)
+def test_file_index_cache_is_invalidated_when_the_file_changes(
+    tmp_path: Path, change: Callable[[Path], None]
+):
+    indexed = tmp_path / "CHANGELOG.md"
+    indexed.write_text("# Changelog\n")
+    os.utime(indexed, ns=(0, 0))
+    cache = FileIndexCache(tmp_path / "files")
+    rules = cache.rules_key("test")
+    cache.get(rules, str(indexed), lambda: "old")
+
+    change(indexed)
+
+    assert cache.get(rules, str(indexed), lambda: "new") == "new"
+    assert cache.get(rules, str(indexed), lambda: "newer") == "new"
+
+
+def test_file_index_cache_errors_are_ignored(tmp_path: Path):
+    indexed = tmp_path / "CHANGELOG.md"
+    indexed.write_text("# Changelog\n")
+    (tmp_path / "commitizen").write_text("not a directory")
+    cache = FileIndexCache(tmp_path / "commitizen" / "files")
+    rules = cache.rules_key("test")
+
+    assert cache.get(rules, str(indexed), lambda: "index") == "index"
+    assert cache.get(rules, str(tmp_path / "missing"), lambda: "none") == "none"
+
+
+@pytest.mark.usefixtures("commit_cache")
+def test_file_index_cache_for_repository(tmp_commitizen_project):
+    cache = FileIndexCache.for_repository()
+
+    assert cache is not None
+    assert cache.path == Path(tmp_commitizen_project, ".git", "commitizen", "files")
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import re
 from dataclasses import dataclass
+from fnmatch import fnmatchcase
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from unittest.mock import Mock
@@ -11,15 +12,20 @@ import pytest
 from jinja2 import FileSystemLoader
 
 from commitizen import changelog, git
+from commitizen.cache import CommitCache
+from commitizen.classifier import CommitClassifier
 from commitizen.commands.changelog import Changelog
 from commitizen.config import BaseConfig
 from commitizen.cz.conventional_commits.conventional_commits import (
     ConventionalCommitsCz,
 )
 from commitizen.exceptions import InvalidConfigurationError
+from commitizen.tags import TagIndex
 from commitizen.version_schemes import Pep440
 
 if TYPE_CHECKING:
+    from pytest_mock import MockFixture
+
     from commitizen.changelog_formats import ChangelogFormat
 
 COMMITS_DATA: list[dict[str, Any]] = [
@@ -1198,6 +1204,32 @@ def test_generate_tree_from_commits_with_no_commits(tags):
     assert tuple(tree) == ({"changes": {}, "date": "", "version": "Unreleased"},)
 
 
+def test_generate_tree_from_commits_consumes_an_iterator_lazily(gitcommits, tags):
+    parser = ConventionalCommitsCz.commit_parser
+    changelog_pattern = ConventionalCommitsCz.changelog_pattern
+    consumed: list[git.GitCommit] = []
+
+    def stream():
+        for commit in gitcommits:
+            consumed.append(commit)
+            yield commit
+
+    tree = changelog.generate_tree_from_commits(
+        stream(), tags, parser, changelog_pattern
+    )
+    first_release = next(tree)
+
+    # The release is complete once the first commit of the next one is read
+    assert first_release["version"] == "v1.2.0"
+    assert len(consumed) < len(gitcommits)
+    assert [first_release, *tree] == list(
+        changelog.generate_tree_from_commits(
+            gitcommits, tags, parser, changelog_pattern
+        )
+    )
+    assert consumed == gitcommits
+
+
 @pytest.mark.parametrize(
     "change_type_order, expected_reordering",
     (
@@ -1255,6 +1287,150 @@ def test_render_changelog(
     assert result == changelog_content
 
 
+def test_stream_changelog(gitcommits, tags, any_changelog_format: ChangelogFormat):
+    parser = ConventionalCommitsCz.commit_parser
+    changelog_pattern = ConventionalCommitsCz.changelog_pattern
+    loader = ConventionalCommitsCz.template_loader
+    template = any_changelog_format.template
+
+    chunks = list(
+        changelog.stream_changelog(
+            changelog.generate_tree_from_commits(
+                gitcommits, tags, parser, changelog_pattern
+            ),
+            loader,
+            template,
+        )
+    )
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == changelog.render_changelog(
+        changelog.generate_tree_from_commits(
+            gitcommits, tags, parser, changelog_pattern
+        ),
+        loader,
+        template,
+    ).lstrip("\n")
+
+
+def _render_with_release_cache(
+    tree: list[dict[str, Any]], template: str, cache: CommitCache, **kwargs: Any
+) -> str:
+    return "".join(
+        changelog.stream_changelog(
+            tree, ConventionalCommitsCz.template_loader, template, cache, **kwargs
+        )
+    )
+
+
+def test_stream_changelog_caches_released_sections(
+    gitcommits, tags, changelog_format: ChangelogFormat, tmp_path: Path
+):
+    tree = list(
+        changelog.generate_tree_from_commits(
+            gitcommits,
+            tags,
+            ConventionalCommitsCz.commit_parser,
+            ConventionalCommitsCz.changelog_pattern,
+        )
+    )
+    template = changelog_format.template
+    expected = changelog.render_changelog(
+        tree, ConventionalCommitsCz.template_loader, template
+    ).lstrip("\n")
+    path = tmp_path / "releases"
+
+    assert _render_with_release_cache(tree, template, CommitCache(path)) == expected
+    # The first release is always rendered, the others are cached
+    lines = path.read_text().splitlines()
+    assert len(lines) == len(tree) - 1
+    path.write_text("".join(f'{line.split()[0]}\t"<cached>\\n"\n' for line in lines))
+
+    rendered = _render_with_release_cache(tree, template, CommitCache(path))
+
+    assert rendered == _render_with_release_cache(
+        tree[:1], template, CommitCache(tmp_path / "other")
+    ) + "<cached>\n" * (len(tree) - 1)
+
+
+def test_stream_changelog_renders_changed_releases_again(
+    gitcommits, tags, any_changelog_format: ChangelogFormat, tmp_path: Path
+):
+    tree = list(
+        changelog.generate_tree_from_commits(
+            gitcommits,
+            tags,
+            ConventionalCommitsCz.commit_parser,
+            ConventionalCommitsCz.changelog_pattern,
+        )
+    )
+    template = any_changelog_format.template
+    cache = CommitCache(tmp_path / "releases")
+    _render_with_release_cache(tree, template, cache)
+
+    changes = next(iter(tree[-1]["changes"].values()))
+    changes[0] = {**changes[0], "message": "edited message"}
+
+    for kwargs in ({}, {"key": "value"}):
+        assert _render_with_release_cache(
+            tree, template, cache, **kwargs
+        ) == changelog.render_changelog(
+            tree, ConventionalCommitsCz.template_loader, template
+        ).lstrip("\n")
+    assert "edited message" in _render_with_release_cache(tree, template, cache)
+
+
+def test_stream_changelog_does_not_cache_what_is_not_plain_json(
+    gitcommits, tags, changelog_format: ChangelogFormat, tmp_path: Path
+):
+    tree = list(
+        changelog.generate_tree_from_commits(
+            gitcommits,
+            tags,
+            ConventionalCommitsCz.commit_parser,
+            ConventionalCommitsCz.changelog_pattern,
+        )
+    )
+    template = changelog_format.template
+    path = tmp_path / "releases"
+
+    # Their repr, hence a digest, would change from one run to the next
+    _render_with_release_cache(tree, template, CommitCache(path), extra=object())
+    assert not path.exists()
+
+    tree[-1] = {**tree[-1], "extra": object()}
+    _render_with_release_cache(tree, template, CommitCache(path))
+    assert len(path.read_text().splitlines()) == len(tree) - 2
+
+
+@pytest.mark.parametrize(
+    "source",
+    (
+        pytest.param(
+            "{% for entry in tree %}{{ entry.version }}{% endfor %}", id="no-block"
+        ),
+        pytest.param(
+            "{% for entry in tree %}{% block release scoped %}{% include entry.version %}"
+            "{% endblock %}{% endfor %}",
+            id="dynamic-include",
+        ),
+    ),
+)
+def test_stream_changelog_without_cacheable_releases(tmp_path: Path, source: str):
+    (tmp_path / "tpl.j2").write_text(source)
+    (tmp_path / "1.0.0").write_text("one")
+    (tmp_path / "0.1.0").write_text("zero")
+    tree = [{"version": "1.0.0"}, {"version": "0.1.0"}]
+    cache = CommitCache(tmp_path / "releases")
+
+    chunks = changelog.stream_changelog(
+        tree, FileSystemLoader(tmp_path), "tpl.j2", cache
+    )
+
+    assert "".join(chunks) in ("1.0.00.1.0", "onezero")
+    assert not cache.path.exists()
+
+
 def test_render_changelog_from_default_plugin_values(
     gitcommits, tags, changelog_content, any_changelog_format: ChangelogFormat
 ):
@@ -1269,6 +1445,99 @@ def test_render_changelog_from_default_plugin_values(
     assert result == changelog_content
 
 
+def _link_and_split_hook(message: dict, commit: git.GitCommit) -> list[dict] | None:
+    if message["message"].startswith("add"):
+        return None
+    return [
+        {**message, "message": f"{message['message']} ({commit.rev[:7]})"},
+        {**message, "change_type": "Linked", "message": commit.rev},
+    ]
+
+
+@pytest.mark.parametrize(
+    "hook",
+    (
+        pytest.param(None, id="no-hook"),
+        pytest.param(_link_and_split_hook, id="hook"),
+    ),
+)
+def test_render_changelog_in_workers_is_identical(
+    gitcommits, tags, mocker: MockFixture, hook
+):
+    mocker.patch.object(changelog, "_MIN_COMMITS_PER_CHUNK", 2)
+    pool = mocker.spy(changelog, "ProcessPoolExecutor")
+
+    def render(jobs: int) -> str:
+        tree = changelog.generate_tree_from_commits(
+            gitcommits,
+            tags,
+            ConventionalCommitsCz.commit_parser,
+            ConventionalCommitsCz.changelog_pattern,
+            change_type_map={"feat": "Feat"},
+            changelog_message_builder_hook=hook,
+            jobs=jobs,
+        )
+        return changelog.render_changelog(
+            tree, ConventionalCommitsCz.template_loader, "CHANGELOG.md.j2"
+        )
+
+    serial = render(1)
+
+    assert render(3) == serial
+    assert pool.call_count == 1
+    assert pool.call_args.kwargs["max_workers"] == 3
+
+
+def test_generate_tree_in_workers_with_unpicklable_hook(
+    gitcommits, tags, mocker: MockFixture, capsys
+):
+    mocker.patch.object(changelog, "_MIN_COMMITS_PER_CHUNK", 2)
+    pool = mocker.spy(changelog, "ProcessPoolExecutor")
+
+    def tree(jobs: int) -> list[dict[str, Any]]:
+        return list(
+            changelog.generate_tree_from_commits(
+                gitcommits,
+                tags,
+                ConventionalCommitsCz.commit_parser,
+                ConventionalCommitsCz.changelog_pattern,
+                changelog_message_builder_hook=lambda message, commit: message,
+                jobs=jobs,
+            )
+        )
+
+    serial = tree(1)
+
+    assert tree(2) == serial
+    assert pool.call_count == 0
+    assert "parsed serially" in capsys.readouterr().err
+
+
+def test_generate_tree_in_workers_remembers_the_records(
+    gitcommits, tags, mocker: MockFixture, tmp_path: Path
+):
+    mocker.patch.object(changelog, "_MIN_COMMITS_PER_CHUNK", 2)
+    parser = ConventionalCommitsCz.commit_parser
+    changelog_pattern = ConventionalCommitsCz.changelog_pattern
+    classifier = CommitClassifier(
+        commit_parser=parser, changelog_pattern=changelog_pattern
+    )
+    expected = list(classifier.iter_records(gitcommits))
+    cache = CommitCache(tmp_path / "commits")
+
+    list(
+        changelog.generate_tree_from_commits(
+            gitcommits, tags, parser, changelog_pattern, cache=cache, jobs=2
+        )
+    )
+    classify = mocker.spy(classifier, "classify")
+
+    assert list(classifier.iter_records(gitcommits, CommitCache(cache.path))) == (
+        expected
+    )
+    assert classify.call_count == 0
+
+
 def test_render_changelog_override_loader(gitcommits, tags, tmp_path: Path):
     loader = FileSystemLoader(tmp_path)
     template = "tpl.j2"
@@ -1331,6 +1600,46 @@ def test_render_changelog_override_loader_and_template(
     assert result == tpl
 
 
+def test_get_changelog_template_is_compiled_once(chdir: Path, mocker: MockFixture):
+    loader = FileSystemLoader(chdir / "loader")
+    (chdir / "loader").mkdir()
+    (chdir / "loader" / "tpl.j2").write_text("from the loader")
+    compile = mocker.spy(changelog.Environment, "compile")
+
+    first = changelog.get_changelog_template(loader, "tpl.j2")
+    again = changelog.get_changelog_template(loader, "tpl.j2")
+
+    assert again is first
+    assert compile.call_count == 1
+
+    # A template overriding it from the current directory is still picked up
+    (chdir / "tpl.j2").write_text("from the current directory")
+    assert changelog.get_changelog_template(loader, "tpl.j2").render() == (
+        "from the current directory"
+    )
+    (chdir / "tpl.j2").unlink()
+    assert changelog.get_changelog_template(loader, "tpl.j2").render() == (
+        "from the loader"
+    )
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project", "commit_cache")
+def test_get_changelog_template_reuses_the_bytecode(mocker: MockFixture):
+    loader = ConventionalCommitsCz.template_loader
+    expected = changelog.get_changelog_template(loader, "CHANGELOG.md.j2").render(
+        tree=[]
+    )
+    # As a new invocation would
+    mocker.patch.object(changelog, "_environments", {})
+    compile = mocker.spy(changelog.Environment, "compile")
+
+    template = changelog.get_changelog_template(loader, "CHANGELOG.md.j2")
+
+    assert template.render(tree=[]) == expected
+    assert compile.call_count == 0
+    assert any(Path(".git", "commitizen", "templates").iterdir())
+
+
 def test_render_changelog_support_arbitrary_kwargs(gitcommits, tags, tmp_path: Path):
     loader = FileSystemLoader(tmp_path)
     tpl_name = "tpl.j2"
@@ -1537,7 +1846,10 @@ def test_get_smart_tag_range_returns_an_extra_for_a_single_tag(tags):
     assert 2 == len(res)
 
 
-def test_get_next_tag_name_after_version(tags):
+@pytest.mark.parametrize("indexed", [False, True])
+def test_get_next_tag_name_after_version(tags, indexed):
+    if indexed:
+        tags = TagIndex(tags)
     # Test finding next tag after a version
     next_tag_name = changelog.get_next_tag_name_after_version(tags, "v1.2.0")
     assert next_tag_name == "v1.1.1"
@@ -1657,6 +1969,102 @@ def test_tags_rules_get_version_tags(capsys: pytest.CaptureFixture):
     assert captured.err.count("not-a-version") == 2
 
 
+@pytest.mark.parametrize(
+    "tag_format, legacy_tag_formats, expected",
+    [
+        ("$version", [], []),
+        ("v$version", [], ["v*"]),
+        ("v${version}", ["ver$version", "api-v$major.$minor"], ["api-v*", "v*"]),
+        ("v$version", ["$version"], []),
+        ("pkg.v$version", ["pkg[-_]$version"], ["pkg*"]),
+        ("v?$version", [], []),
+        ("pkg-v?$version", [], ["pkg-*"]),
+        ("pkg-v{0,1}$version", ["pkg-v*$version"], ["pkg-*"]),
+    ],
+)
+def test_tag_rules_tag_patterns(
+    tag_format: str, legacy_tag_formats: list[str], expected: list[str]
+):
+    rules = changelog.TagRules(
+        scheme=Pep440, tag_format=tag_format, legacy_tag_formats=legacy_tag_formats
+    )
+    assert rules.tag_patterns == expected
+
+
+def test_tag_rules_tag_patterns_match_every_version_tag():
+    rules = changelog.TagRules(
+        scheme=Pep440,
+        tag_format="api-v$version",
+        legacy_tag_formats=["api-$major.$minor.$patch", "api.$version"],
+    )
+    for name in ("api-v1.0.0", "api-1.0.0", "api.1.0.0", "api_1.0.0"):
+        assert rules.is_version_tag(name)
+        assert any(fnmatchcase(name, pattern) for pattern in rules.tag_patterns)
+    assert not any(fnmatchcase("web-v1.0.0", p) for p in rules.tag_patterns)
+
+
+def test_tag_rules_tag_patterns_with_an_optional_prefix():
+    rules = changelog.TagRules(scheme=Pep440, tag_format="api-v?$version")
+    for name in ("api-v1.0.0", "api-1.0.0"):
+        assert rules.is_version_tag(name)
+        assert any(fnmatchcase(name, pattern) for pattern in rules.tag_patterns)
+
+
+def test_tag_index(tags):
+    index = TagIndex(tags, changelog.TagRules(scheme=Pep440, tag_format="v$version"))
+
+    assert list(index) == tags
+    assert len(index) == len(tags)
+    assert index[0] == tags[0]
+    assert tags[3] in index
+    assert git.GitTag("v1.2.0", "0" * 40, "2019-04-19") not in index
+    assert index.get("v1.1.0") == tags[2]
+    assert index.get("v2.0.0") is None
+    assert index.for_rev(tags[2].rev) == [tags[2]]
+    assert index.for_rev("0" * 40) == []
+    assert index.next_name("v1.2.0") == "v1.1.1"
+    assert index.next_name("v0.9.1") is None
+    with pytest.raises(KeyError):
+        index.next_name("v2.0.0")
+    # `1.0.0b2` does not match the tag format
+    assert index.for_version("1.0.0b2") == []
+    assert index.for_version("1.0.0b1") == [tags[5]]
+    assert index.versions[0] == Pep440("0.9.1")
+    assert index.versions[-1] == Pep440("1.2.0")
+    assert len(index.versions) == len(tags) - 1
+
+
+def test_tag_index_keeps_tag_order_for_a_rev():
+    rev = "141ee441c9c9da0809c554103a558eb17c30ed17"
+    tags = [
+        git.GitTag("v1.0.0", rev, "2019-04-19"),
+        git.GitTag("1.0.0", rev, "2019-04-19"),
+        git.GitTag("v0.9.0", "aa44a92d68014d0da98965c0c2cb8c07957d4362", "2019-03-01"),
+    ]
+    rules = changelog.TagRules(
+        scheme=Pep440, tag_format="v$version", legacy_tag_formats=["$version"]
+    )
+    index = TagIndex(tags, rules)
+
+    assert index.for_rev(rev) == tags[:2]
+    assert changelog.get_commit_tag(git.GitCommit(rev, "feat: x"), index) == tags[0]
+    assert index.for_version("1.0.0") == tags[:2]
+    with pytest.warns(UserWarning, match="Multiple tags found for version 1.0.0"):
+        assert rules.find_tag_for(index, "1.0.0") == tags[0]
+    assert rules.find_tag_for(index, "0.9.0") == tags[2]
+    assert rules.find_tag_for(index, "2.0.0") is None
+
+
+def test_tag_index_of_reuses_an_index(tags):
+    rules = changelog.TagRules()
+    index = TagIndex(tags, rules)
+
+    assert TagIndex.of(index) is index
+    assert TagIndex.of(index, rules) is index
+    assert TagIndex.of(index, changelog.TagRules()) is not index
+    assert list(TagIndex.of(tags)) == tags
+
+
 @pytest.mark.usefixtures("in_repo_root")
 def test_changelog_file_name_from_args_and_config():
     mock_config = Mock(spec=BaseConfig)
@@ -209,3 +209,20 @@ def test_get_metadata_custom_tag_format(
     changelog.write_text(content)
 
     assert format_with_tags.get_metadata(str(changelog)).latest_version == expected
+
+
+def test_get_release_ranges(tmp_path: Path, format: Markdown):
+    releases = [
+        "## v1.1.0 (2024-01-01)\n\n### Feat\n\n- feature\n\n#### Details\n\n",
+        "## 1.0.1 (2023-06-01)\n\n- fix\n\n",
+        "## 1.0.0 (2023-01-01)\n\n- initial\n\n",
+    ]
+    content = "# Changelog\n\n## Unreleased\n\n" + "".join(releases) + "# Legacy\n"
+    changelog = tmp_path / format.default_changelog_file
+    changelog.write_text(content)
+
+    ranges = format.get_release_ranges(str(changelog))
+
+    assert {
+        version: content[start:end] for version, (start, end) in ranges.items()
+    } == dict(zip(("1.1.0", "1.0.1", "1.0.0"), releases))
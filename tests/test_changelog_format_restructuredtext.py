@@ -385,3 +385,20 @@ def test_get_metadata_custom_tag_format(
     changelog.write_text(content)
 
     assert format_with_tags.get_metadata(str(changelog)).latest_version == expected
+
+
+def test_get_metadata_reads_up_to_the_latest_version(format: RestructuredText):
+    lines = ["Unreleased\n", "==========\n", "\n", "1.0.0\n", "=====\n", "\n"]
+    lines += ["0.1.0\n", "=====\n"] * 100
+    read: list[str] = []
+
+    def readlines():
+        for line in lines:
+            read.append(line)
+            yield line
+
+    meta = format.get_metadata_from_file(readlines())
+
+    assert meta.latest_version == "1.0.0"
+    assert meta.latest_version_position == 3
+    assert len(read) <= meta.latest_version_position + 3
@@ -5,15 +5,23 @@ from typing import TYPE_CHECKING
 import pytest
 
 from commitizen import defaults
+from commitizen.changelog import Metadata
 from commitizen.changelog_formats import (
     KNOWN_CHANGELOG_FORMATS,
     ChangelogFormat,
     _guess_changelog_format,
     get_changelog_format,
 )
+from commitizen.changelog_formats.asciidoc import AsciiDoc
+from commitizen.changelog_formats.markdown import Markdown
+from commitizen.changelog_formats.textile import Textile
 from commitizen.exceptions import ChangelogFormatUnknown
 
 if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import IO, Any
+
+    from commitizen.changelog_formats.base import BaseFormat
     from commitizen.config.base_config import BaseConfig
 
 
@@ -61,3 +69,142 @@ def test_get_format_empty_filename_no_setting(config: BaseConfig, filename: str
 def test_get_format_unknown(config: BaseConfig, filename: str | None):
     with pytest.raises(ChangelogFormatUnknown):
         get_changelog_format(config, filename)
+
+
+SAMPLES = {
+    "markdown": "# Changelog\n\n## Unreleased\n\n- é\n\n## 1.0.0 (2024-01-01)\n\n- x\n",
+    "asciidoc": "= Changelog\n\n== Unreleased\n\n* é\n\n== 1.0.0 (2024-01-01)\n\n* x\n",
+    "textile": "h1. Changelog\n\nh2. Unreleased\n\n* é\n\nh2. 1.0.0 (2024-01-01)\n\n* x\n",
+    "restructuredtext": (
+        "Changelog\n=========\n\nUnreleased\n----------\n\n* é\n\n"
+        "1.0.0 (2024-01-01)\n------------------\n\n* x\n"
+    ),
+}
+
+
+@pytest.mark.parametrize("newline", ("\n", "\r\n"))
+@pytest.mark.parametrize("name", KNOWN_CHANGELOG_FORMATS.keys())
+def test_get_metadata_offsets(
+    config: BaseConfig, tmp_path: Path, name: str, newline: str
+):
+    format = KNOWN_CHANGELOG_FORMATS[name](config)
+    content = SAMPLES[name].replace("\n", newline).encode()
+    changelog = tmp_path / f"CHANGELOG.{format.extension}"
+    changelog.write_bytes(content)
+
+    meta = format.get_metadata(str(changelog))
+
+    lines = content.splitlines(keepends=True)
+    for index, offset in (
+        (meta.unreleased_start, meta.unreleased_start_offset),
+        (meta.unreleased_end, meta.unreleased_end_offset),
+        (meta.latest_version_position, meta.latest_version_offset),
+    ):
+        assert index is not None
+        assert offset == len(b"".join(lines[:index]))
+    assert meta.latest_version == "1.0.0"
+
+
+def test_get_metadata_without_offsets_for_other_encodings(
+    config: BaseConfig, tmp_path: Path
+):
+    config.settings["encoding"] = "utf-16"
+    format = KNOWN_CHANGELOG_FORMATS["markdown"](config)
+    changelog = tmp_path / "CHANGELOG.md"
+    changelog.write_text(SAMPLES["markdown"], encoding="utf-16")
+
+    meta = format.get_metadata(str(changelog))
+
+    assert meta.latest_version == "1.0.0"
+    assert meta.latest_version_position == 6
+    assert meta.latest_version_offset is None
+
+
+MAPPED_FORMATS: dict[str, type[BaseFormat]] = {
+    "markdown": Markdown,
+    "asciidoc": AsciiDoc,
+    "textile": Textile,
+}
+
+
+@pytest.mark.parametrize("newline", ("\n", "\r\n", "\r"))
+@pytest.mark.parametrize("name", MAPPED_FORMATS.keys())
+def test_get_metadata_from_mapped_file(
+    config: BaseConfig, tmp_path: Path, name: str, newline: str
+):
+    format = MAPPED_FORMATS[name](config)
+    lines = SAMPLES[name].splitlines(keepends=True)
+    # Without any version, the unreleased section ends with the file
+    content = "".join(line for line in lines if "1.0.0" not in line)
+    changelog = tmp_path / f"CHANGELOG.{format.extension}"
+    changelog.write_bytes(content.replace("\n", newline).encode())
+
+    meta = format.get_metadata(str(changelog))
+
+    with changelog.open(encoding="utf-8") as changelog_file:
+        assert meta == format.get_metadata_from_file(changelog_file)
+    assert meta.unreleased_start == 2
+    assert meta.unreleased_end == len(lines) - 2
+    assert meta.latest_version is None
+
+
+@pytest.mark.parametrize("indent", ("\xa0", "\u3000", "\x1f", " \u2003"))
+@pytest.mark.parametrize("name", MAPPED_FORMATS.keys())
+def test_get_metadata_from_mapped_file_strips_unicode_indentation(
+    config: BaseConfig, tmp_path: Path, name: str, indent: str
+):
+    format = MAPPED_FORMATS[name](config)
+    lines = SAMPLES[name].splitlines(keepends=True)
+    content = "".join(f"{indent}{line}" if "1.0.0" in line else line for line in lines)
+    changelog = tmp_path / f"CHANGELOG.{format.extension}"
+    changelog.write_text(content, encoding="utf-8")
+
+    meta = format.get_metadata(str(changelog))
+
+    with changelog.open(encoding="utf-8") as changelog_file:
+        assert meta == format.get_metadata_from_file(changelog_file)
+    assert meta.latest_version == "1.0.0"
+    assert meta.latest_version_offset == content.encode().index(indent.encode())
+
+
+def test_get_metadata_uses_overridden_get_metadata_from_file(
+    config: BaseConfig, tmp_path: Path
+):
+    class Custom(Markdown):
+        def get_metadata_from_file(self, file: IO[Any]) -> Metadata:
+            return Metadata(latest_version=file.readline().strip())
+
+    changelog = tmp_path / "CHANGELOG.md"
+    changelog.write_text("1.2.3\n## 1.0.0\n")
+
+    assert Custom(config).get_metadata(str(changelog)).latest_version == "1.2.3"
+
+
+@pytest.mark.parametrize("newline", ("\n", "\r\n"))
+@pytest.mark.parametrize("name", KNOWN_CHANGELOG_FORMATS.keys())
+def test_get_release_ranges(
+    config: BaseConfig, tmp_path: Path, name: str, newline: str
+):
+    format = KNOWN_CHANGELOG_FORMATS[name](config)
+    sample = SAMPLES[name]
+    release_start = sample.rindex("\n", 0, sample.index("1.0.0")) + 1
+    head, release = sample[:release_start], sample[release_start:]
+    new_release = release.replace("1.0.0", "2.0.0")
+    content = f"{head}{new_release}\n{release}".replace("\n", newline).encode()
+    changelog = tmp_path / f"CHANGELOG.{format.extension}"
+    changelog.write_bytes(content)
+
+    ranges = format.get_release_ranges(str(changelog))
+
+    assert {
+        version: content[start:end].decode() for version, (start, end) in ranges.items()
+    } == {
+        "2.0.0": f"{new_release}\n".replace("\n", newline),
+        "1.0.0": release.replace("\n", newline),
+    }
+
+
+def test_get_release_ranges_of_missing_file(config: BaseConfig, tmp_path: Path):
+    format = KNOWN_CHANGELOG_FORMATS["markdown"](config)
+
+    assert format.get_release_ranges(str(tmp_path / "CHANGELOG.md")) == {}
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from commitizen.cache import CommitCache
+from commitizen.classifier import CommitClassifier, CommitRecord, _IncrementResolver
+from commitizen.cz.conventional_commits import ConventionalCommitsCz
+from commitizen.git import GitCommit
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockFixture
+
+    from commitizen.config import BaseConfig
+
+
+@pytest.fixture
+def classifier(config: BaseConfig) -> CommitClassifier:
+    return CommitClassifier.from_cz(ConventionalCommitsCz(config))
+
+
+@pytest.mark.parametrize(
+    ("title", "body", "expected"),
+    (
+        pytest.param(
+            "feat(cli): new command",
+            "",
+            CommitRecord(
+                "MINOR",
+                "feat",
+                [
+                    {
+                        "change_type": "feat",
+                        "scope": "cli",
+                        "breaking": None,
+                        "message": "new command",
+                    }
+                ],
+            ),
+            id="feature",
+        ),
+        pytest.param(
+            "fix: a fix",
+            "Closes #1\n\nfeat!: breaking feature",
+            CommitRecord(
+                "MAJOR",
+                "fix",
+                [
+                    {
+                        "change_type": "fix",
+                        "scope": None,
+                        "breaking": None,
+                        "message": "a fix",
+                    },
+                    {
+                        "change_type": "feat",
+                        "scope": None,
+                        "breaking": "!",
+                        "message": "breaking feature",
+                    },
+                ],
+            ),
+            id="body-entries",
+        ),
+        pytest.param(
+            "docs: some docs",
+            "",
+            CommitRecord(None, None, []),
+            id="not-in-changelog",
+        ),
+        pytest.param(
+            "Merge branch 'main'",
+            "",
+            CommitRecord(None, None, []),
+            id="not-conventional",
+        ),
+    ),
+)
+def test_classify(classifier: CommitClassifier, title, body, expected):
+    assert classifier.classify(GitCommit("0" * 40, title, body)) == expected
+
+
+def test_classify_without_changelog_rules(config: BaseConfig):
+    cz = ConventionalCommitsCz(config)
+    classifier = CommitClassifier(bump_pattern=cz.bump_pattern, bump_map=cz.bump_map)
+
+    assert classifier.classify(GitCommit("0" * 40, "feat: new feature")) == (
+        CommitRecord("MINOR", None, [])
+    )
+
+
+def test_find_increment_with_major_version_zero(config: BaseConfig):
+    cz = ConventionalCommitsCz(config)
+    commits = [GitCommit("0" * 40, "feat!: breaking feature")]
+
+    assert CommitClassifier.from_cz(cz).find_increment(commits) == "MAJOR"
+    assert (
+        CommitClassifier.from_cz(cz, major_version_zero=True).find_increment(commits)
+        == "MINOR"
+    )
+
+
+def test_iter_records_memoizes_commit_objects(config: BaseConfig, mocker: MockFixture):
+    classifier = CommitClassifier.from_cz(ConventionalCommitsCz(config), memoize=True)
+    commits = [
+        GitCommit("0" * 40, "feat: new feature"),
+        GitCommit("0" * 40, "fix: fix"),
+    ]
+    classify = mocker.spy(classifier, "classify")
+
+    first = list(classifier.iter_records(commits))
+    again = list(classifier.iter_records(commits))
+    # Fake commits may share their SHA: only the very same objects are known
+    other = list(classifier.iter_records([GitCommit("0" * 40, "feat!: breaking")]))
+
+    assert first == again
+    assert [record.increment for _, record in first] == ["MINOR", "PATCH"]
+    assert other[0][1].increment == "MAJOR"
+    assert classify.call_count == 3
+
+
+def test_iter_records_uses_cache(
+    classifier: CommitClassifier, tmp_path: Path, mocker: MockFixture
+):
+    commits = [
+        GitCommit("0" * 40, "feat(cli): new command", "Closes #1\n\nfix: some fix"),
+        GitCommit("1" * 40, "docs: some docs"),
+    ]
+    expected = list(classifier.iter_records(commits))
+    cache = CommitCache(tmp_path / "commits")
+    list(classifier.iter_records(commits, cache))
+    cache.flush()
+    classify = mocker.spy(classifier, "classify")
+
+    warm = list(classifier.iter_records(commits, CommitCache(tmp_path / "commits")))
+
+    assert warm == expected
+    assert all(isinstance(record, CommitRecord) for _, record in warm)
+    assert classify.call_count == 0
+
+
+def test_partial_classifiers_share_the_cache(
+    classifier: CommitClassifier,
+    config: BaseConfig,
+    tmp_path: Path,
+    mocker: MockFixture,
+):
+    cz = ConventionalCommitsCz(config)
+    commits = [
+        GitCommit("0" * 40, "feat(cli): new command"),
+        GitCommit("1" * 40, "fix: some fix"),
+    ]
+    expected = list(classifier.iter_records(commits))
+    cache = CommitCache(tmp_path / "commits")
+    list(classifier.iter_records(commits, cache))
+    cache.flush()
+
+    bump_only = CommitClassifier.from_cz(cz, changelog=False)
+    changelog_only = CommitClassifier.from_cz(cz, bump=False)
+    classify_bump = mocker.spy(bump_only, "classify")
+    classify_changelog = mocker.spy(changelog_only, "classify")
+    increments = list(
+        bump_only.iter_records(commits, CommitCache(tmp_path / "commits"))
+    )
+    entries = list(
+        changelog_only.iter_records(commits, CommitCache(tmp_path / "commits"))
+    )
+
+    assert not changelog_only.finds_increments
+    assert [record.increment for _, record in increments] == ["MINOR", "PATCH"]
+    assert [record.entries for _, record in entries] == [
+        record.entries for _, record in expected
+    ]
+    assert classify_bump.call_count == 0
+    assert classify_changelog.call_count == 0
+
+
+@pytest.mark.parametrize(
+    "bump_map",
+    (
+        pytest.param(
+            {r"^feat.*!": "MAJOR", r"^feat": "MINOR", r"^f": "PATCH"}, id="joined"
+        ),
+        pytest.param(
+            {r"^(feat)\1?.*!": "MAJOR", r"^feat": "MINOR", r"(?i)^F": "PATCH"},
+            id="self-referencing",
+        ),
+        pytest.param(
+            {r"^(?P<t>feat).*!": "MAJOR", r"^(?P<t>feat)": "MINOR", r"^f": "PATCH"},
+            id="same-group-names",
+        ),
+    ),
+)
+def test_increment_resolver_keeps_the_map_order(bump_map):
+    resolver = _IncrementResolver(bump_map)
+
+    assert resolver("feat(cli)!") == "MAJOR"
+    assert resolver("feat") == "MINOR"
+    assert resolver("fix") == "PATCH"
+    assert resolver("docs") is None
+    assert resolver._memo == {
+        "feat(cli)!": "MAJOR",
+        "feat": "MINOR",
+        "fix": "PATCH",
+        "docs": None,
+    }
+
+
+def test_find_increment_stops_at_major(classifier: CommitClassifier):
+    consumed = []
+
+    def commits():
+        for title in ("fix: a fix", "feat!: breaking", "feat: new feature"):
+            consumed.append(title)
+            yield GitCommit("0" * 40, title)
+
+    assert classifier.find_increment(commits()) == "MAJOR"
+    assert consumed == ["fix: a fix", "feat!: breaking"]
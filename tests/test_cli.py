@@ -7,7 +7,7 @@ from functools import partial
 import pytest
 from pytest_mock import MockFixture
 
-from commitizen import cli
+from commitizen import cli, cmd, git
 from commitizen.exceptions import (
     ConfigFileNotFound,
     ExpectedExit,
@@ -15,6 +15,7 @@ from commitizen.exceptions import (
     NoCommandFoundError,
     NotAGitProjectError,
 )
+from tests.utils import UtilFixture
 
 
 def test_sysexit_no_argv(mocker: MockFixture, capsys):
@@ -239,3 +240,23 @@ def test_commitizen_excepthook_non_commitizen_exception_with_invalid_traceback(
 
     # Verify sys.__excepthook__ was called with None as traceback
     mock_original_excepthook.assert_called_once_with(ValueError, test_exception, None)
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_repository_facts_are_queried_once_per_invocation(
+    mocker: MockFixture, util: UtilFixture
+):
+    util.create_file_and_commit("feat: new file")
+    util.create_file_and_commit("fix: some fix")
+    run_spy = mocker.spy(cmd, "run")
+    run_concurrently_spy = mocker.spy(cmd, "run_concurrently")
+
+    util.run_cli("bump", "--yes", "--changelog")
+
+    # The probes are all run at once, upfront
+    (probes,) = (call.args[0] for call in run_concurrently_spy.call_args_list)
+    assert len(probes) == 2
+    commands = [*probes, *(call.args[0] for call in run_spy.call_args_list)]
+    assert sum(c.startswith("git rev-parse") for c in commands) == 1
+    assert sum(c == "git config core.eol" for c in commands) == 1
+    assert git.RepoContext.current() is None
@@ -1,3 +1,7 @@
+import asyncio
+import subprocess
+import time
+
 import pytest
 
 from commitizen import cmd
@@ -51,3 +55,88 @@ def test_always_fail_decode():
 
     with pytest.raises(CharacterSetDecodeError):
         cmd._try_decode(_bytes())
+
+
+def test_decoder_only_detects_the_lines_which_are_not_utf8(mocker):
+    from_bytes = mocker.spy(cmd, "from_bytes")
+    legacy = "Un commit écrit en latin-1 à l'époque".encode("latin-1")
+    output = b"first line\n" + legacy + b"\r\n" + "naïve utf-8\n".encode()
+
+    decoded = cmd._try_decode(output)
+
+    assert decoded.startswith("first line\nUn commit ")
+    assert decoded.endswith("\r\nnaïve utf-8\n")
+    from_bytes.assert_called_once_with(legacy + b"\r\n")
+
+
+def test_decoder_detects_each_record_on_its_own():
+    decoder = cmd.Decoder()
+    french = "Un commit écrit en latin-1 à l'époque, déjà corrigé"
+    russian = "Добавить поддержку старых кодировок в журнале коммитов"
+
+    assert decoder(french.encode("latin-1")) == french
+    # A single-byte codepage detected earlier would decode it too, wrongly
+    assert decoder(russian.encode("cp1251")) == russian
+
+
+def test_decoder_detects_repeated_records_once(mocker):
+    from_bytes = mocker.spy(cmd, "from_bytes")
+    decoder = cmd.Decoder()
+    text = "Un commit écrit en latin-1 à l'époque, déjà corrigé"
+    record = text.encode("latin-1")
+
+    assert decoder(record) == decoder(record) == text
+    assert from_bytes.call_count == 1
+    assert decoder("déjà utf-8".encode()) == "déjà utf-8"
+
+
+def test_run_concurrently():
+    results = cmd.run_concurrently(
+        ["echo first", "echo second >&2; exit 2", "echo $COMMITIZEN_TEST"],
+        env={"COMMITIZEN_TEST": "from env"},
+    )
+
+    assert [c.out for c in results] == ["first\n", "", "from env\n"]
+    assert results[1].err == "second\n"
+    assert [c.return_code for c in results] == [0, 2, 0]
+
+
+def test_run_concurrently_runs_commands_at_once():
+    start = time.perf_counter()
+    cmd.run_concurrently(["sleep 0.5"] * 4)
+
+    assert time.perf_counter() - start < 1.5
+
+
+def test_run_concurrently_within_an_event_loop(mocker):
+    run_spy = mocker.spy(cmd, "run")
+
+    async def main():
+        return cmd.run_concurrently(["echo first", "echo second"])
+
+    results = asyncio.run(main())
+
+    assert [c.out for c in results] == ["first\n", "second\n"]
+    assert run_spy.call_count == 2
+
+
+def test_stream_yields_stdout_in_chunks():
+    chunks = list(cmd.stream("printf 'abcdefghij'", chunk_size=4))
+
+    assert b"".join(chunks) == b"abcdefghij"
+    assert all(len(chunk) <= 4 for chunk in chunks)
+
+
+def test_stream_raises_on_failure():
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        list(cmd.stream("echo boom >&2; exit 3"))
+
+    assert excinfo.value.returncode == 3
+    assert excinfo.value.stderr == b"boom\n"
+
+
+def test_stream_can_be_closed_early():
+    chunks = cmd.stream("yes", chunk_size=16)
+
+    assert next(chunks)
+    chunks.close()
@@ -96,6 +96,7 @@ _settings: dict[str, Any] = {
     "changelog_start_rev": None,
     "changelog_merge_prerelease": False,
     "update_changelog_on_bump": False,
+    "notes_cache": False,
     "use_shortcuts": False,
     "major_version_zero": False,
     "pre_bump_hooks": ["scripts/generate_documentation.sh"],
@@ -136,6 +137,7 @@ _new_settings: dict[str, Any] = {
     "changelog_start_rev": None,
     "changelog_merge_prerelease": False,
     "update_changelog_on_bump": False,
+    "notes_cache": False,
     "use_shortcuts": False,
     "major_version_zero": False,
     "pre_bump_hooks": ["scripts/generate_documentation.sh"],
@@ -3,6 +3,9 @@ from __future__ import annotations
 import inspect
 import os
 import platform
+import subprocess
+import tracemalloc
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
@@ -11,6 +14,7 @@ from commitizen import cmd, git
 from commitizen.exceptions import GitCommandError
 from tests.utils import (
     FakeCommand,
+    UtilFixture,
     create_branch,
     create_file_and_commit,
     create_tag,
@@ -18,6 +22,8 @@ from tests.utils import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from pytest_gitconfig import GitConfig
     from pytest_mock import MockFixture
 
@@ -59,6 +65,79 @@ def test_get_tags(mocker: MockFixture):
     assert git.get_tags() == []
 
 
+@pytest.mark.parametrize("pack_refs", [False, True])
+def test_get_tags_with_select_reads_refs_in_process(
+    tmp_commitizen_project, mocker: MockFixture, util: UtilFixture, pack_refs: bool
+):
+    with tmp_commitizen_project.as_cwd():
+        util.create_file_and_commit("feat: first")
+        util.create_tag("v1.0.0")
+        util.create_tag("not-a-version")
+        util.create_file_and_commit("feat: second")
+        util.create_tag("v1.1.0", message="annotated")
+        util.create_tag("pkg/v1.1.0")
+        util.create_tag("v1.2.0")  # same creator date as pkg/v1.1.0, sorted by name
+        if pack_refs:
+            cmd.run("git pack-refs --all")
+        util.create_file_and_commit("feat: third")
+        util.create_tag("v2.0.0", message="loose annotated")
+
+        def select(name: str) -> bool:
+            return name != "not-a-version"
+
+        expected = [
+            (tag.name, tag.rev, tag.date)
+            for tag in git.get_tags(dateformat="%Y-%m-%d %H:%M:%S")
+            if select(tag.name)
+        ]
+        run_spy = mocker.spy(cmd, "run")
+        tags = git.get_tags(dateformat="%Y-%m-%d %H:%M:%S", select=select)
+
+        assert [(tag.name, tag.rev, tag.date) for tag in tags] == expected
+        assert len(tags) == 5
+        assert not any(
+            call.args[0].startswith("git tag") for call in run_spy.call_args_list
+        )
+
+
+@pytest.mark.parametrize("in_process", [True, False])
+def test_get_tags_with_patterns(
+    tmp_commitizen_project, mocker: MockFixture, util: UtilFixture, in_process: bool
+):
+    with tmp_commitizen_project.as_cwd():
+        util.create_file_and_commit("feat: first")
+        for name in ("api-v1.0.0", "web-v1.0.0", "api-other", "api_1.0.0"):
+            util.create_tag(name)
+        if not in_process:
+            mocker.patch("commitizen.git._read_tag_refs", side_effect=OSError)
+        select = mocker.Mock(side_effect=lambda name: name != "api-other")
+
+        tags = git.get_tags(select=select, patterns=["api-*", "api_*"])
+
+        assert {tag.name for tag in tags} == {"api-v1.0.0", "api_1.0.0"}
+        assert {call.args[0] for call in select.call_args_list} == {
+            "api-v1.0.0",
+            "api-other",
+            "api_1.0.0",
+        }
+
+
+def test_get_tags_with_select_falls_back_to_git(
+    tmp_commitizen_project, mocker: MockFixture, util: UtilFixture
+):
+    with tmp_commitizen_project.as_cwd():
+        util.create_file_and_commit("feat: first")
+        util.create_tag("v1.0.0")
+        util.create_tag("other")
+        mocker.patch(
+            "commitizen.git._read_tag_refs", side_effect=OSError("unsupported")
+        )
+
+        tags = git.get_tags(select=lambda name: name.startswith("v"))
+
+        assert [tag.name for tag in tags] == ["v1.0.0"]
+
+
 def test_get_reachable_tags(tmp_commitizen_project):
     with tmp_commitizen_project.as_cwd():
         create_file_and_commit("Initial state")
@@ -113,13 +192,13 @@ def test_git_message_with_empty_body():
 
 
 @pytest.mark.usefixtures("tmp_commitizen_project")
-def test_get_log_as_str_list_empty():
+def test_iter_log_records_empty():
     """
     Ensure an exception is raised or empty list in an empty project.
     The behavior is different depending on the version of git.
     """
     try:
-        gitlog = git._get_log_as_str_list(start=None, end="HEAD", args="")
+        gitlog = list(git._iter_log_records(start=None, end="HEAD", args=""))
     except GitCommandError:
         return
     assert len(gitlog) == 0, "list should be empty if no assert"
@@ -144,20 +223,20 @@ def test_get_commits_author_and_email():
 
 def test_get_commits_without_email(mocker: MockFixture):
     raw_commit = (
-        "a515bb8f71c403f6f7d1c17b9d8ebf2ce3959395\n"
-        "95bbfc703eb99cb49ba0d6ffd8469911303dbe63 12d3b4bdaa996ea7067a07660bb5df4772297bdd\n"
-        "\n"
-        "user name\n"
-        "\n"
-        "----------commit-delimiter----------\n"
-        "12d3b4bdaa996ea7067a07660bb5df4772297bdd\n"
-        "de33bc5070de19600f2f00262b3c15efea762408\n"
-        "feat(users): add username\n"
-        "user name\n"
-        "\n"
-        "----------commit-delimiter----------\n"
+        "a515bb8f71c403f6f7d1c17b9d8ebf2ce3959395\x1e"
+        "95bbfc703eb99cb49ba0d6ffd8469911303dbe63 12d3b4bdaa996ea7067a07660bb5df4772297bdd\x1e"
+        "\x1e"
+        "user name\x1e"
+        "\x1e"
+        "\0"
+        "12d3b4bdaa996ea7067a07660bb5df4772297bdd\x1e"
+        "de33bc5070de19600f2f00262b3c15efea762408\x1e"
+        "feat(users): add username\x1e"
+        "user name\x1e"
+        "\x1e"
+        "\0"
     )
-    mocker.patch("commitizen.cmd.run", return_value=FakeCommand(out=raw_commit))
+    mocker.patch("commitizen.cmd.stream", return_value=iter([raw_commit.encode()]))
 
     commits = git.get_commits()
 
@@ -171,28 +250,49 @@ def test_get_commits_without_email(mocker: MockFixture):
     assert commits[1].title == "feat(users): add username"
 
 
+def test_get_commits_with_a_legacy_encoded_commit(mocker: MockFixture):
+    records = [
+        "a1\x1e\x1efeat: première\x1eUser\x1euser@email.com\x1e\0".encode(),
+        "a2\x1e\x1efeat: légende\x1eUser\x1euser@email.com\x1e\0".encode("latin-1"),
+        "a3\x1e\x1efeat: déjà vu\x1eUser\x1euser@email.com\x1e\0".encode("latin-1"),
+    ]
+    mocker.patch("commitizen.cmd.stream", return_value=iter(records))
+    from_bytes = mocker.spy(cmd, "from_bytes")
+
+    commits = git.get_commits()
+
+    assert commits[0].title == "feat: première"
+    assert commits[1].rev == "a2"
+    assert commits[1].title == "feat: légende"
+    assert commits[2].author_email == "user@email.com"
+    # Only the legacy records went through charset detection, each on its own
+    assert [call.args for call in from_bytes.call_args_list] == [
+        (record[:-1].replace(b"\x1e", b"\n"),) for record in records[1:]
+    ]
+
+
 def test_get_commits_without_breakline_in_each_commit(mocker: MockFixture):
     raw_commit = (
-        "ae9ba6fc5526cf478f52ef901418d85505109744\n"
-        "ff2f56ca844de72a9d59590831087bf5a97bac84\n"
-        "bump: version 2.13.0 → 2.14.0\n"
-        "GitHub Action\n"
-        "action@github.com\n"
-        "----------commit-delimiter----------\n"
-        "ff2f56ca844de72a9d59590831087bf5a97bac84\n"
-        "b4dc83284dc8c9729032a774a037df1d1f2397d5 20a54bf1b82cd7b573351db4d1e8814dd0be205d\n"
-        "Merge pull request #332 from cliles/feature/271-redux\n"
-        "User\n"
-        "user@email.com\n"
-        "Feature/271 redux----------commit-delimiter----------\n"
-        "20a54bf1b82cd7b573351db4d1e8814dd0be205d\n"
-        "658f38c3fe832cdab63ed4fb1f7b3a0969a583be\n"
-        "feat(#271): enable creation of annotated tags when bumping\n"
-        "User 2\n"
-        "user@email.edu\n"
-        "----------commit-delimiter----------\n"
+        "ae9ba6fc5526cf478f52ef901418d85505109744\x1e"
+        "ff2f56ca844de72a9d59590831087bf5a97bac84\x1e"
+        "bump: version 2.13.0 → 2.14.0\x1e"
+        "GitHub Action\x1e"
+        "action@github.com\x1e"
+        "\0"
+        "ff2f56ca844de72a9d59590831087bf5a97bac84\x1e"
+        "b4dc83284dc8c9729032a774a037df1d1f2397d5 20a54bf1b82cd7b573351db4d1e8814dd0be205d\x1e"
+        "Merge pull request #332 from cliles/feature/271-redux\x1e"
+        "User\x1e"
+        "user@email.com\x1e"
+        "Feature/271 redux\0"
+        "20a54bf1b82cd7b573351db4d1e8814dd0be205d\x1e"
+        "658f38c3fe832cdab63ed4fb1f7b3a0969a583be\x1e"
+        "feat(#271): enable creation of annotated tags when bumping\x1e"
+        "User 2\x1e"
+        "user@email.edu\x1e"
+        "\0"
     )
-    mocker.patch("commitizen.cmd.run", return_value=FakeCommand(out=raw_commit))
+    mocker.patch("commitizen.cmd.stream", return_value=iter([raw_commit.encode()]))
 
     commits = git.get_commits()
 
@@ -213,26 +313,26 @@ def test_get_commits_without_breakline_in_each_commit(mocker: MockFixture):
 
 def test_get_commits_with_and_without_parents(mocker: MockFixture):
     raw_commit = (
-        "4206e661bacf9643373255965f34bbdb382cb2b9\n"
-        "ae9ba6fc5526cf478f52ef901418d85505109744 bf8479e7aa1a5b9d2f491b79e3a4d4015519903e\n"
-        "Merge pull request from someone\n"
-        "Maintainer\n"
-        "maintainer@email.com\n"
-        "This is a much needed feature----------commit-delimiter----------\n"
-        "ae9ba6fc5526cf478f52ef901418d85505109744\n"
-        "ff2f56ca844de72a9d59590831087bf5a97bac84\n"
-        "Release 0.1.0\n"
-        "GitHub Action\n"
-        "action@github.com\n"
-        "----------commit-delimiter----------\n"
-        "ff2f56ca844de72a9d59590831087bf5a97bac84\n"
-        "\n"
-        "Initial commit\n"
-        "User\n"
-        "user@email.com\n"
-        "----------commit-delimiter----------\n"
+        "4206e661bacf9643373255965f34bbdb382cb2b9\x1e"
+        "ae9ba6fc5526cf478f52ef901418d85505109744 bf8479e7aa1a5b9d2f491b79e3a4d4015519903e\x1e"
+        "Merge pull request from someone\x1e"
+        "Maintainer\x1e"
+        "maintainer@email.com\x1e"
+        "This is a much needed feature\0"
+        "ae9ba6fc5526cf478f52ef901418d85505109744\x1e"
+        "ff2f56ca844de72a9d59590831087bf5a97bac84\x1e"
+        "Release 0.1.0\x1e"
+        "GitHub Action\x1e"
+        "action@github.com\x1e"
+        "\0"
+        "ff2f56ca844de72a9d59590831087bf5a97bac84\x1e"
+        "\x1e"
+        "Initial commit\x1e"
+        "User\x1e"
+        "user@email.com\x1e"
+        "\0"
     )
-    mocker.patch("commitizen.cmd.run", return_value=FakeCommand(out=raw_commit))
+    mocker.patch("commitizen.cmd.stream", return_value=iter([raw_commit.encode()]))
 
     commits = git.get_commits()
 
@@ -260,6 +360,45 @@ def test_get_commits_with_and_without_parents(mocker: MockFixture):
     assert commits[2].parents == []
 
 
+def test_iter_commits_with_records_split_across_chunks(mocker: MockFixture):
+    raw_commit = (
+        "12d3b4bdaa996ea7067a07660bb5df4772297bdd\x1e"
+        "de33bc5070de19600f2f00262b3c15efea762408\x1e"
+        "feat(users): add username ✨\x1e"
+        "user name\x1e"
+        "user@email.com\x1e"
+        "\0"
+        "de33bc5070de19600f2f00262b3c15efea762408\x1e"
+        "\x1e"
+        "Initial commit\x1e"
+        "user name\x1e"
+        "user@email.com\x1e"
+        "\0"
+    ).encode()
+    # Split right in the middle of the multi-byte emoji
+    chunks = [raw_commit[i : i + 7] for i in range(0, len(raw_commit), 7)]
+    mocker.patch("commitizen.cmd.stream", return_value=iter(chunks))
+
+    assert [commit.title for commit in git.iter_commits()] == [
+        "feat(users): add username ✨",
+        "Initial commit",
+    ]
+
+
+def test_iter_commits_error(mocker: MockFixture):
+    def failing_stream(command: str):
+        raise subprocess.CalledProcessError(
+            128, command, stderr=b"fatal: bad revision 'HEAD'"
+        )
+        yield  # pragma: no cover
+
+    mocker.patch("commitizen.cmd.stream", side_effect=failing_stream)
+
+    with pytest.raises(GitCommandError) as excinfo:
+        list(git.iter_commits())
+    assert str(excinfo.value) == "fatal: bad revision 'HEAD'"
+
+
 @pytest.mark.usefixtures("in_repo_root")
 def test_get_commits_with_signature(gitconfig: GitConfig):
     # temporarily turn on --show-signature
@@ -337,6 +476,51 @@ def test_get_eol_for_open(tmp_commitizen_project):
         assert git.EOLType.for_open() == os.linesep
 
 
+def test_repo_context(tmp_commitizen_project, mocker: MockFixture):
+    with tmp_commitizen_project.as_cwd():
+        cmd.run("git config core.eol crlf")
+        run_spy = mocker.spy(cmd, "run")
+
+        with git.RepoContext() as context:
+            assert git.RepoContext.current() is context
+            for _ in range(3):
+                assert git.is_git_project()
+                assert git.find_git_project_root() == Path(tmp_commitizen_project)
+                assert git.EOLType.for_open() == "\r\n"
+            assert context.git_dir == Path(tmp_commitizen_project, ".git")
+            assert run_spy.call_count == 2
+
+            cmd.run("git config core.eol lf")
+            assert git.EOLType.for_open() == "\r\n"
+            context.invalidate()
+            assert git.EOLType.for_open() == "\n"
+
+        assert git.RepoContext.current() is None
+
+
+def test_repo_context_prefetch(tmp_commitizen_project, mocker: MockFixture):
+    with tmp_commitizen_project.as_cwd():
+        cmd.run("git config core.eol crlf")
+        run_spy = mocker.spy(cmd, "run")
+        run_concurrently_spy = mocker.spy(cmd, "run_concurrently")
+
+        with git.RepoContext() as context:
+            context.prefetch()
+            assert git.find_git_project_root() == Path(tmp_commitizen_project)
+            assert git.EOLType.for_open() == "\r\n"
+            context.prefetch()
+
+        assert run_spy.call_count == 0
+        run_concurrently_spy.assert_called_once()
+
+
+def test_repo_context_outside_git_project(tmpdir):
+    with tmpdir.as_cwd(), git.RepoContext() as context:
+        assert not git.is_git_project()
+        assert git.find_git_project_root() is None
+        assert context.git_dir is None
+
+
 def test_get_core_editor(mocker):
     mocker.patch.dict(os.environ, {"GIT_EDITOR": "nano"})
     assert git.get_core_editor() == "nano"
@@ -364,9 +548,74 @@ def test_create_tag_with_message(tmp_commitizen_project):
         tag_message = "test message"
         create_tag(tag_name, tag_message)
         assert git.get_latest_tag_name() == tag_name
-        assert git.get_tag_message(tag_name) == (
-            tag_message if platform.system() != "Windows" else f"'{tag_message}'"
+        assert git.get_tag_message(tag_name) == tag_message
+
+
+def test_get_tag_message_of_lightweight_and_multiline_tags(tmp_commitizen_project):
+    with tmp_commitizen_project.as_cwd():
+        create_file_and_commit("feat(test): test\n\nsome body")
+        create_tag("1.0")
+        cmd.run("git tag -a 2.0 -m 'first line' -m 'second paragraph'")
+
+        assert git.get_tag_message("1.0") == "feat(test): test"
+        assert git.get_tag_message("2.0") == "first line"
+        assert git.get_tag_message("3.0") == ""
+
+
+def test_tag_exist(tmp_commitizen_project):
+    with tmp_commitizen_project.as_cwd():
+        create_file_and_commit("feat(test): test")
+        create_tag("1.0.1")
+
+        assert git.tag_exist("1.0.1")
+        assert not git.tag_exist("1.0")
+        assert not git.tag_exist("1.0.1\n")
+
+
+def test_resolve_revs(tmp_commitizen_project):
+    with tmp_commitizen_project.as_cwd():
+        create_file_and_commit("feat(test): test")
+        create_tag("1.0", message="annotated")
+        head = cmd.run("git rev-parse HEAD").out.strip()
+
+        assert git.resolve_revs(["HEAD", "refs/tags/1.0^{commit}", "unknown"]) == {
+            "HEAD": head,
+            "refs/tags/1.0^{commit}": head,
+            "unknown": None,
+        }
+
+
+def test_cat_file_coprocess_follows_working_directory(tmpdir):
+    first, second = tmpdir.mkdir("first"), tmpdir.mkdir("second")
+    for path in (first, second):
+        with path.as_cwd():
+            cmd.run("git init")
+            create_file_and_commit(f"feat: {path.basename}")
+            create_tag(path.basename)
+
+    with first.as_cwd():
+        assert git.tag_exist("first")
+        assert not git.tag_exist("second")
+    with second.as_cwd():
+        assert git.tag_exist("second")
+        assert not git.tag_exist("first")
+
+
+def test_cat_file_coprocess_fallback(tmp_commitizen_project, mocker: MockFixture):
+    mocker.patch("commitizen.cmd.Coprocess", side_effect=OSError("no git"))
+    git._cat_file_check.close()
+    git._cat_file_batch.close()
+    with tmp_commitizen_project.as_cwd():
+        create_file_and_commit("feat(test): test")
+        create_tag("1.0", message="test message")
+        head = cmd.run("git rev-parse HEAD").out.strip()
+
+        assert git.tag_exist("1.0")
+        assert not git.tag_exist("2.0")
+        assert git.get_tag_message("1.0") == (
+            "test message" if platform.system() != "Windows" else "'test message'"
         )
+        assert git.resolve_revs(["HEAD", "unknown"]) == {"HEAD": head, "unknown": None}
 
 
 @pytest.mark.parametrize(
@@ -458,6 +707,132 @@ def test_git_commit_from_rev_and_commit():
     assert commit.parents == []
 
 
+def test_git_commit_from_record():
+    record = (
+        b"abc123\x1e"
+        b"def456 ghi789\x1e"
+        b"feat: add new feature\x1e"
+        b"John Doe\x1e"
+        b"john@example.com\x1e"
+        b"This is a detailed description\n"
+        b"----------commit-delimiter----------\n"
+        b"with a \x1e separator\n"
+    )
+
+    commit = git.GitCommit.from_record(record)
+
+    assert commit.rev == "abc123"
+    assert commit.parents == ["def456", "ghi789"]
+    assert commit.title == "feat: add new feature"
+    assert commit.author == "John Doe"
+    assert commit.author_email == "john@example.com"
+    assert commit.body == (
+        "This is a detailed description\n"
+        "----------commit-delimiter----------\n"
+        "with a \x1e separator"
+    )
+
+
+def test_git_objects_are_slotted():
+    commit = git.GitCommit("abc123", "feat: add new feature", parents=["def456"])
+    tag = git.GitTag("v1.0.0", "abc123", "2024-01-01")
+
+    assert not hasattr(commit, "__dict__")
+    assert not hasattr(tag, "__dict__")
+    with pytest.raises(AttributeError):
+        commit.date = "2024-01-01"
+
+
+class _DictCommit:
+    """A commit as `GitCommit` used to keep it: in a `__dict__`, eagerly stripped"""
+
+    def __init__(
+        self, rev: str, parents: str, title: str, author: str, email: str, body: str
+    ) -> None:
+        self.rev = rev.strip()
+        self.parents = parents.split()
+        self.title = title.strip()
+        self.author = author.strip()
+        self.author_email = email.strip()
+        self.body = body.strip()
+
+
+def _traced_size(build: Callable[[bytes], object], records: list[bytes]) -> int:
+    tracemalloc.start()
+    try:
+        commits = [build(record) for record in records]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(commits) == len(records)
+    return size
+
+
+def test_git_commits_are_smaller_than_dict_backed_ones():
+    records = [
+        f"{i:040x}\x1e{i + 1:040x}\x1efeat(scope): change {i}\x1eJohn Doe"
+        f"\x1ejohn@example.com\x1eSome body {i}\n".encode()
+        for i in range(2000)
+    ]
+
+    slotted = _traced_size(git.GitCommit.from_record, records)
+    dict_backed = _traced_size(
+        lambda record: _DictCommit(*record.decode().split("\x1e")), records
+    )
+
+    assert slotted < 0.75 * dict_backed
+
+
+def test_git_commit_shares_repeated_authors():
+    first, second = (
+        git.GitCommit.from_record(
+            f"{rev}\x1e\x1efeat: x\x1eJohn Doe\x1ejohn@example.com\x1e".encode()
+        )
+        for rev in ("abc123", "def456")
+    )
+
+    assert first.author is second.author
+    assert first.author_email is second.author_email
+
+
+def test_git_commit_message_is_cached():
+    commit = git.GitCommit("abc123", "feat: add new feature ", "\n  some body\n\n")
+
+    assert commit.message == "feat: add new feature\n\nsome body"
+    assert commit.message is commit.message
+    assert commit.body == "some body"
+
+    commit.body = "another body"
+    assert commit.message == "feat: add new feature\n\nanother body"
+    commit.title = "fix: a fix"
+    assert commit.message == "fix: a fix\n\nanother body"
+
+
+def test_git_commit_parents():
+    commit = git.GitCommit("abc123", "feat: x")
+    assert commit.parents == []
+
+    commit.parents = ["def456", "ghi789"]
+    assert commit.parents == ["def456", "ghi789"]
+    assert git.GitCommit.from_record(b"abc123\x1e\x1ex\x1e\x1e\x1e").parents == []
+
+
+@pytest.mark.usefixtures("tmp_commitizen_project")
+def test_get_commits_with_delimiter_in_body():
+    create_file_and_commit(
+        "feat: tricky body\n\n----------commit-delimiter----------\nstill the body"
+    )
+    create_file_and_commit("fix: next commit")
+
+    commits = git.get_commits()
+
+    assert [commit.title for commit in commits] == [
+        "fix: next commit",
+        "feat: tricky body",
+    ]
+    assert commits[1].body == "----------commit-delimiter----------\nstill the body"
+
+
 @pytest.mark.parametrize(
     "os_name,committer_date,expected_cmd",
     [
@@ -499,3 +874,30 @@ def test_get_default_branch_error(mocker: MockFixture):
     )
     with pytest.raises(GitCommandError):
         git.get_default_branch()
+
+
+def test_smart_replace_writes_the_file(tmp_path: Path):
+    path = tmp_path / "CHANGELOG.md"
+    path.write_text("old\n")
+    path.chmod(0o640)
+
+    with git.smart_replace(path, encoding="utf-8") as f:
+        f.writelines(["new", " content\n"])
+
+    assert path.read_text() == "new content\n"
+    if os.name != "nt":
+        assert path.stat().st_mode & 0o777 == 0o640
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_smart_replace_keeps_the_file_on_error(tmp_path: Path):
+    path = tmp_path / "CHANGELOG.md"
+    path.write_text("old\n")
+
+    with pytest.raises(RuntimeError):
+        with git.smart_replace(path, encoding="utf-8") as f:
+            f.write("partial")
+            raise RuntimeError("rendering failed")
+
+    assert path.read_text() == "old\n"
+    assert list(tmp_path.iterdir()) == [path]
@@ -1,6 +1,11 @@
 """Tests for the incremental_build function in commitizen.changelog module."""
 
-from commitizen.changelog import Metadata, incremental_build
+import io
+
+import pytest
+
+from commitizen import changelog
+from commitizen.changelog import Metadata, incremental_build, write_incremental
 
 
 class TestIncrementalBuild:
@@ -604,3 +609,179 @@ class TestIncrementalBuild:
         ]
 
         assert result == expected
+
+
+CHANGELOG_LINES = [
+    "# Changelog\n",
+    "\n",
+    "## Unreleased\n",
+    "\n",
+    "- Unreleased feature\n",
+    "\n",
+    "## 1.0.0 (2023-01-01)\n",
+    "\n",
+    "- Bug fix ✓\n",
+    "\n",
+    "## 0.1.0 (2022-01-01)\n",
+    "\n",
+    "- Initial release\n",
+]
+
+
+class TestWriteIncremental:
+    """Test cases for the write_incremental function."""
+
+    @staticmethod
+    def _write(
+        source: bytes, metadata: Metadata, encoding: str = "utf-8", eol: str = "\n"
+    ) -> tuple[bytes, io.BytesIO]:
+        changelog_file = io.BytesIO(source)
+        output = io.TextIOWrapper(io.BytesIO(), encoding=encoding, newline=eol)
+        write_incremental(
+            ["## Unreleased\n", "\n- New feature\n"],
+            changelog_file,
+            output,
+            metadata,
+            encoding,
+            eol,
+        )
+        output.flush()
+        return output.buffer.getvalue(), changelog_file
+
+    @pytest.mark.parametrize(
+        "metadata",
+        (
+            pytest.param(Metadata(2, 5, "1.0.0", 6), id="unreleased-then-version"),
+            pytest.param(Metadata(None, None, "1.0.0", 6), id="version-only"),
+            pytest.param(Metadata(10, 12, "1.0.0", 6), id="unreleased-after-version"),
+            pytest.param(Metadata(2, 5, None, None), id="no-version"),
+            pytest.param(Metadata(None, None, None, None), id="nothing"),
+            pytest.param(Metadata(2, None, "1.0.0", 6), id="unreleased-without-end"),
+            pytest.param(Metadata(5, 2, "1.0.0", 6), id="unreleased-end-first"),
+            pytest.param(Metadata(None, None, "1.0.0", 42), id="version-out-of-range"),
+        ),
+    )
+    def test_same_as_incremental_build(self, metadata: Metadata):
+        new_content = "## Unreleased\n\n- New feature\n"
+        expected = "".join(incremental_build(new_content, CHANGELOG_LINES, metadata))
+
+        written, _ = self._write("".join(CHANGELOG_LINES).encode(), metadata)
+
+        assert written.decode() == expected
+
+    def test_only_decodes_the_head(self):
+        # The tail, which isn't valid utf-8, is not touched
+        tail = "## 0.1.0\r\n\r\n- Initial release é\r\n".encode("latin-1")
+        source = b"# Changelog\n\n## Unreleased\n\n## 1.0.0\r\n\r\n" + tail
+
+        written, _ = self._write(source, Metadata(2, 4, "1.0.0", 4), eol="\r\n")
+
+        assert written == (
+            b"# Changelog\r\n\r\n## Unreleased\r\n\r\n- New feature\r\n\r\n"
+            b"## 1.0.0\r\n\r\n" + tail
+        )
+
+    @pytest.mark.parametrize(
+        "source_eol, eol",
+        (
+            pytest.param("\r\n", "\n", id="crlf-to-lf"),
+            pytest.param("\n", "\r\n", id="lf-to-crlf"),
+            pytest.param("\r", "\n", id="cr-to-lf"),
+        ),
+    )
+    def test_rebuilds_the_tail_with_other_line_endings(self, source_eol, eol):
+        metadata = Metadata(2, 5, "1.0.0", 6)
+        source = "".join(CHANGELOG_LINES).replace("\n", source_eol).encode()
+        expected = "".join(
+            incremental_build(
+                "## Unreleased\n\n- New feature\n", CHANGELOG_LINES, metadata
+            )
+        )
+
+        written, changelog_file = self._write(source, metadata, eol=eol)
+
+        assert written.decode() == expected.replace("\n", eol)
+        assert not changelog_file.closed
+
+    @pytest.mark.parametrize("chunk_size", (1, 2, 64 * 1024))
+    def test_rebuilds_a_tail_with_mixed_line_endings(
+        self, chunk_size: int, monkeypatch: pytest.MonkeyPatch
+    ):
+        # Part of the tail is copied already when the mismatch is found
+        monkeypatch.setattr(changelog, "_COPY_CHUNK_SIZE", chunk_size)
+        tail = b"## 0.1.0\r\n\r\n- Initial release\n"
+        source = b"# Changelog\r\n\r\n## Unreleased\r\n\r\n## 1.0.0\r\n\r\n" + tail
+
+        written, _ = self._write(source, Metadata(2, 4, "1.0.0", 4), eol="\r\n")
+
+        assert written == (
+            b"# Changelog\r\n\r\n## Unreleased\r\n\r\n- New feature\r\n\r\n"
+            b"## 1.0.0\r\n\r\n## 0.1.0\r\n\r\n- Initial release\r\n"
+        )
+
+    @pytest.mark.parametrize("chunk_size", (1, 64 * 1024))
+    def test_reads_the_tail_once(
+        self, chunk_size: int, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(changelog, "_COPY_CHUNK_SIZE", chunk_size)
+        source = "".join(CHANGELOG_LINES).replace("\n", "\r\n").encode()
+        read = 0
+
+        class CountingBytesIO(io.BytesIO):
+            def read(self, size: int | None = -1) -> bytes:
+                nonlocal read
+                data = super().read(size)
+                read += len(data)
+                return data
+
+            def readline(self, size: int | None = -1) -> bytes:
+                nonlocal read
+                data = super().readline(size)
+                read += len(data)
+                return data
+
+        output = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", newline="\r\n")
+        write_incremental(
+            ["## Unreleased\n", "\n- New feature\n"],
+            CountingBytesIO(source),
+            output,
+            Metadata(2, 5, "1.0.0", 6),
+            "utf-8",
+            "\r\n",
+        )
+        output.flush()
+
+        assert read == len(source)
+        assert output.buffer.getvalue().endswith(source[-30:])
+
+    def test_with_an_encoding_not_ascii_compatible(self):
+        metadata = Metadata(2, 5, "1.0.0", 6)
+        new_content = "## Unreleased\n\n- New feature\n"
+        expected = "".join(incremental_build(new_content, CHANGELOG_LINES, metadata))
+
+        written, changelog_file = self._write(
+            "".join(CHANGELOG_LINES).encode("utf-16"), metadata, encoding="utf-16"
+        )
+
+        assert written.decode("utf-16") == expected
+        assert not changelog_file.closed
+
+    def test_stops_at_the_offsets_of_the_metadata(self):
+        source = "".join(CHANGELOG_LINES).encode()
+        metadata = Metadata(2, 5, "1.0.0", 6)
+        lines = source.splitlines(keepends=True)
+        (
+            metadata.unreleased_start_offset,
+            metadata.unreleased_end_offset,
+            metadata.latest_version_offset,
+        ) = (len(b"".join(lines[:index])) for index in (2, 5, 6))
+        expected = "".join(
+            incremental_build(
+                "## Unreleased\n\n- New feature\n", CHANGELOG_LINES, metadata
+            )
+        )
+
+        written, changelog_file = self._write(source, metadata)
+
+        assert written.decode() == expected
+        assert changelog_file.tell() == len(source)